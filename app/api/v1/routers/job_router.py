@@ -0,0 +1,94 @@
+from http import HTTPStatus
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Body, Depends
+from fastapi.responses import StreamingResponse
+
+from app.exceptions.erros import (
+    ContentError,
+    ForbiddenError,
+    NotFoundError,
+    UnauthorizedError,
+)
+from app.models.user_model import UserModel
+from app.schemas.examples.path_example import PathExample
+from app.schemas.job_schema import JobResponse
+from app.schemas.path_schema import PathCreate
+from app.services.job_service import JobService
+from app.services.user_service import get_current_user
+
+InjectService = Annotated[JobService, Depends()]
+CurrentUser = Annotated[UserModel, Depends(get_current_user)]
+
+router = APIRouter(
+    prefix='/api/v1/paths/jobs',
+    tags=['paths'],
+    dependencies=[Depends(get_current_user)],
+    responses={
+        HTTPStatus.UNPROCESSABLE_CONTENT: {
+            'description': HTTPStatus.UNPROCESSABLE_CONTENT.description,
+            'model': ContentError.schema(),
+        },
+        HTTPStatus.UNAUTHORIZED: {
+            'description': HTTPStatus.UNAUTHORIZED.description,
+            'model': UnauthorizedError.schema(),
+        },
+        HTTPStatus.FORBIDDEN: {
+            'description': HTTPStatus.FORBIDDEN.description,
+            'model': ForbiddenError.schema(),
+        },
+    },
+)
+
+
+@router.post('', status_code=HTTPStatus.ACCEPTED)
+async def create_job(
+    service: InjectService,
+    user: CurrentUser,
+    path: Annotated[PathCreate, Body(openapi_examples=PathExample)],
+) -> JobResponse:
+    return await service.create_job(user, path)
+
+
+@router.get(
+    '/{job_id}',
+    status_code=HTTPStatus.OK,
+    responses={
+        HTTPStatus.NOT_FOUND: {
+            'description': HTTPStatus.NOT_FOUND.description,
+            'model': NotFoundError.schema(),
+        },
+    },
+)
+async def get_job(
+    job_id: UUID,
+    service: InjectService,
+    user: CurrentUser,
+) -> JobResponse:
+    return await service.get_job(job_id, user)
+
+
+@router.get(
+    '/{job_id}/events',
+    status_code=HTTPStatus.OK,
+    response_class=StreamingResponse,
+    responses={
+        HTTPStatus.OK: {'content': {'text/event-stream': {}}},
+        HTTPStatus.NOT_FOUND: {
+            'description': HTTPStatus.NOT_FOUND.description,
+            'model': NotFoundError.schema(),
+        },
+    },
+)
+async def stream_job_events(
+    job_id: UUID,
+    service: InjectService,
+    user: CurrentUser,
+) -> StreamingResponse:
+    await service.get_job(job_id, user)
+    return StreamingResponse(
+        service.stream_job_events(job_id, user),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
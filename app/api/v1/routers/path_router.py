@@ -3,19 +3,27 @@ from typing import Annotated
 from uuid import UUID
 
 from fastapi import APIRouter, Body, Depends, Query
+from fastapi.responses import StreamingResponse
 
 from app.exceptions.erros import (
     ContentError,
     ForbiddenError,
     NotFoundError,
+    ServiceUnavailableError,
     UnauthorizedError,
 )
 from app.models.user_model import UserModel
-from app.schemas.examples.path_example import PathExample
+from app.schemas.examples.path_example import FleetPathExample, PathExample
 from app.schemas.filters_params_schema import (
     PaginationSortingFilters as Filters,
 )
-from app.schemas.path_schema import PathCreate, PathResponse, PathResponseList
+from app.schemas.path_schema import (
+    FleetPathCreate,
+    PathCreate,
+    PathResponse,
+    PathResponseList,
+    PathUpdate,
+)
 from app.services.path_service import PathService
 from app.services.user_service import get_current_user
 
@@ -76,7 +84,16 @@ async def get_path(
     return await service.get_path_by_id(path_id, user)
 
 
-@router.post('/', status_code=HTTPStatus.CREATED)
+@router.post(
+    '/',
+    status_code=HTTPStatus.CREATED,
+    responses={
+        HTTPStatus.SERVICE_UNAVAILABLE: {
+            'description': HTTPStatus.SERVICE_UNAVAILABLE.description,
+            'model': ServiceUnavailableError.schema(),
+        },
+    },
+)
 async def create_path(
     service: InjectService,
     user: CurrentUser,
@@ -85,6 +102,67 @@ async def create_path(
     return await service.create_path(user, path)
 
 
+@router.post(
+    '/stream',
+    status_code=HTTPStatus.OK,
+    response_class=StreamingResponse,
+    responses={
+        HTTPStatus.OK: {'content': {'text/event-stream': {}}},
+    },
+)
+async def stream_path(
+    service: InjectService,
+    user: CurrentUser,
+    path: Annotated[PathCreate, Body(openapi_examples=PathExample)],
+) -> StreamingResponse:
+    return StreamingResponse(
+        service.stream_path(user, path),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+@router.post(
+    '/fleet',
+    status_code=HTTPStatus.CREATED,
+    responses={
+        HTTPStatus.SERVICE_UNAVAILABLE: {
+            'description': HTTPStatus.SERVICE_UNAVAILABLE.description,
+            'model': ServiceUnavailableError.schema(),
+        },
+    },
+)
+async def create_fleet_paths(
+    service: InjectService,
+    user: CurrentUser,
+    fleet: Annotated[FleetPathCreate, Body(openapi_examples=FleetPathExample)],
+) -> PathResponseList:
+    return await service.create_fleet_paths(user, fleet)
+
+
+@router.patch(
+    '/{path_id}',
+    status_code=HTTPStatus.OK,
+    responses={
+        HTTPStatus.NOT_FOUND: {
+            'description': HTTPStatus.NOT_FOUND.description,
+            'model': NotFoundError.schema(),
+        },
+        HTTPStatus.SERVICE_UNAVAILABLE: {
+            'description': HTTPStatus.SERVICE_UNAVAILABLE.description,
+            'model': ServiceUnavailableError.schema(),
+        },
+    },
+)
+async def update_path(
+    path_id: UUID,
+    service: InjectService,
+    user: CurrentUser,
+    update: PathUpdate,
+) -> PathResponse:
+    return await service.update_path(path_id, user, update)
+
+
 @router.delete(
     '/{path_id}',
     status_code=HTTPStatus.NO_CONTENT,
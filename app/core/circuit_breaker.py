@@ -0,0 +1,82 @@
+import time
+from collections import deque
+from enum import Enum
+
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CircuitStateEnum(str, Enum):
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    def __init__(  # noqa: PLR0913
+        self,
+        name: str,
+        *,
+        window: int,
+        min_calls: int,
+        failure_rate: float,
+        slow_call_ms: float,
+        slow_call_rate: float,
+        open_seconds: float,
+    ) -> None:
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_ms = slow_call_ms
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.state = CircuitStateEnum.CLOSED
+        self._calls: deque[tuple[bool, bool]] = deque(maxlen=window)
+        self._changed_at = time.monotonic()
+
+    def allow(self) -> bool:
+        if self.state == CircuitStateEnum.CLOSED:
+            return True
+        now = time.monotonic()
+        if now - self._changed_at < self.open_seconds:
+            return False
+        self._change_state(CircuitStateEnum.HALF_OPEN, now)
+        return True
+
+    def record(self, elapsed_ms: float, *, failed: bool) -> None:
+        slow = elapsed_ms >= self.slow_call_ms
+        if self.state == CircuitStateEnum.HALF_OPEN:
+            self._change_state(
+                CircuitStateEnum.OPEN
+                if failed or slow
+                else CircuitStateEnum.CLOSED
+            )
+            return
+        if self.state == CircuitStateEnum.OPEN:
+            return
+
+        self._calls.append((failed, slow))
+        if len(self._calls) < self.min_calls:
+            return
+        failures = sum(failed for failed, _ in self._calls) / len(self._calls)
+        slow_calls = sum(slow for _, slow in self._calls) / len(self._calls)
+        if failures >= self.failure_rate or slow_calls >= self.slow_call_rate:
+            self._change_state(CircuitStateEnum.OPEN)
+
+    def reset(self) -> None:
+        self._change_state(CircuitStateEnum.CLOSED)
+
+    def _change_state(
+        self, state: CircuitStateEnum, now: float | None = None
+    ) -> None:
+        if state != self.state:
+            logger.warning(
+                'circuit state changed',
+                circuit=self.name,
+                previous=self.state.value,
+                state=state.value,
+            )
+        self.state = state
+        self._changed_at = now or time.monotonic()
+        self._calls.clear()
@@ -16,3 +16,7 @@ async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
 async def get_session() -> AsyncGenerator[AsyncSession, Any]:
     async with async_session_maker() as session:
         yield session
+
+
+def get_session_maker() -> async_sessionmaker[AsyncSession]:
+    return async_session_maker
@@ -0,0 +1,47 @@
+from enum import Enum
+from pathlib import Path
+from typing import Annotated
+
+from fastapi import Depends
+
+from app.core.settings import settings
+from app.repositories.distance_provider import DistanceProvider
+from app.repositories.haversine_repository import HaversineRepository
+from app.repositories.matrix_repository import MatrixRepository
+from app.repositories.osrm_repository import OSRMRepository
+
+
+class DistanceProviderEnum(str, Enum):
+    OSRM = 'osrm'
+    HAVERSINE = 'haversine'
+
+
+class DistanceManager:
+    _matrix: MatrixRepository | None = None
+
+    @classmethod
+    def load_matrix(cls) -> None:
+        if settings.DISTANCE_MATRIX_PATH:
+            cls._matrix = MatrixRepository.load(
+                Path(settings.DISTANCE_MATRIX_PATH)
+            )
+
+    @classmethod
+    def close_matrix(cls) -> None:
+        cls._matrix = None
+
+    @classmethod
+    def get_matrix(cls) -> MatrixRepository | None:
+        return cls._matrix
+
+
+def get_distance_provider(
+    osrm: Annotated[OSRMRepository, Depends()],
+) -> DistanceProvider:
+    if settings.DISTANCE_PROVIDER == DistanceProviderEnum.HAVERSINE:
+        return HaversineRepository()
+    return osrm
+
+
+def get_distance_matrix() -> MatrixRepository | None:
+    return DistanceManager.get_matrix()
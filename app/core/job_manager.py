@@ -0,0 +1,20 @@
+import asyncio
+from collections.abc import Coroutine
+from typing import Any, ClassVar
+
+
+class JobManager:
+    _tasks: ClassVar[set[asyncio.Task]] = set()
+
+    @classmethod
+    def submit(cls, coroutine: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(coroutine)
+        cls._tasks.add(task)
+        task.add_done_callback(cls._tasks.discard)
+
+    @classmethod
+    async def close(cls) -> None:
+        for task in cls._tasks:
+            task.cancel()
+        await asyncio.gather(*cls._tasks, return_exceptions=True)
+        cls._tasks.clear()
@@ -4,10 +4,25 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from app.core.cache_manager import CacheManager
+from app.core.distance_manager import DistanceManager
+from app.core.job_manager import JobManager
+from app.core.osrm_manager import OSRMManager
+from app.core.settings import settings
+from app.core.solver_manager import SolverManager
+from app.workers.cache_warmer import warm_cache
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator:  # noqa: ARG001
     await CacheManager.init_session()
+    await OSRMManager.init_session()
+    DistanceManager.load_matrix()
+    await SolverManager.init_pool()
+    if settings.CACHE_WARMING_ON_STARTUP:
+        JobManager.submit(warm_cache())
     yield
+    await JobManager.close()
+    await SolverManager.close_pool()
+    DistanceManager.close_matrix()
+    await OSRMManager.close_session()
     await CacheManager.close_session()
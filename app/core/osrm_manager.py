@@ -0,0 +1,40 @@
+import httpx
+
+from app.core.settings import settings
+
+
+class OSRMManager:
+    _client: httpx.AsyncClient | None = None
+
+    @classmethod
+    async def init_session(cls) -> None:
+        cls._client = httpx.AsyncClient(
+            base_url=settings.OSRM_URL,
+            http2=settings.OSRM_HTTP2,
+            headers={'Accept-Encoding': 'gzip'},
+            limits=httpx.Limits(
+                max_connections=settings.OSRM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OSRM_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.OSRM_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            timeout=httpx.Timeout(
+                settings.OSRM_READ_TIMEOUT_SECONDS,
+                connect=settings.OSRM_CONNECT_TIMEOUT_SECONDS,
+            ),
+        )
+
+    @classmethod
+    async def close_session(cls) -> None:
+        if cls._client:
+            await cls._client.aclose()
+        cls._client = None
+
+    @classmethod
+    def get_client(cls) -> httpx.AsyncClient:
+        if not cls._client:
+            raise RuntimeError
+        return cls._client
+
+
+def get_osrm_client() -> httpx.AsyncClient:
+    return OSRMManager.get_client()
@@ -0,0 +1,62 @@
+import os
+from enum import Enum
+from pathlib import Path
+
+from app.core.cache_manager import get_cache_client
+from app.core.settings import settings
+from app.solvers.remote_solver_executor import RemoteSolverExecutor
+from app.solvers.solver_executor import SolverExecutor
+
+CGROUP_CPU_MAX = Path('/sys/fs/cgroup/cpu.max')
+
+
+class SolverBackendEnum(str, Enum):
+    LOCAL = 'local'
+    REDIS = 'redis'
+
+
+def get_cpu_quota() -> int:
+    cpu_count = os.process_cpu_count() or 1
+    try:
+        quota, period = CGROUP_CPU_MAX.read_text().split()
+        return max(1, min(cpu_count, int(quota) // int(period)))
+    except (OSError, ValueError):
+        return cpu_count
+
+
+class SolverManager:
+    _executor: SolverExecutor | None = None
+
+    @classmethod
+    async def init_pool(cls, backend: SolverBackendEnum | None = None) -> None:
+        if (backend or settings.SOLVER_BACKEND) == SolverBackendEnum.REDIS:
+            cls._executor = RemoteSolverExecutor(
+                get_cache_client(),
+                slots=settings.SOLVER_REMOTE_SLOTS,
+                queue_size=settings.SOLVER_QUEUE_SIZE,
+                aging_per_second=settings.SOLVER_SCHEDULER_AGING_STOPS_PER_SECOND,
+            )
+        else:
+            cls._executor = SolverExecutor(
+                workers=settings.SOLVER_WORKERS or get_cpu_quota(),
+                queue_size=settings.SOLVER_QUEUE_SIZE,
+                max_solves_per_worker=settings.SOLVER_MAX_SOLVES_PER_WORKER,
+                aging_per_second=settings.SOLVER_SCHEDULER_AGING_STOPS_PER_SECOND,
+            )
+        await cls._executor.start()
+
+    @classmethod
+    async def close_pool(cls) -> None:
+        if cls._executor:
+            await cls._executor.shutdown()
+        cls._executor = None
+
+    @classmethod
+    def get_executor(cls) -> SolverExecutor:
+        if not cls._executor:
+            raise RuntimeError
+        return cls._executor
+
+
+def get_solver_executor() -> SolverExecutor:
+    return SolverManager.get_executor()
@@ -74,3 +74,16 @@ class ForbiddenError(BaseError):
         status_code: int = HTTPStatus.FORBIDDEN,
     ) -> None:
         super().__init__(message, status_code)
+
+
+class ServiceUnavailableError(BaseError):
+    def __init__(
+        self,
+        message: str = HTTPStatus.SERVICE_UNAVAILABLE.description,
+        status_code: int = HTTPStatus.SERVICE_UNAVAILABLE,
+    ) -> None:
+        super().__init__(
+            message,
+            status_code,
+            headers={'Retry-After': '1'},
+        )
@@ -15,6 +15,7 @@ async def __create_handle_error(
     return JSONResponse(
         status_code=exc.status_code,
         content={'error': type(exc).__name__, 'detail': exc.message},
+        headers=exc.headers,
     )
 
 
@@ -4,6 +4,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.routers import (
     auth_router,
     health_check_router,
+    job_router,
     path_router,
     root_router,
     user_router,
@@ -70,6 +71,7 @@ app.add_middleware(LoggerMiddleware)
 add_exceptions_handler(app)
 
 app.include_router(health_check_router.router)
+app.include_router(job_router.router)
 app.include_router(path_router.router)
 app.include_router(root_router.router)
 app.include_router(user_router.router)
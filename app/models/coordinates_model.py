@@ -1,6 +1,7 @@
+from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Numeric
+from sqlalchemy import DateTime, Float, Integer, Numeric
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.table_model import TableModel
@@ -14,6 +15,29 @@ class CoordinatesModel(TableModel):
 
     lat: Mapped[float] = mapped_column(Numeric(9, 7), nullable=False)
     lng: Mapped[float] = mapped_column(Numeric(10, 7), nullable=False)
+    arrival_seconds: Mapped[float | None] = mapped_column(
+        Float,
+        nullable=True,
+    )
+    position: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    time_window_start_seconds: Mapped[int | None] = mapped_column(
+        Integer,
+        nullable=True,
+    )
+    time_window_end_seconds: Mapped[int | None] = mapped_column(
+        Integer,
+        nullable=True,
+    )
+    service_seconds: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default='0',
+    )
+    completed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
 
     paths: Mapped[list['PathModel']] = relationship(
         back_populates='pickup',
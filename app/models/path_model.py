@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from sqlalchemy import Column, ForeignKey, Table
+from sqlalchemy import Boolean, Column, ForeignKey, Table
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.coordinates_model import CoordinatesModel
@@ -38,10 +38,17 @@ class PathModel(TableModel):
     )
     dropoff: Mapped[list[CoordinatesModel]] = relationship(
         secondary=dropoff_coordinates,
+        order_by=CoordinatesModel.position,
         lazy='raise',
         cascade='all, delete-orphan',
         single_parent=True,
     )
+    estimated: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        default=False,
+        server_default='false',
+    )
 
     def __repr__(self) -> str:
         return (
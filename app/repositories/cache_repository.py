@@ -1,3 +1,5 @@
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
 from json import loads
 from typing import Annotated
 
@@ -55,3 +57,65 @@ class CacheRepository:
             cache_key = self._make_key(prefix, key)
             pipe.setex(cache_key, ttl, value)
         await pipe.execute()
+
+    async def acquire_many(
+        self, prefix: str, keys: list[str], ttl_ms: int
+    ) -> list[bool]:
+        pipe = self.cache_client.pipeline()
+        for key in keys:
+            cache_key = self._make_key(prefix, key)
+            pipe.set(cache_key, 1, nx=True, px=ttl_ms)
+        return [bool(acquired) for acquired in await pipe.execute()]
+
+    async def delete_many(self, prefix: str, keys: list[str]) -> None:
+        if not keys:
+            return
+        cache_keys = [self._make_key(prefix, key) for key in keys]
+        await self.cache_client.delete(*cache_keys)
+
+    async def add_to_set(
+        self, prefix: str, key: str, member: str, ttl: int = 600
+    ) -> None:
+        cache_key = self._make_key(prefix, key)
+        pipe = self.cache_client.pipeline()
+        pipe.sadd(cache_key, member)
+        pipe.expire(cache_key, ttl)
+        await pipe.execute()
+
+    async def get_set_members(self, prefix: str, key: str) -> set[str]:
+        cache_key = self._make_key(prefix, key)
+        return await self.cache_client.smembers(cache_key)  # pyright: ignore[reportGeneralTypeIssues]
+
+    async def increment_field(
+        self, prefix: str, key: str, field: str, amount: int = 1
+    ) -> None:
+        cache_key = self._make_key(prefix, key)
+        await self.cache_client.hincrby(cache_key, field, amount)  # pyright: ignore[reportGeneralTypeIssues]
+
+    async def get_fields(self, prefix: str, key: str) -> dict[str, str]:
+        cache_key = self._make_key(prefix, key)
+        return await self.cache_client.hgetall(cache_key)  # pyright: ignore[reportGeneralTypeIssues]
+
+    async def publish(self, prefix: str, key: str, message: str) -> None:
+        await self.cache_client.publish(self._make_key(prefix, key), message)
+
+    @asynccontextmanager
+    async def subscribe(
+        self, prefix: str, key: str, poll_seconds: float
+    ) -> AsyncIterator[AsyncGenerator[str | None]]:
+        channel = self._make_key(prefix, key)
+        pubsub = self.cache_client.pubsub()
+        await pubsub.subscribe(channel)
+
+        async def __messages() -> AsyncGenerator[str | None]:
+            while True:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=poll_seconds
+                )
+                yield message['data'] if message else None
+
+        try:
+            yield __messages()
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from typing import ClassVar
+
+import numpy as np
+
+from app.schemas.coordinates_schema import CoordinatesBase
+
+
+class DistanceProvider(ABC):
+    estimated: ClassVar[bool] = False
+
+    @abstractmethod
+    async def get_pairs_cost(
+        self,
+        coords: Sequence[CoordinatesBase],
+        pairs: Sequence[tuple[int, int]],
+    ) -> np.ndarray: ...
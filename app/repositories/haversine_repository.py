@@ -0,0 +1,35 @@
+from collections.abc import Sequence
+from typing import ClassVar
+
+import numpy as np
+
+from app.core.settings import settings
+from app.repositories.distance_provider import DistanceProvider
+from app.schemas.coordinates_schema import CoordinatesBase
+
+EARTH_RADIUS_METERS = 6_371_008.8
+
+
+class HaversineRepository(DistanceProvider):
+    estimated: ClassVar[bool] = True
+
+    async def get_pairs_cost(
+        self,
+        coords: Sequence[CoordinatesBase],
+        pairs: Sequence[tuple[int, int]],
+    ) -> np.ndarray:
+        if not pairs:
+            return np.empty(0)
+        points = np.radians([[coord.lat, coord.lng] for coord in coords])
+        rows, columns = np.asarray(pairs).T
+        lat1, lng1 = points[rows].T
+        lat2, lng2 = points[columns].T
+
+        a = (
+            np.sin((lat2 - lat1) / 2) ** 2
+            + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+        )
+        meters = 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(a))
+        meters_per_second = settings.DISTANCE_ESTIMATE_SPEED_KMH / 3.6
+        detour_meters = meters * settings.DISTANCE_ESTIMATE_DETOUR_FACTOR
+        return detour_meters / meters_per_second
@@ -0,0 +1,85 @@
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+from h3 import get_resolution, int_to_str, latlng_to_cell, str_to_int
+
+from app.core.settings import settings
+from app.repositories.distance_provider import DistanceProvider
+from app.schemas.coordinates_schema import CoordinatesBase
+
+CELLS_FILE = 'cells.npy'
+DURATIONS_FILE = 'durations.npy'
+UNREACHABLE = np.iinfo(np.uint16).max
+
+
+class MatrixRepository(DistanceProvider):
+    def __init__(self, cells: np.ndarray, durations: np.ndarray) -> None:
+        self.cells = cells
+        self.durations = durations
+
+    @classmethod
+    def load(cls, path: Path) -> 'MatrixRepository':
+        cells = np.load(path / CELLS_FILE, mmap_mode='r')
+        durations = np.load(path / DURATIONS_FILE, mmap_mode='r')
+        resolution = get_resolution(int_to_str(int(cells[0])))
+        if resolution != settings.H3_RESOLUTION:
+            message = (
+                f'{path} holds resolution {resolution} cells, '
+                f'expected {settings.H3_RESOLUTION}'
+            )
+            raise ValueError(message)
+        return cls(cells, durations)
+
+    @classmethod
+    def save(
+        cls, path: Path, cells: Sequence[str], durations: np.ndarray
+    ) -> None:
+        cell_ids = np.fromiter(
+            (str_to_int(cell) for cell in cells),
+            dtype=np.uint64,
+            count=len(cells),
+        )
+        order = np.argsort(cell_ids)
+        durations = durations[np.ix_(order, order)]
+        compact = np.where(
+            np.isnan(durations),
+            UNREACHABLE,
+            np.clip(np.rint(durations), 0, UNREACHABLE - 1),
+        ).astype(np.uint16)
+
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / CELLS_FILE, cell_ids[order])
+        np.save(path / DURATIONS_FILE, compact)
+
+    async def get_pairs_cost(
+        self,
+        coords: Sequence[CoordinatesBase],
+        pairs: Sequence[tuple[int, int]],
+    ) -> np.ndarray:
+        costs = np.full(len(pairs), np.nan)
+        if not pairs:
+            return costs
+        rows = self._get_rows(coords)
+        sources, destinations = rows[np.asarray(pairs).T]
+        known = (sources >= 0) & (destinations >= 0)
+        durations = self.durations[sources[known], destinations[known]]
+        costs[known] = np.where(durations == UNREACHABLE, np.nan, durations)
+        return costs
+
+    def _get_rows(self, coords: Sequence[CoordinatesBase]) -> np.ndarray:
+        cell_ids = np.fromiter(
+            (
+                str_to_int(
+                    latlng_to_cell(
+                        coord.lat, coord.lng, settings.H3_RESOLUTION
+                    )
+                )
+                for coord in coords
+            ),
+            dtype=np.uint64,
+            count=len(coords),
+        )
+        rows = np.searchsorted(self.cells, cell_ids)
+        rows[rows == len(self.cells)] = 0
+        return np.where(self.cells[rows] == cell_ids, rows, -1)
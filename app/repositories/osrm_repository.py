@@ -0,0 +1,133 @@
+import asyncio
+from collections.abc import Sequence
+from typing import Annotated
+
+import httpx
+import numpy as np
+from fastapi import Depends
+
+from app.core.osrm_manager import get_osrm_client
+from app.core.settings import settings
+from app.repositories.distance_provider import DistanceProvider
+from app.schemas.coordinates_schema import CoordinatesBase
+
+BLOCK_MIN_OVERLAP = 0.5
+
+
+class OSRMRepository(DistanceProvider):
+    def __init__(
+        self,
+        osrm_client: Annotated[httpx.AsyncClient, Depends(get_osrm_client)],
+    ) -> None:
+        self.osrm_client = osrm_client
+        self._semaphore = asyncio.Semaphore(
+            settings.OSRM_MAX_CONCURRENT_REQUESTS
+        )
+
+    async def get_table(
+        self,
+        coords: Sequence[CoordinatesBase],
+        sources: Sequence[int],
+        destinations: Sequence[int],
+    ) -> list[list[float]]:
+        coords_url = ';'.join(f'{coord.lng},{coord.lat}' for coord in coords)
+        response = await self.osrm_client.get(
+            url=f'table/v1/driving/{coords_url}',
+            params={
+                'annotations': 'duration',
+                'sources': ';'.join(str(index) for index in sources),
+                'destinations': ';'.join(str(index) for index in destinations),
+            },
+        )
+        response.raise_for_status()
+        return response.json()['durations']
+
+    async def get_matrix(
+        self,
+        coords: Sequence[CoordinatesBase],
+        sources: Sequence[int],
+        destinations: Sequence[int],
+    ) -> np.ndarray:
+        matrix = np.empty((len(sources), len(destinations)))
+        tile_size = settings.OSRM_TABLE_TILE_SIZE
+
+        async def __fetch_tile(row: int, column: int) -> None:
+            tile_sources = sources[row : row + tile_size]
+            tile_destinations = destinations[column : column + tile_size]
+            locations = list(
+                dict.fromkeys([*tile_sources, *tile_destinations])
+            )
+            position = {location: p for p, location in enumerate(locations)}
+            async with self._semaphore:
+                table = await self.get_table(
+                    [coords[location] for location in locations],
+                    [position[source] for source in tile_sources],
+                    [
+                        position[destination]
+                        for destination in tile_destinations
+                    ],
+                )
+            matrix[
+                row : row + len(tile_sources),
+                column : column + len(tile_destinations),
+            ] = np.asarray(table, dtype=np.float64)
+
+        await asyncio.gather(
+            *(
+                __fetch_tile(row, column)
+                for row in range(0, len(sources), tile_size)
+                for column in range(0, len(destinations), tile_size)
+            )
+        )
+        return matrix
+
+    @classmethod
+    def plan_blocks(
+        cls, missing: np.ndarray
+    ) -> list[tuple[list[int], list[int]]]:
+        missing = missing.copy()
+        blocks = []
+        degrees = missing.sum(axis=1)
+        while degrees.any():
+            hub = int(degrees.argmax())
+            destinations = np.flatnonzero(missing[hub])
+            overlap = missing[:, destinations].sum(axis=1)
+            sources = np.flatnonzero(
+                overlap >= BLOCK_MIN_OVERLAP * len(destinations)
+            )
+            missing[np.ix_(sources, destinations)] = False
+            missing[np.ix_(destinations, sources)] = False
+            blocks.append((sources.tolist(), destinations.tolist()))
+            degrees = missing.sum(axis=1)
+        return blocks
+
+    async def get_pairs_cost(
+        self,
+        coords: Sequence[CoordinatesBase],
+        pairs: Sequence[tuple[int, int]],
+    ) -> np.ndarray:
+        if not pairs:
+            return np.empty(0)
+        # pair costs are cached under an unordered cell key, so they are
+        # treated as undirected: a pair may be served by the reverse
+        # direction when a block only fetched that one
+        rows, columns = np.asarray(pairs).T
+        missing = np.zeros((len(coords), len(coords)), dtype=bool)
+        missing[rows, columns] = True
+        missing[columns, rows] = True
+
+        blocks = self.plan_blocks(missing)
+        matrices = await asyncio.gather(
+            *(
+                self.get_matrix(coords, sources, destinations)
+                for sources, destinations in blocks
+            )
+        )
+
+        costs = np.full(missing.shape, np.nan)
+        for (sources, destinations), matrix in zip(
+            blocks, matrices, strict=True
+        ):
+            costs[np.ix_(sources, destinations)] = matrix
+        costs = np.where(np.isnan(costs), costs.T, costs)
+        return costs[rows, columns]
@@ -1,15 +1,16 @@
 from collections.abc import Sequence
+from datetime import datetime
 from typing import Annotated, Any
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import asc, desc, select
+from sqlalchemy import asc, desc, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_session
 from app.models.coordinates_model import CoordinatesModel
-from app.models.path_model import PathModel
+from app.models.path_model import PathModel, dropoff_coordinates
 from app.schemas.filters_params_schema import SortEnum
 
 
@@ -21,32 +22,58 @@ class PathRepository:
         self.db_session = db_session
 
     async def create(self, path: dict[str, Any]) -> PathModel:
-        pickup_data = path.pop('pickup')
-        dropff_data_list = path.pop('dropoff')
+        [new_path] = await self.create_many([path])
+        return new_path
 
-        pickup_coords = CoordinatesModel(**pickup_data)
-        self.db_session.add(pickup_coords)
+    async def create_many(
+        self, paths: list[dict[str, Any]]
+    ) -> list[PathModel]:
+        new_paths = [self._build_path(path) for path in paths]
+        self.db_session.add_all(new_paths)
         await self.db_session.commit()
-        await self.db_session.refresh(pickup_coords)
 
-        new_path = PathModel(pickup_id=pickup_coords.id, **path)
-        self.db_session.add(new_path)
+        for new_path in new_paths:
+            await self.db_session.refresh(
+                new_path,
+                attribute_names=['pickup', 'dropoff'],
+            )
+
+        return new_paths
 
-        dropoff_coords_list = []
-        for dropoff_data in dropff_data_list:
-            dropoff_coords = CoordinatesModel(**dropoff_data)
-            dropoff_coords_list.append(dropoff_coords)
+    def _build_path(self, path: dict[str, Any]) -> PathModel:
+        pickup_data = path.pop('pickup')
+        dropff_data_list = path.pop('dropoff')
+
+        return PathModel(
+            pickup=CoordinatesModel(**pickup_data),
+            dropoff=[
+                CoordinatesModel(**dropoff_data)
+                for dropoff_data in dropff_data_list
+            ],
+            **path,
+        )
 
-        self.db_session.add_all(dropoff_coords_list)
-        new_path.dropoff = dropoff_coords_list
+    async def update_dropoff(
+        self, path: PathModel, dropoff_data_list: list[dict[str, Any]]
+    ) -> PathModel:
+        current_dropoff = {dropoff.id: dropoff for dropoff in path.dropoff}
+        dropoff_list = []
+        for dropoff_data in dropoff_data_list:
+            dropoff = current_dropoff.get(dropoff_data.pop('id', None))
+            if dropoff is None:
+                dropoff = CoordinatesModel(**dropoff_data)
+            else:
+                for field, value in dropoff_data.items():
+                    setattr(dropoff, field, value)
+            dropoff_list.append(dropoff)
+        path.dropoff = dropoff_list
 
         await self.db_session.commit()
         await self.db_session.refresh(
-            new_path,
+            path,
             attribute_names=['pickup', 'dropoff'],
         )
-
-        return new_path
+        return path
 
     async def search(self, path_id: UUID) -> PathModel | None:
         result = await self.db_session.execute(
@@ -85,6 +112,35 @@ class PathRepository:
         )
         return result.scalars().all()
 
+    async def search_recent_stops(
+        self, since: datetime, limit: int
+    ) -> list[tuple[UUID, float, float]]:
+        recent = (
+            select(PathModel.id, PathModel.pickup_id)
+            .where(PathModel.created_at >= since)
+            .order_by(desc(PathModel.created_at))
+            .limit(limit)
+            .subquery()
+        )
+        pickups = select(
+            recent.c.id, CoordinatesModel.lat, CoordinatesModel.lng
+        ).join(CoordinatesModel, CoordinatesModel.id == recent.c.pickup_id)
+        dropoffs = (
+            select(recent.c.id, CoordinatesModel.lat, CoordinatesModel.lng)
+            .join(
+                dropoff_coordinates,
+                dropoff_coordinates.c.path_id == recent.c.id,
+            )
+            .join(
+                CoordinatesModel,
+                CoordinatesModel.id == dropoff_coordinates.c.coordinates_id,
+            )
+        )
+        result = await self.db_session.execute(union_all(pickups, dropoffs))
+        return [
+            (path_id, float(lat), float(lng)) for path_id, lat, lng in result
+        ]
+
     async def delete(self, path: PathModel) -> None:
         await self.db_session.delete(path)
         await self.db_session.commit()
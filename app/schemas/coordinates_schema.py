@@ -3,6 +3,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from app.schemas.solver_schema import TimeWindow
+
 
 class CoordinatesBase(BaseModel):
     lat: float = Field(..., ge=-90, le=90, title='Latitude')
@@ -15,13 +17,24 @@ class CoordinatesBase(BaseModel):
 
 
 class CoordinatesCreate(CoordinatesBase):
-    pass
+    time_window: TimeWindow | None = Field(
+        default=None,
+        description='seconds since the shift start to serve the stop',
+    )
+    service_seconds: int = Field(
+        default=0,
+        ge=0,
+        description='seconds spent serving the stop',
+    )
 
 
 class CoordinatesResponse(BaseModel):
     id: UUID
     lat: float
     lng: float
+    arrival_seconds: float | None = None
+    position: int | None = None
+    completed_at: datetime | None = None
     created_at: datetime
     updated_at: datetime
 
@@ -50,3 +50,38 @@ PathExample: dict[str, Example] = {
         },
     },
 }
+
+FleetPathExample: dict[str, Example] = {
+    'normal': {
+        'summary': 'A real example',
+        'description': 'Two **vans** share the dropoffs of one pickup.',
+        'value': {
+            'pickup': {
+                'lat': -20.85813898724443,
+                'lng': -41.12059275469019,
+            },
+            'dropoff': [
+                {
+                    'lat': -20.86794273082698,
+                    'lng': -41.12421471361417,
+                },
+                {
+                    'lat': -20.86210006985298,
+                    'lng': -41.11782717339757,
+                },
+                {
+                    'lat': -20.85627289434021,
+                    'lng': -41.120378377121924,
+                },
+                {
+                    'lat': -20.854130152196113,
+                    'lng': -41.12614436259626,
+                },
+            ],
+            'vehicles': [
+                {'capacity': 2, 'max_route_seconds': 3600},
+                {'capacity': 2},
+            ],
+        },
+    },
+}
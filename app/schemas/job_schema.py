@@ -0,0 +1,25 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.schemas.path_schema import PathResponse
+
+
+class JobStatusEnum(str, Enum):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+
+
+class JobResponse(BaseModel):
+    id: UUID
+    user_id: UUID
+    status: JobStatusEnum
+    result: PathResponse | None = None
+    error: dict[str, Any] | None = None
+    created_at: datetime
+    updated_at: datetime
@@ -1,12 +1,18 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.schemas.coordinates_schema import (
+    CoordinatesBase,
     CoordinatesCreate,
     CoordinatesResponse,
 )
+from app.schemas.solver_schema import (
+    QualityEnum,
+    SolverEnum,
+    VehicleConstraints,
+)
 
 
 class PathBase(BaseModel):
@@ -16,6 +22,65 @@ class PathBase(BaseModel):
 class PathCreate(PathBase):
     pickup: CoordinatesCreate
     dropoff: list[CoordinatesCreate]
+    quality: QualityEnum = Field(
+        default=QualityEnum.BALANCED,
+        description='trade solve latency for route quality',
+    )
+    max_solve_ms: int | None = Field(
+        default=None,
+        gt=0,
+        description='upper bound for the route search time',
+    )
+    solver: SolverEnum = Field(
+        default=SolverEnum.AUTO,
+        description='route solver, auto picks one by instance size',
+    )
+    drop_infeasible: bool = Field(
+        default=False,
+        description='drop dropoffs that miss their time window, not fail',
+    )
+
+
+class FleetPathCreate(PathBase):
+    pickup: CoordinatesCreate
+    dropoff: list[CoordinatesCreate]
+    vehicles: list[VehicleConstraints] = Field(
+        min_length=1,
+        description='vehicles leaving the pickup, one path for each',
+    )
+    quality: QualityEnum = Field(
+        default=QualityEnum.BALANCED,
+        description='trade solve latency for route quality',
+    )
+    max_solve_ms: int | None = Field(
+        default=None,
+        gt=0,
+        description='upper bound for the route search time',
+    )
+
+
+class PathUpdate(PathBase):
+    add: list[CoordinatesBase] = Field(
+        default_factory=list,
+        description='new dropoffs inserted in the pending route',
+    )
+    remove: list[UUID] = Field(
+        default_factory=list,
+        description='ids of pending dropoffs taken out of the route',
+    )
+    complete: list[UUID] = Field(
+        default_factory=list,
+        description='ids of dropoffs already delivered',
+    )
+    quality: QualityEnum = Field(
+        default=QualityEnum.FAST,
+        description='trade solve latency for route quality',
+    )
+    max_solve_ms: int | None = Field(
+        default=None,
+        gt=0,
+        description='upper bound for the route search time',
+    )
 
 
 class PathResponse(PathBase):
@@ -23,11 +88,27 @@ class PathResponse(PathBase):
     user_id: UUID
     pickup: CoordinatesResponse
     dropoff: list[CoordinatesResponse]
+    dropped: list[CoordinatesCreate] = Field(default_factory=list)
+    estimated: bool = Field(
+        default=False,
+        description='costs were estimated while the routing backend was down',
+    )
     created_at: datetime
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class PathPreview(PathBase):
+    pickup: CoordinatesCreate
+    dropoff: list[CoordinatesCreate]
+    objective: float | None = None
+    search_ms: float
+    estimated: bool = Field(
+        default=False,
+        description='costs were estimated while the routing backend was down',
+    )
+
+
 class PathResponseList(PathBase):
     data: list[PathResponse]
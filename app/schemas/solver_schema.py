@@ -0,0 +1,114 @@
+from enum import Enum
+from typing import Any, Self
+from uuid import uuid4
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class QualityEnum(str, Enum):
+    FAST = 'fast'
+    BALANCED = 'balanced'
+    BEST = 'best'
+
+
+QUALITY_MULTIPLIERS = {
+    QualityEnum.FAST: 0.25,
+    QualityEnum.BALANCED: 1.0,
+    QualityEnum.BEST: 3.0,
+}
+
+
+class SolverEnum(str, Enum):
+    AUTO = 'auto'
+    ORTOOLS = 'ortools'
+    LOCAL_SEARCH = 'local_search'
+    PORTFOLIO = 'portfolio'
+
+
+class TimeWindow(BaseModel):
+    start_seconds: int = Field(..., ge=0)
+    end_seconds: int = Field(..., ge=0)
+
+    @model_validator(mode='after')
+    def check_order(self) -> Self:
+        if self.end_seconds < self.start_seconds:
+            message = 'end_seconds must not be before start_seconds'
+            raise ValueError(message)
+        return self
+
+
+class StopConstraints(BaseModel):
+    time_window: TimeWindow | None = None
+    service_seconds: int = Field(default=0, ge=0)
+
+
+class SolverStrategy(BaseModel):
+    first_solution: str = 'PATH_CHEAPEST_ARC'
+    metaheuristic: str = 'GUIDED_LOCAL_SEARCH'
+
+    @property
+    def key(self) -> str:
+        return f'{self.first_solution}:{self.metaheuristic}'
+
+    @classmethod
+    def from_key(cls, key: str) -> Self:
+        first_solution, metaheuristic = key.split(':')
+        return cls(first_solution=first_solution, metaheuristic=metaheuristic)
+
+
+class SolveOptions(BaseModel):
+    time_limit_ms: int = Field(default=10_000, gt=0)
+    stall_ms: int | None = Field(default=None, gt=0)
+    solver: SolverEnum = SolverEnum.AUTO
+    strategy: SolverStrategy | None = None
+
+
+class SolverResult(BaseModel):
+    route: list[int]
+    dropped: list[int] = Field(default_factory=list)
+    objective: float | None = None
+    search_ms: float = 0.0
+    solver: str = 'ortools'
+    strategy: str | None = None
+
+
+class VehicleConstraints(BaseModel):
+    capacity: int | None = Field(
+        default=None,
+        gt=0,
+        description='maximum number of dropoffs served by the vehicle',
+    )
+    max_route_seconds: int | None = Field(
+        default=None,
+        gt=0,
+        description='maximum route duration, including the return to pickup',
+    )
+
+
+class FleetSolverResult(BaseModel):
+    routes: list[list[int]]
+    dropped: list[int] = Field(default_factory=list)
+    objective: float | None = None
+    search_ms: float = 0.0
+    solver: str = 'ortools'
+
+
+class CachedRoute(BaseModel):
+    cells: list[str]
+    legs: list[float] | None = None
+    objective: float | None = None
+    quality: QualityEnum
+    solver: str
+
+
+class SolverTask(BaseModel):
+    id: str = Field(default_factory=lambda: uuid4().hex)
+    function: str
+    carrier: dict[str, str] = Field(default_factory=dict)
+    arguments: list[Any]
+
+
+class SolverTaskResult(BaseModel):
+    id: str
+    result: Any = None
+    error: str | None = None
@@ -1,3 +1,5 @@
+from collections.abc import AsyncGenerator
+from contextlib import AbstractAsyncContextManager
 from typing import Annotated
 
 from fastapi import Depends
@@ -26,3 +28,35 @@ class CacheService:
         self, prefix: str, keys: list[str], values: list, ttl: int = 600
     ) -> None:
         await self.repository.set_many(prefix, keys, values, ttl)
+
+    async def acquire_many(
+        self, prefix: str, keys: list[str], ttl_ms: int
+    ) -> list[bool]:
+        return await self.repository.acquire_many(prefix, keys, ttl_ms)
+
+    async def delete_many(self, prefix: str, keys: list[str]) -> None:
+        await self.repository.delete_many(prefix, keys)
+
+    async def add_to_set(
+        self, prefix: str, key: str, member: str, ttl: int = 600
+    ) -> None:
+        await self.repository.add_to_set(prefix, key, member, ttl)
+
+    async def get_set_members(self, prefix: str, key: str) -> set[str]:
+        return await self.repository.get_set_members(prefix, key)
+
+    async def increment_field(
+        self, prefix: str, key: str, field: str, amount: int = 1
+    ) -> None:
+        await self.repository.increment_field(prefix, key, field, amount)
+
+    async def get_fields(self, prefix: str, key: str) -> dict[str, str]:
+        return await self.repository.get_fields(prefix, key)
+
+    async def publish(self, prefix: str, key: str, message: str) -> None:
+        await self.repository.publish(prefix, key, message)
+
+    def subscribe(
+        self, prefix: str, key: str, poll_seconds: float
+    ) -> AbstractAsyncContextManager[AsyncGenerator[str | None]]:
+        return self.repository.subscribe(prefix, key, poll_seconds)
@@ -0,0 +1,110 @@
+import asyncio
+from collections import Counter, defaultdict
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+from itertools import batched, combinations
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import Depends
+from h3 import cell_to_latlng, latlng_to_cell
+
+from app.core.logger import get_logger
+from app.core.settings import settings
+from app.repositories.path_repository import PathRepository
+from app.schemas.coordinates_schema import CoordinatesBase
+from app.services.distance_service import DistanceService
+
+logger = get_logger(__name__)
+
+
+class CacheWarmingService:
+    def __init__(
+        self,
+        repository: Annotated[PathRepository, Depends()],
+        distances: Annotated[DistanceService, Depends()],
+    ) -> None:
+        self.repository = repository
+        self.distances = distances
+        self.distances.cache_ttl = settings.CACHE_WARMING_TTL_SECONDS
+
+    async def warm(self) -> int:
+        since = datetime.now(UTC) - timedelta(
+            days=settings.CACHE_WARMING_LOOKBACK_DAYS
+        )
+        stops = await self.repository.search_recent_stops(
+            since, settings.CACHE_WARMING_MAX_PATHS
+        )
+        pairs = self.get_frequent_pairs(stops)
+        logger.info(
+            'distance cache warming started',
+            stops=len(stops),
+            pairs=len(pairs),
+        )
+        return await self.warm_pairs(pairs)
+
+    async def warm_pairs(self, pairs: Sequence[tuple[str, str]]) -> int:
+        loop = asyncio.get_running_loop()
+        interval = 1 / settings.CACHE_WARMING_BATCHES_PER_SECOND
+        warmed = 0
+        for batch in batched(
+            pairs, settings.CACHE_WARMING_BATCH_PAIRS, strict=False
+        ):
+            started_at = loop.time()
+            cells = list(
+                dict.fromkeys(cell for pair in batch for cell in pair)
+            )
+            cell_index = {cell: index for index, cell in enumerate(cells)}
+            pairs_cost = await self.distances.get_pairs_cost(
+                [
+                    CoordinatesBase(lat=lat, lng=lng)
+                    for lat, lng in map(cell_to_latlng, cells)
+                ],
+                cells,
+                [
+                    (cell_index[first], cell_index[second])
+                    for first, second in batch
+                ],
+            )
+            if pairs_cost.estimated:
+                logger.warning(
+                    'distance cache warming stopped, osrm unavailable',
+                    warmed=warmed,
+                )
+                break
+            warmed += len(batch)
+            await asyncio.sleep(interval - (loop.time() - started_at))
+
+        logger.info('distance cache warmed', pairs=warmed)
+        return warmed
+
+    @classmethod
+    def get_frequent_pairs(
+        cls, stops: Sequence[tuple[UUID, float, float]]
+    ) -> list[tuple[str, str]]:
+        path_cells: defaultdict[UUID, set[str]] = defaultdict(set)
+        for path_id, lat, lng in stops:
+            path_cells[path_id].add(
+                latlng_to_cell(lat, lng, settings.H3_RESOLUTION)
+            )
+
+        cell_counts = Counter(
+            cell for cells in path_cells.values() for cell in cells
+        )
+        frequent_cells = {
+            cell
+            for cell, _ in cell_counts.most_common(
+                settings.CACHE_WARMING_MAX_CELLS
+            )
+        }
+        pair_counts = Counter(
+            pair
+            for cells in path_cells.values()
+            for pair in combinations(sorted(cells & frequent_cells), 2)
+        )
+        return [
+            pair
+            for pair, _ in pair_counts.most_common(
+                settings.CACHE_WARMING_MAX_PAIRS
+            )
+        ]
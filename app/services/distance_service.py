@@ -0,0 +1,310 @@
+import asyncio
+import math
+import time
+from collections.abc import Sequence
+from http import HTTPStatus
+from typing import Annotated, ClassVar, NamedTuple
+
+import httpx
+import numpy as np
+from fastapi import Depends
+
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.distance_manager import (
+    get_distance_matrix,
+    get_distance_provider,
+)
+from app.core.logger import get_logger
+from app.core.settings import settings
+from app.repositories.distance_provider import DistanceProvider
+from app.repositories.haversine_repository import HaversineRepository
+from app.repositories.matrix_repository import MatrixRepository
+from app.schemas.coordinates_schema import CoordinatesBase
+from app.services.cache_service import CacheService
+
+logger = get_logger(__name__)
+
+type KeyPairs = dict[str, tuple[int, int]]
+type KeyCosts = dict[str, tuple[float, bool]]
+
+
+class PairsCost(NamedTuple):
+    costs: dict[tuple[int, int], float]
+    estimated: bool
+
+
+class DistanceService:
+    _in_flight: ClassVar[dict[str, asyncio.Future[tuple[float, bool]]]] = {}
+    breaker: ClassVar[CircuitBreaker] = CircuitBreaker(
+        'osrm',
+        window=settings.OSRM_BREAKER_WINDOW,
+        min_calls=settings.OSRM_BREAKER_MIN_CALLS,
+        failure_rate=settings.OSRM_BREAKER_FAILURE_RATE,
+        slow_call_ms=settings.OSRM_BREAKER_SLOW_CALL_MS,
+        slow_call_rate=settings.OSRM_BREAKER_SLOW_CALL_RATE,
+        open_seconds=settings.OSRM_BREAKER_OPEN_SECONDS,
+    )
+
+    def __init__(
+        self,
+        cache: Annotated[CacheService, Depends()],
+        provider: Annotated[DistanceProvider, Depends(get_distance_provider)],
+        matrix: Annotated[
+            MatrixRepository | None, Depends(get_distance_matrix)
+        ] = None,
+    ) -> None:
+        self.cache = cache
+        self.provider = provider
+        self.matrix = matrix
+        self.cache_ttl = settings.DISTANCE_CACHE_TTL_SECONDS
+        self.estimator = (
+            provider if provider.estimated else HaversineRepository()
+        )
+
+    async def get_pairs_cost(
+        self,
+        coords: Sequence[CoordinatesBase],
+        cells: Sequence[str],
+        pairs: Sequence[tuple[int, int]],
+    ) -> PairsCost:
+        pair_keys = [self._make_pair_key(cells[i], cells[j]) for i, j in pairs]
+        key_pairs = dict(zip(pair_keys, pairs, strict=True))
+
+        costs = await self._get_precomputed(coords, key_pairs)
+        costs |= await self._get_cached(
+            [key for key in key_pairs if key not in costs]
+        )
+        missing = {
+            key: pair for key, pair in key_pairs.items() if key not in costs
+        }
+        if missing:
+            costs |= await self._get_coalesced(coords, cells, missing)
+
+        return PairsCost(
+            costs={
+                pair: costs[key][0]
+                for pair, key in zip(pairs, pair_keys, strict=True)
+            },
+            estimated=any(estimated for _, estimated in costs.values()),
+        )
+
+    async def _get_coalesced(
+        self,
+        coords: Sequence[CoordinatesBase],
+        cells: Sequence[str],
+        key_pairs: KeyPairs,
+    ) -> KeyCosts:
+        waiting = {
+            key: self._in_flight[key]
+            for key in key_pairs
+            if key in self._in_flight
+        }
+        owned = {
+            key: pair for key, pair in key_pairs.items() if key not in waiting
+        }
+
+        costs = await self._lead(coords, cells, owned) if owned else {}
+        if waiting:
+            costs |= await self._follow(coords, cells, key_pairs, waiting)
+        return costs
+
+    async def _lead(
+        self,
+        coords: Sequence[CoordinatesBase],
+        cells: Sequence[str],
+        key_pairs: KeyPairs,
+    ) -> KeyCosts:
+        loop = asyncio.get_running_loop()
+        futures = {key: loop.create_future() for key in key_pairs}
+        self._in_flight.update(futures)
+        try:
+            costs = await self._get_leased(coords, cells, key_pairs)
+        except Exception as e:
+            for future in futures.values():
+                future.set_exception(e)
+                future.exception()
+            raise
+        else:
+            for key, future in futures.items():
+                future.set_result(costs[key])
+            return costs
+        finally:
+            for key, future in futures.items():
+                self._in_flight.pop(key, None)
+                future.cancel()
+
+    async def _follow(
+        self,
+        coords: Sequence[CoordinatesBase],
+        cells: Sequence[str],
+        key_pairs: KeyPairs,
+        waiting: dict[str, asyncio.Future[tuple[float, bool]]],
+    ) -> KeyCosts:
+        logger.debug('distance lookups coalesced', pairs=len(waiting))
+        await asyncio.wait(waiting.values())
+        costs = {}
+        orphaned = {}
+        for key, future in waiting.items():
+            if future.cancelled():
+                orphaned[key] = key_pairs[key]
+            else:
+                costs[key] = future.result()
+        if orphaned:
+            costs |= await self._get_coalesced(coords, cells, orphaned)
+        return costs
+
+    async def _get_leased(
+        self,
+        coords: Sequence[CoordinatesBase],
+        cells: Sequence[str],
+        key_pairs: KeyPairs,
+    ) -> KeyCosts:
+        keys = list(key_pairs)
+        acquired = await self.cache.acquire_many(
+            'dist_lease', keys, settings.DISTANCE_LEASE_TTL_MS
+        )
+        leased = {
+            key: pair
+            for key, pair, is_leader in zip(
+                keys, key_pairs.values(), acquired, strict=True
+            )
+            if is_leader
+        }
+        followed = [key for key in keys if key not in leased]
+
+        async def __fetch_leased() -> KeyCosts:
+            if not leased:
+                return {}
+            try:
+                return await self._fetch(coords, cells, leased)
+            finally:
+                await self.cache.delete_many('dist_lease', list(leased))
+
+        costs, waited = await asyncio.gather(
+            __fetch_leased(), self._wait_for_leaders(followed)
+        )
+        costs |= waited
+
+        abandoned = {
+            key: key_pairs[key] for key in followed if key not in waited
+        }
+        if abandoned:
+            logger.warning('distance lease abandoned', pairs=len(abandoned))
+            costs |= await self._fetch(coords, cells, abandoned)
+        return costs
+
+    async def _wait_for_leaders(self, keys: list[str]) -> KeyCosts:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.DISTANCE_LEASE_TTL_MS / 1000
+        costs: KeyCosts = {}
+        pending = keys
+        while pending and loop.time() < deadline:
+            await asyncio.sleep(settings.DISTANCE_LEASE_POLL_SECONDS)
+            costs |= await self._get_cached(pending)
+            pending = [key for key in pending if key not in costs]
+            if pending and not await self.cache.get_many(
+                'dist_lease', pending
+            ):
+                break
+        return costs
+
+    async def _fetch(
+        self,
+        coords: Sequence[CoordinatesBase],
+        cells: Sequence[str],
+        key_pairs: KeyPairs,
+    ) -> KeyCosts:
+        cell_coords = {
+            cells[node]: coords[node]
+            for pair in key_pairs.values()
+            for node in pair
+        }
+        cell_index = {cell: index for index, cell in enumerate(cell_coords)}
+        unique_coords = list(cell_coords.values())
+        indexed_pairs = [
+            (cell_index[cells[i]], cell_index[cells[j]])
+            for i, j in key_pairs.values()
+        ]
+
+        costs = None
+        if not self.provider.estimated:
+            costs = await self._get_routed(unique_coords, indexed_pairs)
+        if costs is None:
+            costs = await self.estimator.get_pairs_cost(
+                unique_coords, indexed_pairs
+            )
+            return {
+                key: (cost, True)
+                for key, cost in zip(key_pairs, costs.tolist(), strict=True)
+            }
+
+        fetched = dict(zip(key_pairs, costs.tolist(), strict=True))
+        await self.cache.set_many(
+            prefix='dist',
+            keys=list(fetched),
+            values=[str(cost) for cost in fetched.values()],
+            ttl=self.cache_ttl,
+        )
+        return {key: (cost, False) for key, cost in fetched.items()}
+
+    async def _get_routed(
+        self,
+        coords: Sequence[CoordinatesBase],
+        pairs: Sequence[tuple[int, int]],
+    ) -> np.ndarray | None:
+        if not self.breaker.allow():
+            return None
+        started_at = time.perf_counter()
+        try:
+            async with asyncio.timeout(settings.OSRM_CALL_TIMEOUT_SECONDS):
+                costs = await self.provider.get_pairs_cost(coords, pairs)
+        except (httpx.HTTPError, TimeoutError) as e:
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+            is_outage = self._is_outage(e)
+            self.breaker.record(elapsed_ms, failed=is_outage)
+            if not is_outage:
+                raise
+            logger.warning(
+                'osrm unavailable, estimating distances',
+                error=type(e).__name__,
+                pairs=len(pairs),
+            )
+            return None
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        self.breaker.record(elapsed_ms, failed=False)
+        return costs
+
+    @classmethod
+    def _is_outage(cls, error: Exception) -> bool:
+        if isinstance(error, httpx.HTTPStatusError):
+            return (
+                error.response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+            )
+        return isinstance(error, (httpx.TransportError, TimeoutError))
+
+    async def _get_precomputed(
+        self, coords: Sequence[CoordinatesBase], key_pairs: KeyPairs
+    ) -> KeyCosts:
+        if self.matrix is None:
+            return {}
+        costs = await self.matrix.get_pairs_cost(
+            coords, list(key_pairs.values())
+        )
+        return {
+            key: (cost, False)
+            for key, cost in zip(key_pairs, costs.tolist(), strict=True)
+            if not math.isnan(cost)
+        }
+
+    async def _get_cached(self, keys: list[str]) -> KeyCosts:
+        if not keys:
+            return {}
+        cached_values = await self.cache.get_many('dist', keys)
+        return {
+            key: (float(cost), False)
+            for key, cost in (cached_values or {}).items()
+        }
+
+    def _make_pair_key(self, cell1: str, cell2: str) -> str:
+        first_cell, second_cell = sorted((cell1, cell2))
+        return f'dist:{first_cell}:{second_cell}'
@@ -0,0 +1,174 @@
+import asyncio
+import json
+from collections.abc import AsyncGenerator
+from datetime import UTC, datetime
+from http import HTTPStatus
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from uuid6 import uuid7
+
+from app.core.database import get_session_maker
+from app.core.job_manager import JobManager
+from app.core.logger import get_logger
+from app.core.settings import settings
+from app.core.solver_manager import get_solver_executor
+from app.exceptions.erros import BaseError, ForbiddenError, NotFoundError
+from app.models.user_model import UserModel
+from app.repositories.path_repository import PathRepository
+from app.schemas.job_schema import JobResponse, JobStatusEnum
+from app.schemas.path_schema import PathCreate
+from app.services.cache_service import CacheService
+from app.services.distance_service import DistanceService
+from app.services.path_service import PathService
+from app.services.route_cache_service import RouteCacheService
+from app.services.solver_stats_service import SolverStatsService
+from app.solvers.solver_executor import SolverExecutor
+
+logger = get_logger(__name__)
+
+FINISHED_STATUSES = {JobStatusEnum.SUCCEEDED, JobStatusEnum.FAILED}
+
+
+class JobService:
+    def __init__(
+        self,
+        cache: Annotated[CacheService, Depends()],
+        solver: Annotated[SolverExecutor, Depends(get_solver_executor)],
+        session_maker: Annotated[
+            async_sessionmaker[AsyncSession], Depends(get_session_maker)
+        ],
+        distances: Annotated[DistanceService, Depends()],
+    ) -> None:
+        self.cache = cache
+        self.solver = solver
+        self.session_maker = session_maker
+        self.distances = distances
+
+    async def create_job(
+        self, user: UserModel, path: PathCreate
+    ) -> JobResponse:
+        now = datetime.now(UTC)
+        job = JobResponse(
+            id=uuid7(),
+            user_id=user.id,
+            status=JobStatusEnum.QUEUED,
+            created_at=now,
+            updated_at=now,
+        )
+        await self._save_job(job)
+        JobManager.submit(self._run_job(job, user, path))
+        return job
+
+    async def get_job(self, job_id: UUID, user: UserModel) -> JobResponse:
+        job = await self._search_job(job_id)
+        if job is None:
+            raise NotFoundError
+        if job.user_id != user.id:
+            raise ForbiddenError
+        return job
+
+    async def _search_job(self, job_id: UUID) -> JobResponse | None:
+        cached_job = await self.cache.get_value('job', str(job_id))
+        if cached_job is None:
+            return None
+        return JobResponse.model_validate(cached_job)
+
+    async def stream_job_events(
+        self, job_id: UUID, user: UserModel
+    ) -> AsyncGenerator[str]:
+        async with self.cache.subscribe(
+            'job', str(job_id), settings.JOB_EVENTS_HEARTBEAT_SECONDS
+        ) as messages:
+            job = await self.get_job(job_id, user)
+            yield self._format_event(job)
+            if job.status in FINISHED_STATUSES:
+                return
+
+            async for message in messages:
+                if message is None:
+                    current_job = await self._search_job(job_id)
+                    if current_job is None:
+                        error = {
+                            'error': 'NotFoundError',
+                            'detail': 'job lost',
+                        }
+                        yield f'event: error\ndata: {json.dumps(error)}\n\n'
+                        return
+                    if current_job.status not in FINISHED_STATUSES:
+                        yield ': keep-alive\n\n'
+                        continue
+                    job = current_job
+                else:
+                    job = JobResponse.model_validate_json(message)
+                yield self._format_event(job)
+                if job.status in FINISHED_STATUSES:
+                    return
+
+    async def _run_job(
+        self, job: JobResponse, user: UserModel, path: PathCreate
+    ) -> None:
+        try:
+            await self._update_job(job, status=JobStatusEnum.RUNNING)
+            async with self.session_maker() as session:
+                result = await self._create_path_service(session).create_path(
+                    user, path
+                )
+        except asyncio.CancelledError:
+            logger.warning('route job interrupted', job_id=str(job.id))
+            await self._update_job(
+                job,
+                status=JobStatusEnum.FAILED,
+                error={
+                    'error': 'CancelledError',
+                    'detail': 'job interrupted, submit it again',
+                },
+            )
+            raise
+        except BaseError as e:
+            await self._update_job(
+                job,
+                status=JobStatusEnum.FAILED,
+                error={'error': type(e).__name__, 'detail': e.message},
+            )
+        except Exception as e:
+            logger.exception('route job failed', job_id=str(job.id))
+            await self._update_job(
+                job,
+                status=JobStatusEnum.FAILED,
+                error={
+                    'error': type(e).__name__,
+                    'detail': HTTPStatus.INTERNAL_SERVER_ERROR.description,
+                },
+            )
+        else:
+            await self._update_job(
+                job, status=JobStatusEnum.SUCCEEDED, result=result
+            )
+
+    def _create_path_service(self, session: AsyncSession) -> PathService:
+        return PathService(
+            PathRepository(session),
+            self.cache,
+            self.solver,
+            RouteCacheService(self.cache),
+            SolverStatsService(self.cache),
+            self.distances,
+        )
+
+    async def _update_job(self, job: JobResponse, **changes: object) -> None:
+        changes['updated_at'] = datetime.now(UTC)
+        job = job.model_copy(update=changes)
+        await self._save_job(job)
+
+    async def _save_job(self, job: JobResponse) -> None:
+        job_data = job.model_dump_json()
+        await self.cache.set_value(
+            'job', str(job.id), job_data, settings.JOB_TTL_SECONDS
+        )
+        await self.cache.publish('job', str(job.id), job_data)
+
+    def _format_event(self, job: JobResponse) -> str:
+        return f'event: {job.status.value}\ndata: {job.model_dump_json()}\n\n'
@@ -1,29 +1,76 @@
-from typing import Annotated
+import asyncio
+import json
+from collections.abc import AsyncGenerator, Sequence
+from datetime import UTC, datetime
+from itertools import combinations, pairwise
+from typing import Annotated, Any
 from uuid import UUID
 
-import httpx
+import numpy as np
 from fastapi import Depends
 from h3 import latlng_to_cell
 
+from app.core.logger import get_logger
 from app.core.settings import settings
-from app.exceptions.erros import ForbiddenError, NotFoundError
+from app.core.solver_manager import get_solver_executor
+from app.exceptions.erros import (
+    BaseError,
+    ContentError,
+    ForbiddenError,
+    NotFoundError,
+)
+from app.models.coordinates_model import CoordinatesModel
 from app.models.user_model import UserModel
 from app.repositories.path_repository import PathRepository
-from app.schemas.coordinates_schema import CoordinatesCreate
+from app.schemas.coordinates_schema import CoordinatesBase, CoordinatesCreate
 from app.schemas.filters_params_schema import SortEnum
-from app.schemas.path_schema import PathCreate, PathResponse, PathResponseList
+from app.schemas.path_schema import (
+    FleetPathCreate,
+    PathCreate,
+    PathPreview,
+    PathResponse,
+    PathResponseList,
+    PathUpdate,
+)
+from app.schemas.solver_schema import (
+    SolveOptions,
+    SolverEnum,
+    SolverResult,
+    StopConstraints,
+    TimeWindow,
+)
 from app.services.cache_service import CacheService
-from app.solvers.ortools_solver import ORToolsSolver
+from app.services.distance_service import DistanceService
+from app.services.route_cache_service import RouteCacheService
+from app.services.solver_stats_service import SolverStatsService
+from app.solvers.cluster_decomposer import ClusterDecomposer
+from app.solvers.local_search_solver import LocalSearchSolver
+from app.solvers.route_schedule import RouteSchedule
+from app.solvers.solve_budget import SolveBudget
+from app.solvers.solver_executor import SolverExecutor
+from app.solvers.solver_portfolio import SolverPortfolio
+from app.solvers.stop_reducer import StopReducer, StopReduction
+
+logger = get_logger(__name__)
 
 
 class PathService:
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         repository: Annotated[PathRepository, Depends()],
         cache: Annotated[CacheService, Depends()],
+        solver: Annotated[SolverExecutor, Depends(get_solver_executor)],
+        route_cache: Annotated[RouteCacheService, Depends()],
+        solver_stats: Annotated[SolverStatsService, Depends()],
+        distances: Annotated[DistanceService, Depends()],
     ) -> None:
         self.repository = repository
         self.cache = cache
+        self.solver = solver
+        self.route_cache = route_cache
+        self.solver_stats = solver_stats
+        self.distances = distances
+        self.estimated = False
 
     async def get_all_paths_by_user(
         self,
@@ -54,118 +101,628 @@ class PathService:
         self, user: UserModel, path: PathCreate
     ) -> PathResponse:
         coords = [path.pickup, *path.dropoff]
-        all_pairs = []
-        all_cache_keys = []
-
-        for i, coord1 in enumerate(coords):
-            for j in range(i + 1, len(coords)):
-                coord2 = coords[j]
-                pair = (i, j)
-                all_pairs.append(pair)
-                all_cache_keys.append(
-                    self._make_pair_cache_key(coord1, coord2)
+        stops = self._get_stops(coords)
+        arrivals = None
+        if RouteSchedule.has_time_windows(stops):
+            matrix = await self._get_cost_matrix(coords)
+            result = await self.solver.solve(
+                matrix,
+                self._get_solve_options(len(coords), path),
+                stops,
+                user_id=user.id,
+            )
+            if result.route:
+                arrivals = RouteSchedule.arrival_seconds(
+                    matrix, result.route, stops
+                )
+        else:
+            result, legs = await self._solve_with_route_cache(
+                user, coords, path
+            )
+            if legs is not None:
+                arrivals = RouteSchedule.arrival_seconds_from_legs(
+                    legs, result.route, stops
+                )
+        return await self._save_path(user, path, coords, result, arrivals)
+
+    async def stream_path(
+        self, user: UserModel, path: PathCreate
+    ) -> AsyncGenerator[str]:
+        coords = [path.pickup, *path.dropoff]
+        stops = self._get_stops(coords)
+        cells = [self._convert_coord_to_h3_index(coord) for coord in coords]
+        has_time_windows = RouteSchedule.has_time_windows(stops)
+        try:
+            cached = None
+            if not has_time_windows:
+                cached = await self._get_cached_route(cells, path)
+            if cached is not None:
+                result, legs = cached
+                arrivals = None
+                if legs is not None:
+                    arrivals = RouteSchedule.arrival_seconds_from_legs(
+                        legs, result.route, stops
+                    )
+                db_path = await self._save_path(
+                    user, path, coords, result, arrivals
+                )
+            elif (
+                len(path.dropoff) >= settings.SOLVER_DECOMPOSITION_MIN_STOPS
+                and not has_time_windows
+            ):
+                db_path = await self.create_path(user, path)
+            else:
+                reduction = self._reduce_stops(
+                    cells, merge=not has_time_windows
+                )
+                matrix = await self._get_cost_matrix(
+                    [
+                        coords[node]
+                        for node in StopReducer.representatives(reduction)
+                    ]
                 )
+                result = SolverResult(route=[])
+                async for reduced_result in self.solver.solve_streaming(
+                    matrix,
+                    self._get_solve_options(len(matrix), path),
+                    stops if has_time_windows else None,
+                    user_id=user.id,
+                ):
+                    result = StopReducer.expand(reduction, reduced_result)
+                    if result.route:
+                        yield self._format_event(
+                            'solution',
+                            self._get_path_preview(
+                                coords, result
+                            ).model_dump_json(),
+                        )
+                db_path = await self._save_streamed_path(
+                    user,
+                    path,
+                    coords,
+                    StopReducer.expand_matrix(reduction, matrix),
+                    result,
+                )
+        except BaseError as e:
+            error = {'error': type(e).__name__, 'detail': e.message}
+            yield self._format_event('error', json.dumps(error))
+            return
+        yield self._format_event('path', db_path.model_dump_json())
+
+    async def _save_streamed_path(
+        self,
+        user: UserModel,
+        path: PathCreate,
+        coords: list[CoordinatesCreate],
+        matrix: list[list[float]],
+        result: SolverResult,
+    ) -> PathResponse:
+        stops = self._get_stops(coords)
+        arrivals = None
+        if result.route:
+            arrivals = RouteSchedule.arrival_seconds(
+                matrix, result.route, stops
+            )
+        if (
+            result.route
+            and not self.estimated
+            and not RouteSchedule.has_time_windows(stops)
+        ):
+            await self.route_cache.save(
+                [self._convert_coord_to_h3_index(coord) for coord in coords],
+                result,
+                [matrix[i][j] for i, j in pairwise(result.route)],
+                path.quality,
+            )
+        return await self._save_path(user, path, coords, result, arrivals)
+
+    async def _save_path(
+        self,
+        user: UserModel,
+        path: PathCreate,
+        coords: list[CoordinatesCreate],
+        result: SolverResult,
+        arrivals: list[float] | None,
+    ) -> PathResponse:
+        if not result.route:
+            raise ContentError(message='no route found within the solve time')
+        if result.dropped and not path.drop_infeasible:
+            raise ContentError(message=self._dropped_message(result.dropped))
+        logger.info(
+            'route solved',
+            nodes=len(coords),
+            quality=path.quality.value,
+            solver=result.solver,
+            search_ms=result.search_ms,
+            objective=result.objective,
+            dropped=len(result.dropped),
+        )
+
+        path_data = self._get_path_data(coords, result.route, arrivals)
+        path_data['user_id'] = user.id
+
+        db_path = await self.repository.create(path_data)
+        return PathResponse.model_validate(db_path).model_copy(
+            update={'dropped': [coords[i] for i in result.dropped]}
+        )
 
-        cached_values = await self.cache.get_many('dist', all_cache_keys)
+    async def create_fleet_paths(
+        self, user: UserModel, fleet: FleetPathCreate
+    ) -> PathResponseList:
+        capacities = [vehicle.capacity or 0 for vehicle in fleet.vehicles]
+        if all(capacities) and sum(capacities) < len(fleet.dropoff):
+            raise ContentError(
+                message='vehicles capacity is lower than the dropoffs number'
+            )
+
+        coords = [fleet.pickup, *fleet.dropoff]
+        stops = self._get_stops(coords)
+        matrix = await self._get_cost_matrix(coords)
+        result = await self.solver.solve_fleet(
+            matrix,
+            fleet.vehicles,
+            SolveBudget.for_instance(
+                len(coords),
+                fleet.quality,
+                fleet.max_solve_ms,
+                SolverEnum.ORTOOLS,
+            ),
+            stops,
+            user_id=user.id,
+        )
+        if not result.routes:
+            raise ContentError(
+                message='no route satisfies the vehicles constraints'
+            )
+        if result.dropped:
+            raise ContentError(message=self._dropped_message(result.dropped))
+        logger.info(
+            'fleet routes solved',
+            nodes=len(coords),
+            vehicles=len(fleet.vehicles),
+            quality=fleet.quality.value,
+            search_ms=result.search_ms,
+            objective=result.objective,
+        )
+
+        paths_data = []
+        for route in result.routes:
+            arrivals = RouteSchedule.arrival_seconds(matrix, route, stops)
+            path_data = self._get_path_data(coords, route, arrivals)
+            path_data['user_id'] = user.id
+            paths_data.append(path_data)
+
+        db_paths = await self.repository.create_many(paths_data)
+        return PathResponseList(
+            data=[PathResponse.model_validate(path) for path in db_paths]
+        )
+
+    async def update_path(
+        self, path_id: UUID, user: UserModel, update: PathUpdate
+    ) -> PathResponse:
+        db_path = await self.repository.search(path_id)
+        if db_path is None:
+            raise NotFoundError
+        if db_path.user_id != user.id:
+            raise ForbiddenError
 
-        pairs_cost = {}
-        missing_pairs = []
-        missing_pair_indices = []
+        dropoff_ids = {dropoff.id for dropoff in db_path.dropoff}
+        removed_ids = set(update.remove)
+        completed_ids = set(update.complete) | {
+            dropoff.id for dropoff in db_path.dropoff if dropoff.completed_at
+        }
+        if not (removed_ids | completed_ids) <= dropoff_ids:
+            raise ContentError(message='dropoffs do not belong to the path')
+        if removed_ids & completed_ids:
+            raise ContentError(message='completed dropoffs cannot be removed')
+
+        now = datetime.now(UTC)
+        completed = sorted(
+            (
+                dropoff
+                for dropoff in db_path.dropoff
+                if dropoff.id in completed_ids
+            ),
+            key=lambda dropoff: (
+                dropoff.completed_at or now,
+                dropoff.position,
+            ),
+        )
+        pending = [
+            dropoff
+            for dropoff in db_path.dropoff
+            if dropoff.id not in completed_ids | removed_ids
+        ]
+        if any(
+            dropoff.time_window_start_seconds is not None
+            for dropoff in pending
+        ):
+            raise ContentError(
+                message='dropoffs with time windows cannot be rescheduled'
+            )
+        origin = completed[-1] if completed else None
 
-        for pair, cache_key in zip(all_pairs, all_cache_keys, strict=False):
-            cached_cost = (
-                cached_values.get(cache_key) if cached_values else None
+        dropoff_data: list[dict[str, Any]] = [
+            {
+                'id': dropoff.id,
+                'position': position,
+                'completed_at': dropoff.completed_at or now,
+            }
+            for position, dropoff in enumerate(completed)
+        ]
+        if pending or update.add:
+            dropoff_data.extend(
+                await self._reoptimize_pending(
+                    user,
+                    db_path.pickup,
+                    origin,
+                    pending,
+                    update,
+                    len(completed),
+                )
             )
-            if cached_cost is not None:
-                pairs_cost[pair] = float(cached_cost)
+            db_path.estimated = self.estimated
+
+        db_path = await self.repository.update_dropoff(db_path, dropoff_data)
+        return PathResponse.model_validate(db_path)
+
+    async def _reoptimize_pending(  # noqa: PLR0913
+        self,
+        user: UserModel,
+        pickup: CoordinatesModel,
+        origin: CoordinatesModel | None,
+        pending: list[CoordinatesModel],
+        update: PathUpdate,
+        first_position: int,
+    ) -> list[dict[str, Any]]:
+        route_start = [pickup] if origin is None else [pickup, origin]
+        coords = [
+            *(
+                CoordinatesBase(lat=coord.lat, lng=coord.lng)
+                for coord in [*route_start, *pending]
+            ),
+            *update.add,
+        ]
+        start = len(route_start) - 1
+        first_added = len(route_start) + len(pending)
+        matrix = await self._get_cost_matrix(coords)
+
+        costs = np.asarray(matrix)
+        pending_nodes = list(range(start + 1, first_added))
+        added_nodes = range(first_added, len(coords))
+        if origin is None:
+            initial_route = LocalSearchSolver.cheapest_insertion(
+                costs, [start, *pending_nodes], added_nodes
+            )
+        else:
+            initial_route = LocalSearchSolver.cheapest_insertion(
+                costs, [start, *pending_nodes, 0], added_nodes, closed=False
+            )[:-1]
+
+        result = await self.solver.reoptimize(
+            matrix,
+            initial_route,
+            SolveBudget.for_instance(
+                len(coords),
+                update.quality,
+                update.max_solve_ms,
+                SolverEnum.ORTOOLS,
+            ),
+            user_id=user.id,
+        )
+        if not result.route:
+            raise ContentError(message='no route found within the solve time')
+        logger.info(
+            'route reoptimized',
+            nodes=len(coords),
+            added=len(update.add),
+            solver=result.solver,
+            search_ms=result.search_ms,
+            objective=result.objective,
+        )
+
+        departure = (origin.arrival_seconds or 0.0) if origin else 0.0
+        stops = [
+            *(
+                self._get_stored_stop(coord)
+                for coord in [*route_start, *pending]
+            ),
+            *(StopConstraints() for _ in update.add),
+        ]
+        if origin is not None:
+            # the shift start is already part of the origin arrival
+            stops[0] = StopConstraints()
+        arrivals = RouteSchedule.arrival_seconds(matrix, result.route, stops)
+        dropoff_data = []
+        for position, (node, arrival) in enumerate(
+            zip(result.route[1:], arrivals[1:], strict=True),
+            start=first_position,
+        ):
+            if node < first_added:
+                data = {'id': pending[node - start - 1].id}
             else:
-                i, j = pair
-                missing_pairs.append((coords[i], coords[j]))
-                missing_pair_indices.append(pair)
-
-        if missing_pairs:
-            unique_coords_map = {}
-            for coord1, coord2 in missing_pairs:
-                h3_1 = self._convert_coord_to_h3_index(coord1)
-                h3_2 = self._convert_coord_to_h3_index(coord2)
-                unique_coords_map[h3_1] = coord1
-                unique_coords_map[h3_2] = coord2
-
-            unique_coords = list(unique_coords_map.values())
-            coord_to_index = {
-                self._convert_coord_to_h3_index(c): i
-                for i, c in enumerate(unique_coords)
+                data = update.add[node - first_added].model_dump()
+            data |= {
+                'position': position,
+                'arrival_seconds': departure + arrival,
             }
+            dropoff_data.append(data)
+        return dropoff_data
 
-            formatted_coords = [
-                f'{coord.lng},{coord.lat}' for coord in unique_coords
+    async def _solve_with_route_cache(
+        self,
+        user: UserModel,
+        coords: list[CoordinatesCreate],
+        path: PathCreate,
+    ) -> tuple[SolverResult, list[float] | None]:
+        cells = [self._convert_coord_to_h3_index(coord) for coord in coords]
+        cached = await self._get_cached_route(cells, path)
+        if cached is not None:
+            return cached
+
+        reduction = self._reduce_stops(cells)
+        representatives = StopReducer.representatives(reduction)
+        reduced_coords = [coords[node] for node in representatives]
+        legs = None
+        if len(representatives) > settings.SOLVER_DECOMPOSITION_MIN_STOPS:
+            result = StopReducer.expand(
+                reduction,
+                await self._solve_by_clusters(user, reduced_coords, path),
+            )
+        else:
+            matrix = await self._get_cost_matrix(reduced_coords)
+            result = StopReducer.expand(
+                reduction,
+                await self._solve_with_seed(
+                    user,
+                    matrix,
+                    [cells[node] for node in representatives],
+                    path,
+                ),
+            )
+            legs = [
+                matrix[reduction.nodes[i]][reduction.nodes[j]]
+                for i, j in pairwise(result.route)
             ]
-            coords_url = ';'.join(formatted_coords)
-            base_url = settings.OSRM_URL + 'table/v1/driving/'
+        if result.route and not self.estimated:
+            await self.route_cache.save(cells, result, legs, path.quality)
+        return result, legs
+
+    async def _get_cached_route(
+        self, cells: list[str], path: PathCreate
+    ) -> tuple[SolverResult, list[float] | None] | None:
+        cached_route = await self.route_cache.get_route(cells, path.quality)
+        if cached_route is None:
+            return None
+        result = SolverResult(
+            route=self.route_cache.to_route(cached_route, cells),
+            objective=cached_route.objective,
+            solver='route_cache',
+        )
+        return result, cached_route.legs
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    url=f'{base_url}{coords_url}',
-                    params={'annotations': 'duration,distance'},
+    async def _solve_with_seed(
+        self,
+        user: UserModel,
+        matrix: list[list[float]],
+        cells: list[str],
+        path: PathCreate,
+    ) -> SolverResult:
+        options = self._get_solve_options(len(matrix), path)
+        if (
+            options.solver == SolverEnum.LOCAL_SEARCH
+            or len(matrix) - 1 <= settings.SOLVER_EXACT_MAX_STOPS
+        ):
+            return await self.solver.solve(matrix, options, user_id=user.id)
+        if options.solver == SolverEnum.PORTFOLIO:
+            result = await self.solver.solve_portfolio(
+                matrix, options, SolverPortfolio.strategies(), user_id=user.id
+            )
+            if result.strategy:
+                await self.solver_stats.record_win(
+                    len(matrix), result.strategy
                 )
-                response.raise_for_status()
+            return result
 
-            full_matrix = response.json()['durations']
+        options.strategy = await self.solver_stats.best_strategy(len(matrix))
+        seed = await self.route_cache.find_seed(cells)
+        if not seed:
+            return await self.solver.solve(matrix, options, user_id=user.id)
+        initial_route = LocalSearchSolver.cheapest_insertion(
+            np.asarray(matrix),
+            seed,
+            sorted(set(range(len(matrix))) - set(seed)),
+        )
+        logger.info(
+            'route seeded from cache',
+            nodes=len(matrix),
+            seeded=len(seed),
+        )
+        return await self.solver.reoptimize(
+            matrix, initial_route, options, user_id=user.id
+        )
 
-            cache_entries = {}
-            for i, (coord1, coord2) in enumerate(missing_pairs):
-                idx1 = coord_to_index[self._convert_coord_to_h3_index(coord1)]
-                idx2 = coord_to_index[self._convert_coord_to_h3_index(coord2)]
-                cost = full_matrix[idx1][idx2]
+    def _reduce_stops(
+        self, cells: list[str], *, merge: bool = True
+    ) -> StopReduction:
+        reduction = StopReducer.reduce(cells, merge=merge)
+        if StopReducer.is_reduced(reduction):
+            logger.info(
+                'coincident stops merged',
+                nodes=len(reduction.nodes),
+                reduced=len(reduction.groups),
+            )
+        return reduction
 
-                cache_key = self._make_pair_cache_key(coord1, coord2)
-                cache_entries[cache_key] = str(cost)
-                pairs_cost[missing_pair_indices[i]] = cost
+    def _get_stops(
+        self, coords: list[CoordinatesCreate]
+    ) -> list[StopConstraints]:
+        return [
+            StopConstraints(
+                time_window=coord.time_window,
+                service_seconds=coord.service_seconds,
+            )
+            for coord in coords
+        ]
 
-            await self.cache.set_many(
-                prefix='dist',
-                keys=list(cache_entries.keys()),
-                values=list(cache_entries.values()),
+    def _get_stored_stop(self, coord: CoordinatesModel) -> StopConstraints:
+        time_window = None
+        if (
+            coord.time_window_start_seconds is not None
+            and coord.time_window_end_seconds is not None
+        ):
+            time_window = TimeWindow(
+                start_seconds=coord.time_window_start_seconds,
+                end_seconds=coord.time_window_end_seconds,
             )
+        return StopConstraints(
+            time_window=time_window, service_seconds=coord.service_seconds
+        )
+
+    def _get_coordinates_data(
+        self, coord: CoordinatesCreate
+    ) -> dict[str, Any]:
+        time_window = coord.time_window
+        return {
+            **coord.model_dump(include={'lat', 'lng', 'service_seconds'}),
+            'time_window_start_seconds': time_window.start_seconds
+            if time_window
+            else None,
+            'time_window_end_seconds': time_window.end_seconds
+            if time_window
+            else None,
+        }
 
-        matrix = self._build_cost_matrix(pairs_cost, len(coords))
-        optimal_route = ORToolsSolver.solve(matrix)
-        reordered_dropoffs = [
-            path.dropoff[i - 1] for i in optimal_route if i > 0
+    def _get_path_data(
+        self,
+        coords: list[CoordinatesCreate],
+        route: list[int],
+        arrivals: list[float] | None,
+    ) -> dict[str, Any]:
+        dropoff_positions = [
+            (route_position, node)
+            for route_position, node in enumerate(route)
+            if node > 0
         ]
+        return {
+            'pickup': self._get_coordinates_data(coords[0]),
+            'dropoff': [
+                {
+                    **self._get_coordinates_data(coords[node]),
+                    'arrival_seconds': arrivals[route_position]
+                    if arrivals
+                    else None,
+                    'position': position,
+                }
+                for position, (route_position, node) in enumerate(
+                    dropoff_positions
+                )
+            ],
+            'estimated': self.estimated,
+        }
+
+    def _get_path_preview(
+        self, coords: list[CoordinatesCreate], result: SolverResult
+    ) -> PathPreview:
+        return PathPreview(
+            pickup=coords[0],
+            dropoff=[coords[node] for node in result.route if node > 0],
+            objective=result.objective,
+            search_ms=result.search_ms,
+            estimated=self.estimated,
+        )
+
+    def _format_event(self, event: str, data: str) -> str:
+        return f'event: {event}\ndata: {data}\n\n'
+
+    def _dropped_message(self, dropped: list[int]) -> str:
+        positions = ', '.join(str(node - 1) for node in sorted(dropped))
+        return (
+            f'dropoffs {positions} cannot be served within their time window'
+        )
 
-        path_data = path.model_dump()
-        path_data['dropoff'] = [
-            dropoff.model_dump() if hasattr(dropoff, 'model_dump') else dropoff
-            for dropoff in reordered_dropoffs
+    def _get_solve_options(self, nodes: int, path: PathCreate) -> SolveOptions:
+        return SolveBudget.for_instance(
+            nodes, path.quality, path.max_solve_ms, path.solver
+        )
+
+    async def _solve_by_clusters(
+        self,
+        user: UserModel,
+        coords: list[CoordinatesCreate],
+        path: PathCreate,
+    ) -> SolverResult:
+        cells = [self._convert_coord_to_h3_index(coord) for coord in coords]
+        clusters = [
+            ClusterDecomposer.entry_first(coords, cluster)
+            for cluster in ClusterDecomposer.partition(
+                cells,
+                range(1, len(coords)),
+                settings.SOLVER_CLUSTER_MAX_STOPS,
+            )
         ]
-        path_data['user_id'] = user.id
+        node_groups = [[0, *(cluster[0] for cluster in clusters)], *clusters]
 
-        db_path = await self.repository.create(path_data)
-        return PathResponse.model_validate(db_path)
+        semaphore = asyncio.Semaphore(settings.OSRM_MAX_CONCURRENT_REQUESTS)
 
-    def _convert_coord_to_h3_index(self, coord: CoordinatesCreate) -> str:
-        return latlng_to_cell(coord.lat, coord.lng, settings.H3_RESOLUTION)
+        async def __get_group_matrix(nodes: list[int]) -> list[list[float]]:
+            async with semaphore:
+                return await self._get_cost_matrix([coords[n] for n in nodes])
 
-    def _make_pair_cache_key(
-        self, coord1: CoordinatesCreate, coord2: CoordinatesCreate
-    ) -> str:
-        index1 = self._convert_coord_to_h3_index(coord1)
-        index2 = self._convert_coord_to_h3_index(coord2)
-        return f'dist:{index1}:{index2}'
+        matrices = await asyncio.gather(
+            *(__get_group_matrix(nodes) for nodes in node_groups)
+        )
+        results = await self.solver.solve_many(
+            matrices,
+            [
+                self._get_solve_options(len(nodes), path)
+                for nodes in node_groups
+            ],
+            user_id=user.id,
+        )
+        return SolverResult(
+            route=ClusterDecomposer.stitch(
+                node_groups, [result.route for result in results]
+            ),
+            objective=sum(result.objective or 0.0 for result in results),
+            search_ms=sum(result.search_ms for result in results),
+            solver='clusters',
+        )
+
+    async def _get_cost_matrix(
+        self, coords: Sequence[CoordinatesBase]
+    ) -> list[list[float]]:
+        pairs_cost = await self._get_pairs_cost(
+            coords, list(combinations(range(len(coords)), 2))
+        )
+        return self._build_cost_matrix(pairs_cost, len(coords))
+
+    async def _get_pairs_cost(
+        self,
+        coords: Sequence[CoordinatesBase],
+        pairs: list[tuple[int, int]],
+    ) -> dict[tuple[int, int], float]:
+        cells = [self._convert_coord_to_h3_index(coord) for coord in coords]
+        pairs_cost = await self.distances.get_pairs_cost(coords, cells, pairs)
+        self.estimated |= pairs_cost.estimated
+        return pairs_cost.costs
+
+    def _convert_coord_to_h3_index(self, coord: CoordinatesBase) -> str:
+        return latlng_to_cell(coord.lat, coord.lng, settings.H3_RESOLUTION)
 
     def _build_cost_matrix(
         self,
         pairs_cost: dict[tuple[int, int], float],
         n: int,
     ) -> list[list[float]]:
-        matrix = [[0.0] * n for _ in range(n)]
-
-        for (i, j), cost in pairs_cost.items():
-            matrix[i][j] = cost
-            matrix[j][i] = cost
+        matrix = np.zeros((n, n))
+        if pairs_cost:
+            rows, columns = np.asarray(list(pairs_cost)).T
+            costs = np.fromiter(pairs_cost.values(), dtype=np.float64)
+            matrix[rows, columns] = costs
+            matrix[columns, rows] = costs
 
-        return matrix
+        return matrix.tolist()
 
     async def delete_path(self, path_id: UUID, user: UserModel) -> None:
         path = await self.repository.search(path_id)
@@ -0,0 +1,105 @@
+import hashlib
+from collections import defaultdict, deque
+from collections.abc import Sequence
+from typing import Annotated
+
+from fastapi import Depends
+
+from app.core.settings import settings
+from app.schemas.solver_schema import CachedRoute, QualityEnum, SolverResult
+from app.services.cache_service import CacheService
+
+QUALITY_RANK = {quality: rank for rank, quality in enumerate(QualityEnum)}
+
+
+class RouteCacheService:
+    def __init__(self, cache: Annotated[CacheService, Depends()]) -> None:
+        self.cache = cache
+
+    async def get_route(
+        self, cells: Sequence[str], quality: QualityEnum
+    ) -> CachedRoute | None:
+        cached_value = await self.cache.get_value(
+            'route', self._make_fingerprint(cells)
+        )
+        if cached_value is None:
+            return None
+        cached_route = CachedRoute.model_validate(cached_value)
+        if QUALITY_RANK[cached_route.quality] < QUALITY_RANK[quality]:
+            return None
+        return cached_route
+
+    async def find_seed(self, cells: Sequence[str]) -> list[int] | None:
+        fingerprints = list(
+            await self.cache.get_set_members('route_index', cells[0])
+        )[: settings.ROUTE_CACHE_MAX_CANDIDATES]
+        if not fingerprints:
+            return None
+        cached_values = await self.cache.get_many('route', fingerprints)
+
+        dropoff_cells = set(cells[1:])
+        best_route = None
+        best_overlap = 0
+        for cached_value in (cached_values or {}).values():
+            cached_route = CachedRoute.model_validate(cached_value)
+            cached_cells = set(cached_route.cells[1:])
+            overlap = len(dropoff_cells & cached_cells)
+            if overlap > best_overlap and (
+                cached_cells <= dropoff_cells or dropoff_cells <= cached_cells
+            ):
+                best_route = cached_route
+                best_overlap = overlap
+
+        if best_route is None:
+            return None
+        cell_nodes = self._get_cell_nodes(cells)
+        return [
+            cell_nodes[cell].popleft()
+            for cell in best_route.cells
+            if cell_nodes[cell]
+        ]
+
+    def to_route(
+        self, cached_route: CachedRoute, cells: Sequence[str]
+    ) -> list[int]:
+        cell_nodes = self._get_cell_nodes(cells)
+        return [cell_nodes[cell].popleft() for cell in cached_route.cells]
+
+    async def save(
+        self,
+        cells: Sequence[str],
+        result: SolverResult,
+        legs: list[float] | None,
+        quality: QualityEnum,
+    ) -> None:
+        fingerprint = self._make_fingerprint(cells)
+        cached_route = CachedRoute(
+            cells=[cells[node] for node in result.route],
+            legs=legs,
+            objective=result.objective,
+            quality=quality,
+            solver=result.solver,
+        )
+        await self.cache.set_value(
+            'route',
+            fingerprint,
+            cached_route.model_dump_json(),
+            settings.ROUTE_CACHE_TTL_SECONDS,
+        )
+        await self.cache.add_to_set(
+            'route_index',
+            cells[0],
+            fingerprint,
+            settings.ROUTE_CACHE_TTL_SECONDS,
+        )
+
+    def _get_cell_nodes(self, cells: Sequence[str]) -> dict[str, deque[int]]:
+        cell_nodes: dict[str, deque[int]] = defaultdict(deque)
+        for node, cell in enumerate(cells):
+            cell_nodes[cell].append(node)
+        return cell_nodes
+
+    def _make_fingerprint(self, cells: Sequence[str]) -> str:
+        pickup_cell, *dropoff_cells = cells
+        stops = '|'.join([pickup_cell, *sorted(dropoff_cells)])
+        return hashlib.sha256(stops.encode()).hexdigest()
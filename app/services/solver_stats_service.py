@@ -0,0 +1,35 @@
+from typing import Annotated
+
+from fastapi import Depends
+
+from app.schemas.solver_schema import SolverStrategy
+from app.services.cache_service import CacheService
+from app.solvers.solver_portfolio import SolverPortfolio
+
+
+class SolverStatsService:
+    def __init__(self, cache: Annotated[CacheService, Depends()]) -> None:
+        self.cache = cache
+
+    async def record_win(self, nodes: int, strategy: str) -> None:
+        await self.cache.increment_field(
+            'solver_wins', SolverPortfolio.size_bucket(nodes), strategy
+        )
+
+    async def best_strategy(self, nodes: int) -> SolverStrategy | None:
+        wins = await self.cache.get_fields(
+            'solver_wins', SolverPortfolio.size_bucket(nodes)
+        )
+        known_strategies = {
+            strategy.key for strategy in SolverPortfolio.strategies()
+        }
+        candidates = {
+            strategy: int(count)
+            for strategy, count in wins.items()
+            if strategy in known_strategies
+        }
+        if not candidates:
+            return None
+        return SolverStrategy.from_key(
+            max(candidates, key=lambda strategy: candidates[strategy])
+        )
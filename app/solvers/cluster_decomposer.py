@@ -0,0 +1,67 @@
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from itertools import batched
+
+from h3 import cell_to_parent, get_resolution
+
+from app.schemas.coordinates_schema import CoordinatesBase
+
+
+class ClusterDecomposer:
+    @classmethod
+    def partition(
+        cls,
+        cells: Sequence[str],
+        nodes: Iterable[int],
+        max_cluster_size: int,
+        resolution: int = 0,
+    ) -> list[list[int]]:
+        nodes = list(nodes)
+        if len(nodes) <= max_cluster_size:
+            return [nodes]
+        if resolution > get_resolution(cells[nodes[0]]):
+            return [
+                list(chunk)
+                for chunk in batched(nodes, max_cluster_size, strict=False)
+            ]
+
+        groups: dict[str, list[int]] = defaultdict(list)
+        for node in nodes:
+            groups[cell_to_parent(cells[node], resolution)].append(node)
+
+        clusters = []
+        for group in groups.values():
+            clusters.extend(
+                cls.partition(cells, group, max_cluster_size, resolution + 1)
+            )
+        return clusters
+
+    @classmethod
+    def entry_first(
+        cls, coords: Sequence[CoordinatesBase], cluster: list[int]
+    ) -> list[int]:
+        center_lat = sum(coords[node].lat for node in cluster) / len(cluster)
+        center_lng = sum(coords[node].lng for node in cluster) / len(cluster)
+        entry = min(
+            cluster,
+            key=lambda node: (
+                (coords[node].lat - center_lat) ** 2
+                + (coords[node].lng - center_lng) ** 2
+            ),
+        )
+        return [entry, *(node for node in cluster if node != entry)]
+
+    @classmethod
+    def stitch(
+        cls,
+        node_groups: list[list[int]],
+        group_routes: list[list[int]],
+    ) -> list[int]:
+        entries_route, *clusters_routes = group_routes
+        route = [node_groups[0][0]]
+        for cluster_position in entries_route[1:]:
+            cluster_nodes = node_groups[cluster_position]
+            route.extend(
+                cluster_nodes[i] for i in clusters_routes[cluster_position - 1]
+            )
+        return route
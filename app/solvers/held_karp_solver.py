@@ -0,0 +1,54 @@
+import time
+
+import numpy as np
+
+from app.schemas.solver_schema import SolverResult
+
+
+class HeldKarpSolver:
+    @classmethod
+    def solve(cls, durantion_matrix: list[list[float]]) -> SolverResult:
+        started_at = time.perf_counter()
+        costs = np.asarray(durantion_matrix, dtype=np.float64)
+        stops = len(costs) - 1
+        full_mask = (1 << stops) - 1
+
+        stop_indices = np.arange(stops)
+        bits = 1 << stop_indices
+        masks = np.arange(full_mask + 1)
+        masks_size = np.bitwise_count(masks)
+        stop_costs = costs[1:, 1:].T
+
+        best_cost = np.full((full_mask + 1, stops), np.inf)
+        parent = np.full((full_mask + 1, stops), -1, dtype=np.int64)
+        best_cost[bits, stop_indices] = costs[0, 1:]
+
+        for size in range(2, stops + 1):
+            layer = masks[masks_size == size]
+            contains = (layer[:, None] & bits) != 0
+            candidates = best_cost[layer[:, None] ^ bits] + stop_costs
+            previous = candidates.argmin(axis=2)
+            layer_cost = np.take_along_axis(
+                candidates, previous[..., None], axis=2
+            )[..., 0]
+            layer_cost[~contains] = np.inf
+            best_cost[layer] = layer_cost
+            parent[layer] = previous
+
+        tour_costs = best_cost[full_mask] + costs[1:, 0]
+        node = int(tour_costs.argmin())
+
+        reversed_route = []
+        mask = full_mask
+        while mask:
+            reversed_route.append(node + 1)
+            previous_node = int(parent[mask, node])
+            mask ^= 1 << node
+            node = previous_node
+
+        return SolverResult(
+            route=[0, *reversed(reversed_route)],
+            objective=float(tour_costs.min()),
+            search_ms=(time.perf_counter() - started_at) * 1000,
+            solver='held_karp',
+        )
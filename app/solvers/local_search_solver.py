@@ -0,0 +1,180 @@
+import time
+from collections.abc import Iterable
+
+import numpy as np
+
+from app.core.settings import settings
+from app.schemas.solver_schema import SolveOptions, SolverResult
+
+IMPROVEMENT_EPSILON = 1e-9
+OR_OPT_SEGMENT_SIZES = (1, 2, 3)
+
+
+class LocalSearchSolver:
+    @classmethod
+    def tour_cost(cls, costs: np.ndarray, route: np.ndarray) -> float:
+        return float(costs[route, np.roll(route, -1)].sum())
+
+    @classmethod
+    def nearest_neighbour(cls, costs: np.ndarray) -> list[int]:
+        visited = np.zeros(len(costs), dtype=bool)
+        visited[0] = True
+        route = [0]
+        for _ in range(len(costs) - 1):
+            candidates = np.where(visited, np.inf, costs[route[-1]])
+            node = int(candidates.argmin())
+            visited[node] = True
+            route.append(node)
+        return route
+
+    @classmethod
+    def cheapest_insertion(
+        cls,
+        costs: np.ndarray,
+        route: Iterable[int],
+        nodes: Iterable[int],
+        *,
+        closed: bool = True,
+    ) -> list[int]:
+        route = list(route)
+        pending = list(nodes)
+        while pending:
+            tour = np.asarray(route)
+            following = np.roll(tour, -1)
+            candidates = np.asarray(pending)
+            insertion_costs = (
+                costs[np.ix_(tour, candidates)].T
+                + costs[np.ix_(candidates, following)]
+                - costs[tour, following]
+            )
+            if not closed:
+                insertion_costs[:, -1] = np.inf
+            node_position, edge = np.unravel_index(
+                insertion_costs.argmin(), insertion_costs.shape
+            )
+            route.insert(int(edge) + 1, pending.pop(int(node_position)))
+        return route
+
+    @classmethod
+    def _two_opt_pass(
+        cls, costs: np.ndarray, route: np.ndarray
+    ) -> tuple[np.ndarray, bool]:
+        nodes = len(route)
+        closed = np.append(route, route[0])
+        forward = costs[closed[:-1], closed[1:]]
+        backward = costs[closed[1:], closed[:-1]]
+        forward_prefix = np.concatenate(([0.0], np.cumsum(forward)))
+        backward_prefix = np.concatenate(([0.0], np.cumsum(backward)))
+
+        i = np.arange(nodes)[:, None]
+        j = np.arange(nodes)[None, :]
+        valid = j >= i + 2
+        j_safe = np.where(valid, j, i + 2) % nodes
+        delta = (
+            costs[closed[i], closed[j_safe]]
+            + costs[closed[i + 1], closed[j_safe + 1]]
+            - forward[i]
+            - forward[j_safe]
+            + backward_prefix[j_safe]
+            - backward_prefix[i + 1]
+            - forward_prefix[j_safe]
+            + forward_prefix[i + 1]
+        )
+        delta = np.where(valid, delta, np.inf)
+
+        best_j = delta.argmin(axis=1)
+        best_delta = delta[np.arange(nodes), best_j]
+        improving = np.flatnonzero(best_delta < -IMPROVEMENT_EPSILON)
+        if not len(improving):
+            return route, False
+
+        route = route.copy()
+        taken: list[tuple[int, int]] = []
+        for start in improving[np.argsort(best_delta[improving])]:
+            end = int(best_j[start])
+            if any(start <= e and s <= end for s, e in taken):
+                continue
+            route[start + 1 : end + 1] = route[start + 1 : end + 1][::-1]
+            taken.append((int(start), end))
+        return route, True
+
+    @classmethod
+    def _or_opt_pass(
+        cls, costs: np.ndarray, route: np.ndarray
+    ) -> tuple[np.ndarray, bool]:
+        nodes = len(route)
+        closed = np.append(route, route[0])
+        improved = False
+        for size in OR_OPT_SEGMENT_SIZES:
+            if nodes - 1 <= size:
+                break
+            starts = np.arange(1, nodes - size + 1)[:, None]
+            edges = np.arange(nodes)[None, :]
+            first = closed[starts]
+            last = closed[starts + size - 1]
+            removal_gain = (
+                costs[closed[starts - 1], first]
+                + costs[last, closed[starts + size]]
+                - costs[closed[starts - 1], closed[starts + size]]
+            )
+            insertion_cost = (
+                costs[closed[edges], first]
+                + costs[last, closed[edges + 1]]
+                - costs[closed[edges], closed[edges + 1]]
+            )
+            touches_segment = (edges >= starts - 1) & (
+                edges <= starts + size - 1
+            )
+            delta = np.where(
+                touches_segment, np.inf, insertion_cost - removal_gain
+            )
+            start_position, edge = np.unravel_index(
+                delta.argmin(), delta.shape
+            )
+            if delta[start_position, edge] >= -IMPROVEMENT_EPSILON:
+                continue
+
+            start = int(starts[start_position, 0])
+            segment = route[start : start + size]
+            remaining = np.delete(route, np.s_[start : start + size])
+            position = int(edge) + 1 if edge < start else int(edge) + 1 - size
+            route = np.insert(remaining, position, segment)
+            closed = np.append(route, route[0])
+            improved = True
+        return route, improved
+
+    @classmethod
+    def improve(
+        cls, costs: np.ndarray, route: Iterable[int], deadline: float
+    ) -> list[int]:
+        tour = np.asarray(list(route))
+        while time.perf_counter() < deadline:
+            tour, two_opt_improved = cls._two_opt_pass(costs, tour)
+            tour, or_opt_improved = cls._or_opt_pass(costs, tour)
+            if not (two_opt_improved or or_opt_improved):
+                break
+        return tour.tolist()
+
+    @classmethod
+    def solve(
+        cls,
+        durantion_matrix: list[list[float]],
+        options: SolveOptions | None = None,
+    ) -> SolverResult:
+        options = options or SolveOptions()
+        started_at = time.perf_counter()
+        deadline = started_at + options.time_limit_ms / 1000
+        costs = np.asarray(durantion_matrix, dtype=np.float64)
+
+        if settings.SOLVER_LOCAL_SEARCH_CONSTRUCTION == 'cheapest_insertion':
+            route = cls.cheapest_insertion(costs, [0], range(1, len(costs)))
+        else:
+            route = cls.nearest_neighbour(costs)
+        route = cls.improve(costs, route, deadline)
+
+        return SolverResult(
+            route=route,
+            objective=cls.tour_cost(costs, np.asarray(route)),
+            search_ms=(time.perf_counter() - started_at) * 1000,
+            solver='local_search',
+        )
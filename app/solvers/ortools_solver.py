@@ -1,50 +1,418 @@
+import time
+from collections.abc import Callable
+from enum import Enum
+
+import numpy as np
 from ortools.constraint_solver import pywrapcp, routing_enums_pb2
+from ortools.constraint_solver.routing_parameters_pb2 import (
+    RoutingSearchParameters,
+)
+
+from app.core.settings import settings
+from app.schemas.solver_schema import (
+    FleetSolverResult,
+    SolveOptions,
+    SolverResult,
+    SolverStrategy,
+    StopConstraints,
+    VehicleConstraints,
+)
+from app.solvers.route_schedule import RouteSchedule
+from app.solvers.search_telemetry import SearchTelemetry
+
+
+class TransitModeEnum(str, Enum):
+    MATRIX = 'matrix'
+    CALLBACK = 'callback'
 
 
 class ORToolsSolver:
     @classmethod
-    def solve(
+    def scale_matrix(
         cls,
-        durantion_matrix: list[list[float]],
-        optmization_seconds: int = 10,
+        durantion_matrix: list[list[float]] | np.ndarray,
+        cost_scale: int | None = None,
+    ) -> np.ndarray:
+        scale = cost_scale or settings.SOLVER_COST_SCALE
+        matrix = np.asarray(durantion_matrix, dtype=np.float64)
+        return np.rint(matrix * scale).astype(np.int64)
+
+    @classmethod
+    def create_model(
+        cls,
+        cost_matrix: np.ndarray,
         vehicles_number: int = 1,
         pickup_index: int = 0,
-    ) -> list[int]:
+        transit_mode: TransitModeEnum | None = None,
+    ) -> tuple[pywrapcp.RoutingIndexManager, pywrapcp.RoutingModel]:
         manager = pywrapcp.RoutingIndexManager(
-            len(durantion_matrix),
+            len(cost_matrix),
             vehicles_number,
             pickup_index,
         )
         routing = pywrapcp.RoutingModel(manager)
+        transit_index = cls.register_transit(
+            manager, routing, cost_matrix, transit_mode
+        )
+        routing.SetArcCostEvaluatorOfAllVehicles(transit_index)
+
+        return manager, routing
+
+    @classmethod
+    def register_transit(
+        cls,
+        manager: pywrapcp.RoutingIndexManager,
+        routing: pywrapcp.RoutingModel,
+        cost_matrix: np.ndarray,
+        transit_mode: TransitModeEnum | None = None,
+    ) -> int:
+        mode = transit_mode or settings.SOLVER_TRANSIT_MODE
+        if mode == TransitModeEnum.MATRIX:
+            return routing.RegisterTransitMatrix(cost_matrix.tolist())
+
+        costs = cost_matrix.tolist()
 
         def __cost_function(from_index: int, to_index: int) -> int:
-            return int(
-                durantion_matrix[manager.IndexToNode(from_index)][
-                    manager.IndexToNode(to_index)
-                ]
+            return costs[manager.IndexToNode(from_index)][
+                manager.IndexToNode(to_index)
+            ]
+
+        return routing.RegisterTransitCallback(__cost_function)
+
+    @classmethod
+    def add_fleet_dimensions(
+        cls,
+        routing: pywrapcp.RoutingModel,
+        transit_index: int,
+        cost_matrix: np.ndarray,
+        vehicles: list[VehicleConstraints],
+        pickup_index: int = 0,
+    ) -> None:
+        stops = len(cost_matrix) - 1
+
+        if any(vehicle.capacity for vehicle in vehicles):
+            demands = [1] * len(cost_matrix)
+            demands[pickup_index] = 0
+            routing.AddDimensionWithVehicleCapacity(
+                routing.RegisterUnaryTransitVector(demands),
+                0,
+                [vehicle.capacity or stops for vehicle in vehicles],
+                True,  # noqa: FBT003
+                'Capacity',
+            )
+
+        if any(vehicle.max_route_seconds for vehicle in vehicles):
+            scale = settings.SOLVER_COST_SCALE
+            unbounded = int(cost_matrix.sum())
+            routing.AddDimensionWithVehicleCapacity(
+                transit_index,
+                0,
+                [
+                    vehicle.max_route_seconds * scale
+                    if vehicle.max_route_seconds
+                    else unbounded
+                    for vehicle in vehicles
+                ],
+                True,  # noqa: FBT003
+                'Duration',
             )
 
-        transit_callback_index = routing.RegisterTransitCallback(
-            __cost_function
+    @classmethod
+    def add_time_windows(
+        cls,
+        manager: pywrapcp.RoutingIndexManager,
+        routing: pywrapcp.RoutingModel,
+        cost_matrix: np.ndarray,
+        stops: list[StopConstraints],
+        pickup_index: int = 0,
+    ) -> int:
+        scale = settings.SOLVER_COST_SCALE
+        service = np.array([stop.service_seconds * scale for stop in stops])
+        time_matrix = cost_matrix + service[:, None]
+        departure = RouteSchedule.departure_seconds(stops) * scale
+        latest_window = max(
+            (
+                stop.time_window.end_seconds
+                for stop in stops
+                if stop.time_window
+            ),
+            default=0,
         )
-        routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
+        horizon = int(time_matrix.sum()) + departure + latest_window * scale
+
+        routing.AddDimension(
+            routing.RegisterTransitMatrix(time_matrix.tolist()),
+            horizon,
+            horizon,
+            False,  # noqa: FBT003
+            'Time',
+        )
+        time_dimension = routing.GetDimensionOrDie('Time')
+        for vehicle in range(routing.vehicles()):
+            time_dimension.CumulVar(routing.Start(vehicle)).SetValue(departure)
+
+        drop_penalty = int(cost_matrix.sum()) + 1
+        for node, stop in enumerate(stops):
+            if node == pickup_index:
+                continue
+            index = manager.NodeToIndex(node)
+            if stop.time_window:
+                time_dimension.CumulVar(index).SetRange(
+                    stop.time_window.start_seconds * scale,
+                    stop.time_window.end_seconds * scale,
+                )
+            routing.AddDisjunction([index], drop_penalty)
+        return drop_penalty
 
+    @classmethod
+    def extract_routes(
+        cls,
+        manager: pywrapcp.RoutingIndexManager,
+        routing: pywrapcp.RoutingModel,
+        solution: pywrapcp.Assignment,
+    ) -> list[list[int]]:
+        routes = []
+        for vehicle in range(routing.vehicles()):
+            route = []
+            index = routing.Start(vehicle)
+            while not routing.IsEnd(index):
+                route.append(manager.IndexToNode(index))
+                index = solution.Value(routing.NextVar(index))
+            routes.append(route)
+        return routes
+
+    @classmethod
+    def extract_dropped(
+        cls,
+        manager: pywrapcp.RoutingIndexManager,
+        routing: pywrapcp.RoutingModel,
+        solution: pywrapcp.Assignment,
+    ) -> list[int]:
+        return [
+            manager.IndexToNode(index)
+            for index in range(routing.Size())
+            if not routing.IsStart(index)
+            and solution.Value(routing.NextVar(index)) == index
+        ]
+
+    @classmethod
+    def create_search_parameters(
+        cls, time_limit_ms: int, strategy: SolverStrategy | None = None
+    ) -> RoutingSearchParameters:
+        strategy = strategy or SolverStrategy()
         search_parameters = pywrapcp.DefaultRoutingSearchParameters()
-        search_parameters.first_solution_strategy = (
-            routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
+        search_parameters.first_solution_strategy = getattr(
+            routing_enums_pb2.FirstSolutionStrategy, strategy.first_solution
         )
-        search_parameters.local_search_metaheuristic = (
-            routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
+        search_parameters.local_search_metaheuristic = getattr(
+            routing_enums_pb2.LocalSearchMetaheuristic, strategy.metaheuristic
         )
-        search_parameters.time_limit.seconds = optmization_seconds
+        search_parameters.time_limit.FromMilliseconds(time_limit_ms)
+        return search_parameters
+
+    @classmethod
+    def add_early_stopping(
+        cls, routing: pywrapcp.RoutingModel, stall_ms: int
+    ) -> None:
+        best = {'objective': None, 'improved_at': time.perf_counter()}
+
+        def __stop_when_stalled() -> None:
+            objective = routing.CostVar().Value()
+            now = time.perf_counter()
+            if best['objective'] is None or objective < best['objective']:
+                best['objective'] = objective
+                best['improved_at'] = now
+            elif (now - best['improved_at']) * 1000 > stall_ms:
+                routing.CancelSearch()
+
+        routing.AddAtSolutionCallback(__stop_when_stalled)
 
+    @classmethod
+    def add_solution_listener(
+        cls,
+        manager: pywrapcp.RoutingIndexManager,
+        routing: pywrapcp.RoutingModel,
+        on_solution: Callable[[SolverResult], None],
+        drop_penalty: int = 0,
+    ) -> None:
+        started_at = time.perf_counter()
+        best: dict[str, int | None] = {'objective': None}
+
+        def __publish_improvement() -> None:
+            objective = routing.CostVar().Value()
+            if (
+                best['objective'] is not None
+                and objective >= best['objective']
+            ):
+                return
+            best['objective'] = objective
+
+            route = []
+            index = routing.Start(0)
+            while not routing.IsEnd(index):
+                route.append(manager.IndexToNode(index))
+                index = routing.NextVar(index).Value()
+            dropped = manager.GetNumberOfNodes() - len(route)
+            on_solution(
+                SolverResult(
+                    route=route,
+                    objective=(objective - drop_penalty * dropped)
+                    / settings.SOLVER_COST_SCALE,
+                    search_ms=(time.perf_counter() - started_at) * 1000,
+                )
+            )
+
+        routing.AddAtSolutionCallback(__publish_improvement)
+
+    @classmethod
+    def solve(  # noqa: PLR0913
+        cls,
+        durantion_matrix: list[list[float]],
+        options: SolveOptions | None = None,
+        vehicles_number: int = 1,
+        pickup_index: int = 0,
+        stops: list[StopConstraints] | None = None,
+        on_solution: Callable[[SolverResult], None] | None = None,
+    ) -> SolverResult:
+        options = options or SolveOptions()
+        cost_matrix = cls.scale_matrix(durantion_matrix)
+        manager, routing = cls.create_model(
+            cost_matrix,
+            vehicles_number,
+            pickup_index,
+        )
+        drop_penalty = 0
+        if stops:
+            drop_penalty = cls.add_time_windows(
+                manager, routing, cost_matrix, stops, pickup_index
+            )
+        if options.stall_ms:
+            cls.add_early_stopping(routing, options.stall_ms)
+        if on_solution:
+            cls.add_solution_listener(
+                manager, routing, on_solution, drop_penalty
+            )
+        telemetry = SearchTelemetry(routing, len(cost_matrix))
+        search_parameters = cls.create_search_parameters(
+            options.time_limit_ms, options.strategy
+        )
+
+        started_at = time.perf_counter()
+        telemetry.start()
+        solution = routing.SolveWithParameters(search_parameters)
+        search_ms = (time.perf_counter() - started_at) * 1000
+        telemetry.record(search_ms)
+
+        if not solution:
+            return SolverResult(route=[], search_ms=search_ms)
+        dropped = cls.extract_dropped(manager, routing, solution)
+        objective = solution.ObjectiveValue() - drop_penalty * len(dropped)
+        return SolverResult(
+            route=cls.extract_routes(manager, routing, solution)[0],
+            dropped=dropped,
+            objective=objective / settings.SOLVER_COST_SCALE,
+            search_ms=search_ms,
+            strategy=options.strategy.key if options.strategy else None,
+        )
+
+    @classmethod
+    def reoptimize(
+        cls,
+        durantion_matrix: list[list[float]],
+        initial_route: list[int],
+        options: SolveOptions | None = None,
+        end_index: int = 0,
+    ) -> SolverResult:
+        options = options or SolveOptions()
+        cost_matrix = cls.scale_matrix(durantion_matrix)
+        manager = pywrapcp.RoutingIndexManager(
+            len(cost_matrix), 1, [initial_route[0]], [end_index]
+        )
+        routing = pywrapcp.RoutingModel(manager)
+        transit_index = cls.register_transit(manager, routing, cost_matrix)
+        routing.SetArcCostEvaluatorOfAllVehicles(transit_index)
+        if options.stall_ms:
+            cls.add_early_stopping(routing, options.stall_ms)
+        telemetry = SearchTelemetry(routing, len(cost_matrix))
+        search_parameters = cls.create_search_parameters(
+            options.time_limit_ms, options.strategy
+        )
+        routing.CloseModelWithParameters(search_parameters)
+
+        started_at = time.perf_counter()
+        telemetry.start()
+        initial_assignment = routing.ReadAssignmentFromRoutes(
+            [
+                [
+                    manager.NodeToIndex(node)
+                    for node in initial_route[1:]
+                    if node != end_index
+                ]
+            ],
+            True,  # noqa: FBT003
+        )
+        if initial_assignment:
+            solution = routing.SolveFromAssignmentWithParameters(
+                initial_assignment, search_parameters
+            )
+        else:
+            solution = routing.SolveWithParameters(search_parameters)
+        search_ms = (time.perf_counter() - started_at) * 1000
+        telemetry.record(search_ms)
+
+        if not solution:
+            return SolverResult(route=[], search_ms=search_ms)
+        return SolverResult(
+            route=cls.extract_routes(manager, routing, solution)[0],
+            objective=solution.ObjectiveValue() / settings.SOLVER_COST_SCALE,
+            search_ms=search_ms,
+        )
+
+    @classmethod
+    def solve_fleet(
+        cls,
+        durantion_matrix: list[list[float]],
+        vehicles: list[VehicleConstraints],
+        options: SolveOptions | None = None,
+        pickup_index: int = 0,
+        stops: list[StopConstraints] | None = None,
+    ) -> FleetSolverResult:
+        options = options or SolveOptions()
+        cost_matrix = cls.scale_matrix(durantion_matrix)
+        manager = pywrapcp.RoutingIndexManager(
+            len(cost_matrix), len(vehicles), pickup_index
+        )
+        routing = pywrapcp.RoutingModel(manager)
+        transit_index = cls.register_transit(manager, routing, cost_matrix)
+        routing.SetArcCostEvaluatorOfAllVehicles(transit_index)
+        cls.add_fleet_dimensions(
+            routing, transit_index, cost_matrix, vehicles, pickup_index
+        )
+        drop_penalty = 0
+        if stops:
+            drop_penalty = cls.add_time_windows(
+                manager, routing, cost_matrix, stops, pickup_index
+            )
+        if options.stall_ms:
+            cls.add_early_stopping(routing, options.stall_ms)
+        telemetry = SearchTelemetry(routing, len(cost_matrix))
+        search_parameters = cls.create_search_parameters(
+            options.time_limit_ms, options.strategy
+        )
+
+        started_at = time.perf_counter()
+        telemetry.start()
         solution = routing.SolveWithParameters(search_parameters)
+        search_ms = (time.perf_counter() - started_at) * 1000
+        telemetry.record(search_ms)
 
         if not solution:
-            return list(range(len(durantion_matrix)))
-        optimal_route = []
-        index = routing.Start(0)
-        while not routing.IsEnd(index):
-            optimal_route.append(manager.IndexToNode(index))
-            index = solution.Value(routing.NextVar(index))
-        return optimal_route
+            return FleetSolverResult(routes=[], search_ms=search_ms)
+        dropped = cls.extract_dropped(manager, routing, solution)
+        objective = solution.ObjectiveValue() - drop_penalty * len(dropped)
+        return FleetSolverResult(
+            routes=cls.extract_routes(manager, routing, solution),
+            dropped=dropped,
+            objective=objective / settings.SOLVER_COST_SCALE,
+            search_ms=search_ms,
+        )
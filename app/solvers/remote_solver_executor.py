@@ -0,0 +1,86 @@
+from collections.abc import AsyncGenerator, Callable
+from typing import get_type_hints
+from uuid import UUID
+
+from pydantic import TypeAdapter
+from redis.asyncio import Redis
+
+from app.core.settings import settings
+from app.exceptions.erros import ServiceUnavailableError
+from app.schemas.solver_schema import (
+    SolveOptions,
+    SolverResult,
+    SolverTask,
+    SolverTaskResult,
+    StopConstraints,
+)
+from app.solvers.solver_executor import SolverExecutor
+
+
+def make_result_key(task_id: str) -> str:
+    return f'solver_result:{task_id}'
+
+
+class RemoteSolverExecutor(SolverExecutor):
+    def __init__(
+        self,
+        cache_client: Redis,
+        slots: int,
+        queue_size: int,
+        aging_per_second: float = 0.0,
+    ) -> None:
+        super().__init__(
+            workers=slots,
+            queue_size=queue_size,
+            max_solves_per_worker=1,
+            aging_per_second=aging_per_second,
+        )
+        self.cache_client = cache_client
+
+    async def start(self) -> None:
+        return None
+
+    async def shutdown(self) -> None:
+        return None
+
+    async def solve_streaming(
+        self,
+        durantion_matrix: list[list[float]],
+        options: SolveOptions,
+        stops: list[StopConstraints] | None = None,
+        *,
+        user_id: UUID | None = None,
+    ) -> AsyncGenerator[SolverResult]:
+        yield await self.solve(
+            durantion_matrix, options, stops, user_id=user_id
+        )
+
+    async def _run[T](
+        self,
+        function: Callable[..., T],
+        carrier: dict[str, str],
+        *args: object,
+    ) -> T:
+        task = SolverTask(
+            function=function.__name__, carrier=carrier, arguments=list(args)
+        )
+        await self.cache_client.xadd(
+            settings.SOLVER_STREAM_KEY,
+            {'task': task.model_dump_json()},
+            maxlen=settings.SOLVER_STREAM_MAX_LENGTH,
+            approximate=True,
+        )
+        response = await self.cache_client.blpop(  # pyright: ignore[reportGeneralTypeIssues]
+            [make_result_key(task.id)],
+            timeout=settings.SOLVER_TASK_TIMEOUT_SECONDS,
+        )
+        if response is None:
+            raise ServiceUnavailableError(
+                message='solver workers did not answer in time'
+            )
+
+        task_result = SolverTaskResult.model_validate_json(response[1])
+        if task_result.error:
+            raise ServiceUnavailableError(message=task_result.error)
+        return_type = get_type_hints(function)['return']
+        return TypeAdapter(return_type).validate_python(task_result.result)
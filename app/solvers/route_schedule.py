@@ -0,0 +1,43 @@
+from collections.abc import Sequence
+from itertools import pairwise
+
+from app.schemas.solver_schema import StopConstraints
+
+
+class RouteSchedule:
+    @classmethod
+    def has_time_windows(cls, stops: Sequence[StopConstraints] | None) -> bool:
+        return bool(stops) and any(
+            stop.time_window is not None for stop in stops[1:]
+        )
+
+    @classmethod
+    def departure_seconds(cls, stops: Sequence[StopConstraints]) -> int:
+        pickup_window = stops[0].time_window
+        return pickup_window.start_seconds if pickup_window else 0
+
+    @classmethod
+    def arrival_seconds(
+        cls,
+        durantion_matrix: list[list[float]],
+        route: list[int],
+        stops: Sequence[StopConstraints],
+    ) -> list[float]:
+        legs = [durantion_matrix[i][j] for i, j in pairwise(route)]
+        return cls.arrival_seconds_from_legs(legs, route, stops)
+
+    @classmethod
+    def arrival_seconds_from_legs(
+        cls,
+        legs: list[float],
+        route: list[int],
+        stops: Sequence[StopConstraints],
+    ) -> list[float]:
+        arrivals = [float(cls.departure_seconds(stops))]
+        for (previous, node), leg in zip(pairwise(route), legs, strict=True):
+            arrival = arrivals[-1] + stops[previous].service_seconds + leg
+            window = stops[node].time_window
+            if window:
+                arrival = max(arrival, window.start_seconds)
+            arrivals.append(arrival)
+        return arrivals
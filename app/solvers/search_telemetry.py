@@ -0,0 +1,94 @@
+import time
+
+from opentelemetry import metrics, trace
+from ortools.constraint_solver import pywrapcp, routing_enums_pb2
+
+from app.core.settings import settings
+from app.solvers.solver_portfolio import SolverPortfolio
+
+meter = metrics.get_meter(__name__)
+
+first_solution_time = meter.create_histogram(
+    'solver.first_solution.time',
+    unit='ms',
+    description='time until the search found a first route',
+)
+best_solution_time = meter.create_histogram(
+    'solver.best_solution.time',
+    unit='ms',
+    description='time until the search found its final route',
+)
+search_time = meter.create_histogram(
+    'solver.search.time',
+    unit='ms',
+    description='time the search ran before returning',
+)
+solutions_found = meter.create_histogram(
+    'solver.solutions',
+    unit='{solution}',
+    description='solutions the search went through',
+)
+
+
+class SearchTelemetry:
+    def __init__(self, routing: pywrapcp.RoutingModel, nodes: int) -> None:
+        self.routing = routing
+        self.size_bucket = SolverPortfolio.size_bucket(nodes)
+        self.started_at = time.perf_counter()
+        self.first_solution_ms: float | None = None
+        self.best_solution_ms: float | None = None
+        self.best_objective: int | None = None
+        self.improvements = 0
+        routing.AddAtSolutionCallback(self._on_solution)
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+
+    def _on_solution(self) -> None:
+        elapsed_ms = (time.perf_counter() - self.started_at) * 1000
+        objective = self.routing.CostVar().Value()
+        if self.first_solution_ms is None:
+            self.first_solution_ms = elapsed_ms
+        if (
+            self.best_objective is not None
+            and objective >= self.best_objective
+        ):
+            return
+
+        self.best_objective = objective
+        self.best_solution_ms = elapsed_ms
+        self.improvements += 1
+        trace.get_current_span().add_event(
+            'solver.improvement',
+            {
+                'solver.objective': objective / settings.SOLVER_COST_SCALE,
+                'solver.elapsed_ms': elapsed_ms,
+            },
+        )
+
+    def record(self, search_ms: float) -> None:
+        status = routing_enums_pb2.RoutingSearchStatus.Value.Name(
+            self.routing.status()
+        )
+        solutions = self.routing.solver().Solutions()
+        attributes = {
+            'solver.size_bucket': self.size_bucket,
+            'solver.status': status,
+        }
+
+        span = trace.get_current_span()
+        span.set_attribute('solver.status', status)
+        span.set_attribute('solver.solutions', solutions)
+        span.set_attribute('solver.improvements', self.improvements)
+        if self.first_solution_ms is not None:
+            span.set_attribute(
+                'solver.first_solution_ms', self.first_solution_ms
+            )
+            first_solution_time.record(self.first_solution_ms, attributes)
+        if self.best_solution_ms is not None:
+            span.set_attribute(
+                'solver.best_solution_ms', self.best_solution_ms
+            )
+            best_solution_time.record(self.best_solution_ms, attributes)
+        search_time.record(search_ms, attributes)
+        solutions_found.record(solutions, attributes)
@@ -0,0 +1,33 @@
+from app.core.settings import settings
+from app.schemas.solver_schema import (
+    QUALITY_MULTIPLIERS,
+    QualityEnum,
+    SolveOptions,
+    SolverEnum,
+)
+
+
+class SolveBudget:
+    @classmethod
+    def for_instance(
+        cls,
+        nodes: int,
+        quality: QualityEnum = QualityEnum.BALANCED,
+        max_solve_ms: int | None = None,
+        solver: SolverEnum = SolverEnum.AUTO,
+    ) -> SolveOptions:
+        multiplier = QUALITY_MULTIPLIERS[quality]
+        scaled_ms = min(
+            settings.SOLVER_BUDGET_BASE_MS
+            + settings.SOLVER_BUDGET_PER_NODE_MS * nodes,
+            settings.SOLVER_BUDGET_MAX_MS,
+        )
+        time_limit_ms = int(scaled_ms * multiplier)
+        if max_solve_ms is not None:
+            time_limit_ms = min(time_limit_ms, max_solve_ms)
+
+        return SolveOptions(
+            time_limit_ms=max(time_limit_ms, 1),
+            stall_ms=int(settings.SOLVER_STALL_MS * multiplier),
+            solver=solver,
+        )
@@ -0,0 +1,93 @@
+import asyncio
+import time
+from collections import Counter
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import NamedTuple
+
+from opentelemetry import metrics
+
+meter = metrics.get_meter(__name__)
+
+queue_depth = meter.create_up_down_counter(
+    'solver.queue.depth',
+    unit='{solve}',
+    description='solves waiting for a solver slot',
+)
+queue_wait = meter.create_histogram(
+    'solver.queue.wait',
+    unit='ms',
+    description='time a solve waited for a solver slot',
+)
+
+
+class Waiter(NamedTuple):
+    user: str
+    cost: float
+    enqueued_at: float
+    future: asyncio.Future[None]
+
+
+class SolveScheduler:
+    def __init__(self, slots: int, aging_per_second: float) -> None:
+        self.slots = slots
+        self.aging_per_second = aging_per_second
+        self._running: Counter[str] = Counter()
+        self._waiting: list[Waiter] = []
+
+    @property
+    def depth(self) -> int:
+        return len(self._waiting)
+
+    @asynccontextmanager
+    async def slot(self, user: str, cost: float) -> AsyncIterator[None]:
+        enqueued_at = time.perf_counter()
+        if self._waiting or self._running.total() >= self.slots:
+            waiter = Waiter(
+                user,
+                cost,
+                enqueued_at,
+                asyncio.get_running_loop().create_future(),
+            )
+            self._waiting.append(waiter)
+            queue_depth.add(1)
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if waiter in self._waiting:
+                    self._waiting.remove(waiter)
+                    queue_depth.add(-1)
+                else:
+                    self._release(user)
+                raise
+        else:
+            self._running[user] += 1
+        queue_wait.record((time.perf_counter() - enqueued_at) * 1000)
+
+        try:
+            yield
+        finally:
+            self._release(user)
+
+    def _priority(
+        self, waiter: Waiter, now: float
+    ) -> tuple[int, float, float]:
+        aged_cost = (
+            waiter.cost - (now - waiter.enqueued_at) * self.aging_per_second
+        )
+        return (self._running[waiter.user], aged_cost, waiter.enqueued_at)
+
+    def _release(self, user: str) -> None:
+        self._running[user] -= 1
+        if self._running[user] <= 0:
+            del self._running[user]
+
+        now = time.perf_counter()
+        while self._waiting and self._running.total() < self.slots:
+            waiter = min(
+                self._waiting, key=lambda waiter: self._priority(waiter, now)
+            )
+            self._waiting.remove(waiter)
+            queue_depth.add(-1)
+            self._running[waiter.user] += 1
+            waiter.future.set_result(None)
@@ -0,0 +1,91 @@
+from collections.abc import Callable
+
+from app.core.settings import settings
+from app.schemas.solver_schema import (
+    FleetSolverResult,
+    SolveOptions,
+    SolverEnum,
+    SolverResult,
+    StopConstraints,
+    VehicleConstraints,
+)
+from app.solvers.held_karp_solver import HeldKarpSolver
+from app.solvers.local_search_solver import LocalSearchSolver
+from app.solvers.ortools_solver import ORToolsSolver
+from app.solvers.route_schedule import RouteSchedule
+
+TRIVIAL_NODES = 2
+
+
+class SolverDispatcher:
+    @classmethod
+    def is_trivial(cls, durantion_matrix: list[list[float]]) -> bool:
+        return len(durantion_matrix) <= TRIVIAL_NODES
+
+    @classmethod
+    def solve_trivial(
+        cls, durantion_matrix: list[list[float]]
+    ) -> SolverResult:
+        nodes = len(durantion_matrix)
+        objective = 0.0
+        if nodes == TRIVIAL_NODES:
+            objective = durantion_matrix[0][1] + durantion_matrix[1][0]
+        return SolverResult(
+            route=list(range(nodes)),
+            objective=objective,
+            solver='trivial',
+        )
+
+    @classmethod
+    def solve(
+        cls,
+        durantion_matrix: list[list[float]],
+        options: SolveOptions | None = None,
+        stops: list[StopConstraints] | None = None,
+        on_solution: Callable[[SolverResult], None] | None = None,
+    ) -> SolverResult:
+        options = options or SolveOptions()
+        if RouteSchedule.has_time_windows(stops):
+            return ORToolsSolver.solve(
+                durantion_matrix, options, stops=stops, on_solution=on_solution
+            )
+        if cls.is_trivial(durantion_matrix):
+            return cls.solve_trivial(durantion_matrix)
+        if options.solver == SolverEnum.LOCAL_SEARCH:
+            return LocalSearchSolver.solve(durantion_matrix, options)
+        if (
+            options.solver in {SolverEnum.AUTO, SolverEnum.PORTFOLIO}
+            and len(durantion_matrix) - 1 <= settings.SOLVER_EXACT_MAX_STOPS
+        ):
+            return HeldKarpSolver.solve(durantion_matrix)
+        return ORToolsSolver.solve(
+            durantion_matrix, options, on_solution=on_solution
+        )
+
+    @classmethod
+    def reoptimize(
+        cls,
+        durantion_matrix: list[list[float]],
+        initial_route: list[int],
+        options: SolveOptions | None = None,
+        end_index: int = 0,
+    ) -> SolverResult:
+        if len(initial_route) <= TRIVIAL_NODES:
+            return SolverResult(route=initial_route, solver='trivial')
+        return ORToolsSolver.reoptimize(
+            durantion_matrix, initial_route, options, end_index
+        )
+
+    @classmethod
+    def solve_fleet(
+        cls,
+        durantion_matrix: list[list[float]],
+        vehicles: list[VehicleConstraints],
+        options: SolveOptions | None = None,
+        stops: list[StopConstraints] | None = None,
+    ) -> FleetSolverResult:
+        if not RouteSchedule.has_time_windows(stops):
+            stops = None
+        return ORToolsSolver.solve_fleet(
+            durantion_matrix, vehicles, options, stops=stops
+        )
@@ -0,0 +1,445 @@
+import asyncio
+import inspect
+import multiprocessing
+import os
+import threading
+from collections.abc import AsyncGenerator, Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from functools import partial
+from multiprocessing.queues import Queue
+from typing import Any, get_type_hints
+from uuid import UUID, uuid4
+
+from opentelemetry import metrics, propagate, trace
+from opentelemetry.trace import Span
+from pydantic import TypeAdapter
+from pydantic_core import to_jsonable_python
+
+from app.exceptions.erros import ServiceUnavailableError
+from app.schemas.solver_schema import (
+    FleetSolverResult,
+    SolveOptions,
+    SolverResult,
+    SolverStrategy,
+    SolverTask,
+    StopConstraints,
+    VehicleConstraints,
+)
+from app.solvers.route_schedule import RouteSchedule
+from app.solvers.solve_scheduler import SolveScheduler
+from app.solvers.solver_dispatcher import SolverDispatcher
+from app.solvers.solver_portfolio import SolverPortfolio
+
+tracer = trace.get_tracer(__name__)
+
+_worker_state: dict[str, Any] = {}
+
+
+def _init_worker(updates: Queue) -> None:
+    _worker_state['updates'] = updates
+
+
+def _warm_up_worker() -> int:
+    return os.getpid()
+
+
+def _publish_update(stream_id: str, result: SolverResult) -> None:
+    _worker_state['updates'].put((stream_id, result))
+
+
+def _flush_telemetry() -> None:
+    for provider in (
+        trace.get_tracer_provider(),
+        metrics.get_meter_provider(),
+    ):
+        force_flush = getattr(provider, 'force_flush', None)
+        if force_flush:
+            force_flush()
+
+
+@contextmanager
+def _solver_span(
+    carrier: dict[str, str],
+    durantion_matrix: list[list[float]],
+    options: SolveOptions,
+) -> Iterator[Span]:
+    context = propagate.extract(carrier)
+    try:
+        with tracer.start_as_current_span(
+            'solver.solve', context=context
+        ) as span:
+            span.set_attribute('solver.nodes', len(durantion_matrix))
+            span.set_attribute('solver.time_limit_ms', options.time_limit_ms)
+            yield span
+    finally:
+        _flush_telemetry()
+
+
+def _set_result_attributes(
+    span: Span, result: SolverResult | FleetSolverResult
+) -> None:
+    span.set_attribute('solver.name', result.solver)
+    span.set_attribute('solver.search_ms', result.search_ms)
+    if result.objective is not None:
+        span.set_attribute('solver.objective', result.objective)
+    if isinstance(result, SolverResult) and result.strategy:
+        span.set_attribute('solver.strategy', result.strategy)
+
+
+def _solve_in_worker(
+    carrier: dict[str, str],
+    durantion_matrix: list[list[float]],
+    options: SolveOptions,
+    stops: list[StopConstraints] | None = None,
+    stream_id: str | None = None,
+) -> SolverResult:
+    on_solution = partial(_publish_update, stream_id) if stream_id else None
+    with _solver_span(carrier, durantion_matrix, options) as span:
+        result = SolverDispatcher.solve(
+            durantion_matrix, options, stops, on_solution
+        )
+        _set_result_attributes(span, result)
+        return result
+
+
+def _reoptimize_in_worker(
+    carrier: dict[str, str],
+    durantion_matrix: list[list[float]],
+    initial_route: list[int],
+    options: SolveOptions,
+    end_index: int = 0,
+) -> SolverResult:
+    with _solver_span(carrier, durantion_matrix, options) as span:
+        span.set_attribute('solver.warm_start', True)  # noqa: FBT003
+        result = SolverDispatcher.reoptimize(
+            durantion_matrix, initial_route, options, end_index
+        )
+        _set_result_attributes(span, result)
+        return result
+
+
+def _solve_fleet_in_worker(
+    carrier: dict[str, str],
+    durantion_matrix: list[list[float]],
+    vehicles: list[VehicleConstraints],
+    options: SolveOptions,
+    stops: list[StopConstraints] | None = None,
+) -> FleetSolverResult:
+    with _solver_span(carrier, durantion_matrix, options) as span:
+        span.set_attribute('solver.vehicles', len(vehicles))
+        result = SolverDispatcher.solve_fleet(
+            durantion_matrix, vehicles, options, stops
+        )
+        _set_result_attributes(span, result)
+        return result
+
+
+WORKER_FUNCTIONS: dict[
+    str, Callable[..., SolverResult | FleetSolverResult]
+] = {
+    function.__name__: function
+    for function in (
+        _solve_in_worker,
+        _reoptimize_in_worker,
+        _solve_fleet_in_worker,
+    )
+}
+
+
+class SolverExecutor:
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        max_solves_per_worker: int,
+        aging_per_second: float = 0.0,
+    ) -> None:
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.max_solves_per_worker = max_solves_per_worker
+        self._pending = 0
+        self._scheduler = SolveScheduler(workers, aging_per_second)
+        self._updates: Queue = multiprocessing.get_context(
+            'forkserver'
+        ).Queue()
+        self._streams: dict[str, asyncio.Queue[SolverResult]] = {}
+        self._updates_reader: threading.Thread | None = None
+        self._pool: ProcessPoolExecutor | None = None
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _create_pool(self) -> ProcessPoolExecutor:
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload([__name__])
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self._updates,),
+            max_tasks_per_child=self.max_solves_per_worker,
+        )
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = self._create_pool()
+        return self._pool
+
+    def _restart_pool(self, broken_pool: ProcessPoolExecutor) -> None:
+        if broken_pool is not self._pool:
+            return
+        self._pool = self._create_pool()
+        broken_pool.shutdown(wait=False, cancel_futures=True)
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(pool, _warm_up_worker)
+                for _ in range(self.workers)
+            )
+        )
+
+    async def shutdown(self) -> None:
+        if self._pool:
+            await asyncio.to_thread(
+                self._pool.shutdown, wait=True, cancel_futures=True
+            )
+            self._pool = None
+        if self._updates_reader:
+            self._updates.put(None)
+            await asyncio.to_thread(self._updates_reader.join)
+            self._updates_reader = None
+
+    def _start_updates_reader(self) -> None:
+        if self._updates_reader:
+            return
+        self._updates_reader = threading.Thread(
+            target=self._read_updates,
+            args=(asyncio.get_running_loop(),),
+            daemon=True,
+        )
+        self._updates_reader.start()
+
+    def _read_updates(self, loop: asyncio.AbstractEventLoop) -> None:
+        while update := self._updates.get():
+            stream_id, result = update
+            stream = self._streams.get(stream_id)
+            if stream:
+                loop.call_soon_threadsafe(stream.put_nowait, result)
+
+    async def _submit[T](
+        self,
+        function: Callable[..., T],
+        durantion_matrix: list[list[float]],
+        *args: object,
+        user_id: UUID | None = None,
+        carrier: dict[str, str] | None = None,
+    ) -> T:
+        if self._pending >= self.capacity:
+            raise ServiceUnavailableError(
+                message='solver queue is full, try again later'
+            )
+
+        if carrier is None:
+            carrier = {}
+            propagate.inject(carrier)
+
+        self._pending += 1
+        try:
+            async with self._scheduler.slot(
+                str(user_id or ''), len(durantion_matrix) - 1
+            ):
+                return await self._run(
+                    function, carrier, durantion_matrix, *args
+                )
+        finally:
+            self._pending -= 1
+
+    async def _run[T](
+        self,
+        function: Callable[..., T],
+        carrier: dict[str, str],
+        *args: object,
+    ) -> T:
+        pool = self._get_pool()
+        loop = asyncio.get_running_loop()
+        solving = loop.run_in_executor(pool, function, carrier, *args)
+        try:
+            return await asyncio.shield(solving)
+        except asyncio.CancelledError:
+            # a running worker cannot be interrupted, keep its slot taken
+            # until it finishes so the pool is never oversubscribed
+            await asyncio.wait([solving])
+            if not solving.cancelled():
+                solving.exception()
+            raise
+        except BrokenProcessPool as e:
+            self._restart_pool(pool)
+            raise ServiceUnavailableError(
+                message='solver worker crashed, try again later'
+            ) from e
+
+    async def run_task(self, task: SolverTask) -> object:
+        function = WORKER_FUNCTIONS[task.function]
+        type_hints = get_type_hints(function)
+        parameters = list(inspect.signature(function).parameters)[1:]
+        arguments = [
+            TypeAdapter(type_hints[parameter]).validate_python(argument)
+            for parameter, argument in zip(
+                parameters, task.arguments, strict=False
+            )
+        ]
+        result = await self._submit(function, *arguments, carrier=task.carrier)
+        return to_jsonable_python(result)
+
+    async def solve(
+        self,
+        durantion_matrix: list[list[float]],
+        options: SolveOptions,
+        stops: list[StopConstraints] | None = None,
+        *,
+        user_id: UUID | None = None,
+    ) -> SolverResult:
+        if SolverDispatcher.is_trivial(
+            durantion_matrix
+        ) and not RouteSchedule.has_time_windows(stops):
+            return SolverDispatcher.solve_trivial(durantion_matrix)
+        return await self._submit(
+            _solve_in_worker, durantion_matrix, options, stops, user_id=user_id
+        )
+
+    async def solve_streaming(
+        self,
+        durantion_matrix: list[list[float]],
+        options: SolveOptions,
+        stops: list[StopConstraints] | None = None,
+        *,
+        user_id: UUID | None = None,
+    ) -> AsyncGenerator[SolverResult]:
+        if SolverDispatcher.is_trivial(
+            durantion_matrix
+        ) and not RouteSchedule.has_time_windows(stops):
+            yield SolverDispatcher.solve_trivial(durantion_matrix)
+            return
+
+        stream_id = uuid4().hex
+        updates: asyncio.Queue[SolverResult] = asyncio.Queue()
+        self._streams[stream_id] = updates
+        self._start_updates_reader()
+        solving = asyncio.ensure_future(
+            self._submit(
+                _solve_in_worker,
+                durantion_matrix,
+                options,
+                stops,
+                stream_id,
+                user_id=user_id,
+            )
+        )
+        try:
+            while True:
+                next_update = asyncio.ensure_future(updates.get())
+                done, _ = await asyncio.wait(
+                    {solving, next_update},
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if next_update not in done:
+                    next_update.cancel()
+                    break
+                yield next_update.result()
+            yield solving.result()
+        finally:
+            solving.cancel()
+            del self._streams[stream_id]
+
+    async def solve_portfolio(
+        self,
+        durantion_matrix: list[list[float]],
+        options: SolveOptions,
+        strategies: list[SolverStrategy],
+        *,
+        user_id: UUID | None = None,
+    ) -> SolverResult:
+        racers = max(
+            1,
+            min(len(strategies), self.workers, self.capacity - self._pending),
+        )
+        results = await asyncio.gather(
+            *(
+                self._submit(
+                    _solve_in_worker,
+                    durantion_matrix,
+                    options.model_copy(update={'strategy': strategy}),
+                    user_id=user_id,
+                )
+                for strategy in strategies[:racers]
+            )
+        )
+        return SolverPortfolio.pick_best(results)
+
+    async def reoptimize(
+        self,
+        durantion_matrix: list[list[float]],
+        initial_route: list[int],
+        options: SolveOptions,
+        end_index: int = 0,
+        *,
+        user_id: UUID | None = None,
+    ) -> SolverResult:
+        return await self._submit(
+            _reoptimize_in_worker,
+            durantion_matrix,
+            initial_route,
+            options,
+            end_index,
+            user_id=user_id,
+        )
+
+    async def solve_fleet(
+        self,
+        durantion_matrix: list[list[float]],
+        vehicles: list[VehicleConstraints],
+        options: SolveOptions,
+        stops: list[StopConstraints] | None = None,
+        *,
+        user_id: UUID | None = None,
+    ) -> FleetSolverResult:
+        return await self._submit(
+            _solve_fleet_in_worker,
+            durantion_matrix,
+            vehicles,
+            options,
+            stops,
+            user_id=user_id,
+        )
+
+    async def solve_many(
+        self,
+        durantion_matrices: list[list[list[float]]],
+        options: list[SolveOptions],
+        *,
+        user_id: UUID | None = None,
+    ) -> list[SolverResult]:
+        semaphore = asyncio.Semaphore(self.workers)
+
+        async def __solve(
+            durantion_matrix: list[list[float]], solve_options: SolveOptions
+        ) -> SolverResult:
+            async with semaphore:
+                return await self.solve(
+                    durantion_matrix, solve_options, user_id=user_id
+                )
+
+        return await asyncio.gather(
+            *(
+                __solve(durantion_matrix, solve_options)
+                for durantion_matrix, solve_options in zip(
+                    durantion_matrices, options, strict=True
+                )
+            )
+        )
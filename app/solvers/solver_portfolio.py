@@ -0,0 +1,41 @@
+from collections.abc import Sequence
+
+from app.core.settings import settings
+from app.schemas.solver_schema import SolverResult, SolverStrategy
+
+
+class SolverPortfolio:
+    @classmethod
+    def strategies(cls, racers: int | None = None) -> list[SolverStrategy]:
+        strategies = [
+            SolverStrategy.from_key(key)
+            for key in settings.SOLVER_PORTFOLIO_STRATEGIES
+        ]
+        return strategies[:racers] if racers else strategies
+
+    @classmethod
+    def size_bucket(cls, nodes: int) -> str:
+        for limit in sorted(settings.SOLVER_PORTFOLIO_SIZE_BUCKETS):
+            if nodes <= limit:
+                return f'le_{limit}'
+        return f'gt_{max(settings.SOLVER_PORTFOLIO_SIZE_BUCKETS, default=0)}'
+
+    @classmethod
+    def pick_best(cls, results: Sequence[SolverResult]) -> SolverResult:
+        solved = [result for result in results if result.route]
+        if not solved:
+            return SolverResult(
+                route=[],
+                search_ms=max(result.search_ms for result in results),
+                solver='portfolio',
+            )
+        best = min(
+            solved,
+            key=lambda result: (len(result.dropped), result.objective or 0.0),
+        )
+        return best.model_copy(
+            update={
+                'search_ms': max(result.search_ms for result in results),
+                'solver': 'portfolio',
+            }
+        )
@@ -0,0 +1,66 @@
+from collections.abc import Sequence
+from typing import NamedTuple
+
+import numpy as np
+
+from app.schemas.solver_schema import SolverResult
+
+
+class StopReduction(NamedTuple):
+    groups: list[list[int]]
+    nodes: list[int]
+
+
+class StopReducer:
+    @classmethod
+    def reduce(
+        cls, cells: Sequence[str], *, merge: bool = True
+    ) -> StopReduction:
+        groups: list[list[int]] = [[0]]
+        nodes = [0]
+        group_by_cell: dict[str, int] = {}
+        for node in range(1, len(cells)):
+            group = group_by_cell.get(cells[node]) if merge else None
+            if group is None:
+                group = len(groups)
+                group_by_cell[cells[node]] = group
+                groups.append([])
+            groups[group].append(node)
+            nodes.append(group)
+        return StopReduction(groups, nodes)
+
+    @classmethod
+    def is_reduced(cls, reduction: StopReduction) -> bool:
+        return len(reduction.groups) < len(reduction.nodes)
+
+    @classmethod
+    def representatives(cls, reduction: StopReduction) -> list[int]:
+        return [group[0] for group in reduction.groups]
+
+    @classmethod
+    def expand_route(
+        cls, reduction: StopReduction, route: Sequence[int]
+    ) -> list[int]:
+        return [node for group in route for node in reduction.groups[group]]
+
+    @classmethod
+    def expand(
+        cls, reduction: StopReduction, result: SolverResult
+    ) -> SolverResult:
+        if not cls.is_reduced(reduction):
+            return result
+        return result.model_copy(
+            update={
+                'route': cls.expand_route(reduction, result.route),
+                'dropped': cls.expand_route(reduction, result.dropped),
+            }
+        )
+
+    @classmethod
+    def expand_matrix(
+        cls, reduction: StopReduction, durantion_matrix: list[list[float]]
+    ) -> list[list[float]]:
+        if not cls.is_reduced(reduction):
+            return durantion_matrix
+        nodes = np.asarray(reduction.nodes)
+        return np.asarray(durantion_matrix)[np.ix_(nodes, nodes)].tolist()
@@ -2,22 +2,24 @@ from collections.abc import AsyncGenerator, Generator
 from http import HTTPStatus
 from typing import Any
 
+import numpy as np
 import pytest
 import pytest_asyncio
 from _pytest.monkeypatch import MonkeyPatch
 from fakeredis import FakeAsyncRedis
 from fastapi.testclient import TestClient
-from httpx import Response
+from httpx import Request, Response
 from respx import MockRouter, Route
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
+    async_sessionmaker,
     create_async_engine,
 )
 from testcontainers.postgres import PostgresContainer
 
 from app.core.cache_manager import get_cache_client
-from app.core.database import get_session
+from app.core.database import get_session, get_session_maker
 from app.core.settings import settings
 from app.main import app
 from app.models.path_model import PathModel
@@ -26,6 +28,7 @@ from app.models.user_model import UserModel
 from app.repositories.user_repository import UserRepository
 from app.services.auth_service import AuthService
 from app.services.user_service import UserService
+from app.solvers.solver_executor import SolverExecutor
 from app.tests.factories.coordinates_factory import (
     CoordinatesRequestFactory,
 )
@@ -60,21 +63,47 @@ async def redis_client() -> AsyncGenerator[FakeAsyncRedis]:
 
 @pytest.fixture
 def client(
-    session: AsyncSession, redis_client: FakeAsyncRedis
+    engine: AsyncEngine, session: AsyncSession, redis_client: FakeAsyncRedis
 ) -> Generator[TestClient]:
     def get_session_overdrive() -> AsyncSession:
         return session
 
+    def get_session_maker_override() -> async_sessionmaker[AsyncSession]:
+        return async_sessionmaker(engine, expire_on_commit=False)
+
     def get_cache_client_override() -> FakeAsyncRedis:
         return redis_client
 
     with TestClient(app) as client:
         app.dependency_overrides[get_session] = get_session_overdrive
+        app.dependency_overrides[get_session_maker] = (
+            get_session_maker_override
+        )
         app.dependency_overrides[get_cache_client] = get_cache_client_override
         yield client
         app.dependency_overrides.clear()
 
 
+@pytest_asyncio.fixture
+async def solver_executor() -> AsyncGenerator[SolverExecutor]:
+    executor = SolverExecutor(workers=1, queue_size=0, max_solves_per_worker=2)
+    await executor.start()
+    yield executor
+    await executor.shutdown()
+
+
+@pytest.fixture
+def duration_matrix() -> list[list[float]]:
+    return [
+        [0, 189.4, 59.5, 177.5, 40.5, 171.4],
+        [189.4, 0, 200.4, 318.4, 303.3, 312.3],
+        [59.5, 200.4, 0, 118, 102.9, 111.9],
+        [177.5, 318.4, 118, 0, 172, 181],
+        [40.5, 303.3, 102.9, 172, 0, 208.1],
+        [171.4, 312.3, 111.9, 181, 208.1, 0],
+    ]
+
+
 @pytest.fixture
 def path_request() -> dict:
     return PathRequestFactory.build()
@@ -89,27 +118,33 @@ def wrong_path_request() -> dict:
 
 @pytest.fixture
 def osrm_response(respx_mock: MockRouter) -> Route:
-    response = {
-        'code': 'Ok',
-        'durations': [
+    durations = np.array(
+        [
             [0, 189.4, 59.5, 177.5, 40.5, 171.4],
             [262.8, 0, 200.4, 318.4, 303.3, 312.3],
             [62.4, 190, 0, 118, 102.9, 111.9],
             [131.5, 320.9, 191, 0, 172, 181],
             [158.6, 213.8, 96.2, 214.2, 0, 208.1],
             [61.8, 251.2, 121.3, 130.6, 102.3, 0],
-        ],
-        'distances': [
-            [0, 1668.7, 970.9, 2093.5, 281, 2452.6],
-            [2556.4, 0, 1635.4, 2758, 2837.4, 3117.2],
-            [921, 1333.7, 0, 1122.5, 1202, 1481.7],
-            [1024.1, 2692.8, 1995, 0, 1305.1, 1584.8],
-            [1821.1, 1378.7, 900.1, 2022.6, 0, 2381.8],
-            [914.7, 2583.4, 1885.7, 1306.5, 1195.8, 0],
-        ],
-    }
+        ]
+    )
+
+    def __table(request: Request) -> Response:
+        sources, destinations = (
+            np.array(request.url.params[param].split(';'), dtype=int)
+            % len(durations)
+            for param in ('sources', 'destinations')
+        )
+        return Response(
+            HTTPStatus.OK,
+            json={
+                'code': 'Ok',
+                'durations': durations[np.ix_(sources, destinations)].tolist(),
+            },
+        )
+
     return respx_mock.get(url__startswith=settings.OSRM_URL).mock(
-        return_value=Response(HTTPStatus.OK, json=response)
+        side_effect=__table
     )
 
 
@@ -0,0 +1,295 @@
+import asyncio
+from http import HTTPStatus
+from itertools import combinations
+from pathlib import Path
+from uuid import uuid4
+
+import httpx
+import numpy as np
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from fakeredis import FakeAsyncRedis
+from h3 import cell_to_latlng, latlng_to_cell
+from respx import MockRouter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.circuit_breaker import CircuitBreaker, CircuitStateEnum
+from app.core.settings import settings
+from app.repositories.cache_repository import CacheRepository
+from app.repositories.matrix_repository import MatrixRepository
+from app.repositories.osrm_repository import OSRMRepository
+from app.repositories.path_repository import PathRepository
+from app.schemas.coordinates_schema import CoordinatesBase
+from app.services.cache_service import CacheService
+from app.services.cache_warming_service import CacheWarmingService
+from app.services.distance_service import DistanceService
+from app.tests.factories.coordinates_factory import CoordinatesRequestFactory
+from app.tests.test_osrm import osrm_table
+from app.workers.matrix_builder import build_matrix, get_service_area
+
+
+class TestDistanceService:
+    STOPS = 6
+    BURST = 5
+    LEADER_COST = 42.0
+    BREAKER_MIN_CALLS = 2
+    AREA_RINGS = 2
+
+    @staticmethod
+    def make_coords(stops: int) -> list[CoordinatesBase]:
+        return [
+            CoordinatesBase.model_validate(CoordinatesRequestFactory())
+            for _ in range(stops)
+        ]
+
+    @staticmethod
+    def make_cells(coords: list[CoordinatesBase]) -> list[str]:
+        return [
+            latlng_to_cell(coord.lat, coord.lng, settings.H3_RESOLUTION)
+            for coord in coords
+        ]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_fetch(
+        self, respx_mock: MockRouter, redis_client: FakeAsyncRedis
+    ) -> None:
+        route = respx_mock.get(url__startswith=settings.OSRM_URL).mock(
+            side_effect=osrm_table
+        )
+        coords = self.make_coords(self.STOPS)
+        cells = self.make_cells(coords)
+        pairs = list(combinations(range(self.STOPS), 2))
+
+        async with httpx.AsyncClient(base_url=settings.OSRM_URL) as client:
+            services = [
+                DistanceService(
+                    CacheService(CacheRepository(redis_client)),
+                    OSRMRepository(client),
+                )
+                for _ in range(self.BURST)
+            ]
+            results = await asyncio.gather(
+                *(
+                    service.get_pairs_cost(coords, cells, pairs)
+                    for service in services
+                )
+            )
+
+        assert route.call_count == 1
+        assert all(result == results[0] for result in results)
+        assert not DistanceService._in_flight  # noqa: SLF001
+
+    @pytest.mark.asyncio
+    async def test_follower_waits_for_leased_pairs(
+        self,
+        respx_mock: MockRouter,
+        redis_client: FakeAsyncRedis,
+        monkeypatch: MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(settings, 'DISTANCE_LEASE_POLL_SECONDS', 0.01)
+        route = respx_mock.get(url__startswith=settings.OSRM_URL).mock(
+            side_effect=osrm_table
+        )
+        cache = CacheService(CacheRepository(redis_client))
+        coords = self.make_coords(2)
+        cells = self.make_cells(coords)
+        first_cell, second_cell = sorted(cells)
+        key = f'dist:{first_cell}:{second_cell}'
+        await cache.acquire_many(
+            'dist_lease', [key], settings.DISTANCE_LEASE_TTL_MS
+        )
+
+        async def __leader_writes() -> None:
+            await asyncio.sleep(0.05)
+            await cache.set_many('dist', [key], [str(self.LEADER_COST)])
+            await cache.delete_many('dist_lease', [key])
+
+        async with httpx.AsyncClient(base_url=settings.OSRM_URL) as client:
+            service = DistanceService(cache, OSRMRepository(client))
+            pairs_cost, _ = await asyncio.gather(
+                service.get_pairs_cost(coords, cells, [(0, 1)]),
+                __leader_writes(),
+            )
+
+        assert pairs_cost.costs == {(0, 1): self.LEADER_COST}
+        assert not pairs_cost.estimated
+        assert route.call_count == 0
+
+    @pytest.mark.asyncio
+    async def test_estimates_while_osrm_is_unavailable(
+        self,
+        respx_mock: MockRouter,
+        redis_client: FakeAsyncRedis,
+        monkeypatch: MonkeyPatch,
+    ) -> None:
+        breaker = CircuitBreaker(
+            'osrm',
+            window=self.BREAKER_MIN_CALLS,
+            min_calls=self.BREAKER_MIN_CALLS,
+            failure_rate=0.5,
+            slow_call_ms=settings.OSRM_BREAKER_SLOW_CALL_MS,
+            slow_call_rate=1.0,
+            open_seconds=settings.OSRM_BREAKER_OPEN_SECONDS,
+        )
+        monkeypatch.setattr(DistanceService, 'breaker', breaker)
+        route = respx_mock.get(url__startswith=settings.OSRM_URL).mock(
+            return_value=httpx.Response(HTTPStatus.SERVICE_UNAVAILABLE)
+        )
+        cache = CacheService(CacheRepository(redis_client))
+
+        async with httpx.AsyncClient(base_url=settings.OSRM_URL) as client:
+            service = DistanceService(cache, OSRMRepository(client))
+            for _ in range(self.BREAKER_MIN_CALLS + 1):
+                coords = self.make_coords(self.STOPS)
+                pairs_cost = await service.get_pairs_cost(
+                    coords,
+                    self.make_cells(coords),
+                    list(combinations(range(self.STOPS), 2)),
+                )
+                assert pairs_cost.estimated
+                assert all(cost > 0 for cost in pairs_cost.costs.values())
+
+        assert breaker.state == CircuitStateEnum.OPEN
+        assert route.call_count == self.BREAKER_MIN_CALLS
+        assert not await redis_client.keys('dist:*')
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_trip_breaker(
+        self,
+        respx_mock: MockRouter,
+        redis_client: FakeAsyncRedis,
+        monkeypatch: MonkeyPatch,
+    ) -> None:
+        breaker = CircuitBreaker(
+            'osrm',
+            window=self.BREAKER_MIN_CALLS,
+            min_calls=self.BREAKER_MIN_CALLS,
+            failure_rate=0.5,
+            slow_call_ms=settings.OSRM_BREAKER_SLOW_CALL_MS,
+            slow_call_rate=1.0,
+            open_seconds=settings.OSRM_BREAKER_OPEN_SECONDS,
+        )
+        monkeypatch.setattr(DistanceService, 'breaker', breaker)
+        route = respx_mock.get(url__startswith=settings.OSRM_URL).mock(
+            return_value=httpx.Response(HTTPStatus.BAD_REQUEST)
+        )
+        cache = CacheService(CacheRepository(redis_client))
+
+        async with httpx.AsyncClient(base_url=settings.OSRM_URL) as client:
+            service = DistanceService(cache, OSRMRepository(client))
+            for _ in range(self.BREAKER_MIN_CALLS + 1):
+                coords = self.make_coords(self.STOPS)
+                with pytest.raises(httpx.HTTPStatusError):
+                    await service.get_pairs_cost(
+                        coords,
+                        self.make_cells(coords),
+                        list(combinations(range(self.STOPS), 2)),
+                    )
+
+        assert breaker.state == CircuitStateEnum.CLOSED
+        assert route.call_count == self.BREAKER_MIN_CALLS + 1
+        assert not await redis_client.keys('dist*')
+
+    @pytest.mark.asyncio
+    async def test_precomputed_matrix_skips_cache_and_osrm(
+        self,
+        respx_mock: MockRouter,
+        redis_client: FakeAsyncRedis,
+        tmp_path: Path,
+    ) -> None:
+        route = respx_mock.get(url__startswith=settings.OSRM_URL).mock(
+            side_effect=osrm_table
+        )
+        cells = get_service_area(-20.85, -41.12, self.AREA_RINGS)
+        async with httpx.AsyncClient(base_url=settings.OSRM_URL) as client:
+            durations = await build_matrix(OSRMRepository(client), cells)
+            MatrixRepository.save(tmp_path, cells, durations)
+            route.reset()
+
+            coords = [
+                CoordinatesBase(lat=lat, lng=lng)
+                for lat, lng in (cell_to_latlng(cell) for cell in cells)
+            ]
+            pairs = list(combinations(range(len(cells)), 2))
+            service = DistanceService(
+                CacheService(CacheRepository(redis_client)),
+                OSRMRepository(client),
+                MatrixRepository.load(tmp_path),
+            )
+            pairs_cost = await service.get_pairs_cost(
+                coords, self.make_cells(coords), pairs
+            )
+
+        rows, columns = np.asarray(pairs).T
+        assert (
+            list(pairs_cost.costs.values())
+            == np.rint(durations[rows, columns]).tolist()
+        )
+        assert not pairs_cost.estimated
+        assert route.call_count == 0
+        assert not await redis_client.keys('*')
+
+
+class TestCacheWarmingService:
+    BATCH_PAIRS = 2
+
+    def test_frequent_pairs_rank_co_occurring_cells(self) -> None:
+        first, second, third = [uuid4() for _ in range(3)]
+        stops = [
+            (first, -20.85, -41.12),
+            (first, -20.86, -41.13),
+            (second, -20.85, -41.12),
+            (second, -20.86, -41.13),
+            (second, -20.87, -41.14),
+            (third, -20.85, -41.12),
+        ]
+
+        pairs = CacheWarmingService.get_frequent_pairs(stops)
+
+        frequent_pair = tuple(
+            sorted(
+                latlng_to_cell(lat, lng, settings.H3_RESOLUTION)
+                for _, lat, lng in stops[:2]
+            )
+        )
+        assert pairs[0] == frequent_pair
+        assert len(pairs) == len(set(pairs)) == len(stops) // 2
+
+    @pytest.mark.asyncio
+    async def test_warm_pairs_loads_cache_in_batches(
+        self,
+        respx_mock: MockRouter,
+        redis_client: FakeAsyncRedis,
+        monkeypatch: MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(
+            settings, 'CACHE_WARMING_BATCH_PAIRS', self.BATCH_PAIRS
+        )
+        monkeypatch.setattr(settings, 'CACHE_WARMING_BATCHES_PER_SECOND', 1e3)
+        route = respx_mock.get(url__startswith=settings.OSRM_URL).mock(
+            side_effect=osrm_table
+        )
+        cells = get_service_area(-20.85, -41.12, 1)
+        pairs = list(combinations(cells, 2))[: self.BATCH_PAIRS * 3]
+
+        async with httpx.AsyncClient(base_url=settings.OSRM_URL) as client:
+            service = CacheWarmingService(
+                PathRepository(AsyncSession()),
+                DistanceService(
+                    CacheService(CacheRepository(redis_client)),
+                    OSRMRepository(client),
+                ),
+            )
+            warmed = await service.warm_pairs(pairs)
+
+        assert warmed == len(pairs)
+        assert route.call_count == len(pairs) // self.BATCH_PAIRS
+        keys = await redis_client.keys('dist:*')
+        assert len(keys) == len(pairs)
+        for key in keys:
+            ttl = await redis_client.ttl(key)
+            assert (
+                settings.DISTANCE_CACHE_TTL_SECONDS
+                < ttl
+                <= settings.CACHE_WARMING_TTL_SECONDS
+            )
@@ -0,0 +1,185 @@
+import asyncio
+from http import HTTPStatus
+from unittest.mock import MagicMock
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from fakeredis import FakeAsyncRedis
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from uuid6 import uuid7
+
+from app.core.job_manager import JobManager
+from app.core.settings import settings
+from app.repositories.cache_repository import CacheRepository
+from app.repositories.haversine_repository import HaversineRepository
+from app.schemas.job_schema import JobStatusEnum
+from app.schemas.path_schema import PathCreate
+from app.services.cache_service import CacheService
+from app.services.distance_service import DistanceService
+from app.services.job_service import JobService
+from app.solvers.solver_executor import SolverExecutor
+from app.tests.factories.user_factory import UserFactory
+
+
+class TestJobs:
+    BASE_URI = '/api/v1/paths/jobs'
+
+    @pytest.mark.usefixtures('osrm_response')
+    def test_create_job_sucessful(
+        self,
+        client: TestClient,
+        access_token: str,
+        path_request: dict,
+    ) -> None:
+        response = client.post(
+            self.BASE_URI,
+            headers={'Authorization': f'Bearer {access_token}'},
+            json=path_request,
+        )
+        data = response.json()
+
+        assert response.status_code == HTTPStatus.ACCEPTED
+        assert data['status'] in {'queued', 'running', 'succeeded'}
+        assert data['result'] is None
+
+    @pytest.mark.usefixtures('osrm_response')
+    def test_stream_job_events_until_finished(
+        self,
+        client: TestClient,
+        access_token: str,
+        path_request: dict,
+    ) -> None:
+        headers = {'Authorization': f'Bearer {access_token}'}
+        job = client.post(
+            self.BASE_URI, headers=headers, json=path_request
+        ).json()
+
+        with client.stream(
+            'GET', f'{self.BASE_URI}/{job["id"]}/events', headers=headers
+        ) as response:
+            events = [
+                line.removeprefix('event: ')
+                for line in response.iter_lines()
+                if line.startswith('event: ')
+            ]
+        finished_job = client.get(
+            f'{self.BASE_URI}/{job["id"]}', headers=headers
+        ).json()
+
+        assert response.status_code == HTTPStatus.OK
+        assert events[-1] == 'succeeded'
+        assert finished_job['status'] == 'succeeded'
+        assert len(finished_job['result']['dropoff']) == len(
+            path_request['dropoff']
+        )
+
+    def test_create_job_with_invalid_path(
+        self,
+        client: TestClient,
+        access_token: str,
+        wrong_path_request: dict,
+    ) -> None:
+        response = client.post(
+            self.BASE_URI,
+            headers={'Authorization': f'Bearer {access_token}'},
+            json=wrong_path_request,
+        )
+
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    def test_get_job_should_return_not_found(
+        self, client: TestClient, access_token: str
+    ) -> None:
+        response = client.get(
+            f'{self.BASE_URI}/{uuid7()}',
+            headers={'Authorization': f'Bearer {access_token}'},
+        )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    @pytest.mark.usefixtures('osrm_response')
+    def test_should_error_when_get_job_of_other_user(
+        self,
+        client: TestClient,
+        access_tokens: tuple[str, str],
+        path_request: dict,
+    ) -> None:
+        first_token, second_token = access_tokens
+        job = client.post(
+            self.BASE_URI,
+            headers={'Authorization': f'Bearer {first_token}'},
+            json=path_request,
+        ).json()
+
+        response = client.get(
+            f'{self.BASE_URI}/{job["id"]}',
+            headers={'Authorization': f'Bearer {second_token}'},
+        )
+
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+class TestJobService:
+    HEARTBEAT_SECONDS = 0.05
+
+    @pytest.fixture
+    def service(
+        self,
+        redis_client: FakeAsyncRedis,
+        solver_executor: SolverExecutor,
+        monkeypatch: MonkeyPatch,
+    ) -> JobService:
+        monkeypatch.setattr(
+            settings, 'JOB_EVENTS_HEARTBEAT_SECONDS', self.HEARTBEAT_SECONDS
+        )
+        cache = CacheService(CacheRepository(redis_client))
+        service = JobService(
+            cache,
+            solver_executor,
+            async_sessionmaker(),
+            DistanceService(cache, HaversineRepository()),
+        )
+
+        async def __create_path(*_: object) -> None:
+            await asyncio.sleep(60)
+
+        path_service = MagicMock(create_path=__create_path)
+        monkeypatch.setattr(
+            service, '_create_path_service', lambda _: path_service
+        )
+        return service
+
+    @pytest.mark.asyncio
+    async def test_cancelled_job_is_marked_failed(
+        self, service: JobService, path_request: dict
+    ) -> None:
+        user = UserFactory.build(id=uuid7())
+        job = await service.create_job(user, PathCreate(**path_request))
+        await asyncio.sleep(self.HEARTBEAT_SECONDS)
+        await JobManager.close()
+
+        stored_job = await service.get_job(job.id, user)
+        assert stored_job.status == JobStatusEnum.FAILED
+        assert stored_job.error == {
+            'error': 'CancelledError',
+            'detail': 'job interrupted, submit it again',
+        }
+
+    @pytest.mark.asyncio
+    async def test_events_end_when_job_is_lost(
+        self,
+        service: JobService,
+        redis_client: FakeAsyncRedis,
+        path_request: dict,
+    ) -> None:
+        user = UserFactory.build(id=uuid7())
+        job = await service.create_job(user, PathCreate(**path_request))
+        events = []
+        async for event in service.stream_job_events(job.id, user):
+            events.append(event)
+            await redis_client.delete(f'job:{job.id}')
+        await JobManager.close()
+
+        assert events[0].startswith('event: ')
+        assert events[-1].startswith('event: error')
@@ -0,0 +1,118 @@
+from http import HTTPStatus
+
+import httpx
+import numpy as np
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from pydantic import ValidationError
+from respx import MockRouter
+
+from app.core.settings import _Settings, settings
+from app.repositories.osrm_repository import OSRMRepository
+from app.schemas.coordinates_schema import CoordinatesBase
+from app.tests.factories.coordinates_factory import CoordinatesRequestFactory
+
+
+def osrm_table(request: httpx.Request) -> httpx.Response:
+    locations = request.url.path.split('/')[-1].split(';')
+    points = np.array(
+        [
+            [float(value) for value in location.split(',')]
+            for location in locations
+        ]
+    )
+    sources = [int(i) for i in request.url.params['sources'].split(';')]
+    destinations = [
+        int(i) for i in request.url.params['destinations'].split(';')
+    ]
+    durations = np.abs(points[sources, None] - points[None, destinations])
+    return httpx.Response(
+        HTTPStatus.OK,
+        json={'code': 'Ok', 'durations': durations.sum(axis=-1).tolist()},
+    )
+
+
+class TestOSRMRepository:
+    STOPS = 7
+    TILE_SIZE = 3
+
+    @pytest.mark.asyncio
+    async def test_get_matrix_by_tiles(
+        self, respx_mock: MockRouter, monkeypatch: MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, 'OSRM_TABLE_TILE_SIZE', self.TILE_SIZE)
+        route = respx_mock.get(url__startswith=settings.OSRM_URL).mock(
+            side_effect=osrm_table
+        )
+        coords = [
+            CoordinatesBase.model_validate(CoordinatesRequestFactory())
+            for _ in range(self.STOPS)
+        ]
+        sources = list(range(self.STOPS - 1))
+        destinations = list(range(1, self.STOPS))
+
+        async with httpx.AsyncClient(base_url=settings.OSRM_URL) as client:
+            matrix = await OSRMRepository(client).get_matrix(
+                coords, sources, destinations
+            )
+
+        points = np.array([[coord.lng, coord.lat] for coord in coords])
+        expected = np.abs(
+            points[sources, None] - points[None, destinations]
+        ).sum(axis=-1)
+        tiles = -(-len(sources) // self.TILE_SIZE) * -(
+            -len(destinations) // self.TILE_SIZE
+        )
+        assert matrix == pytest.approx(expected)
+        assert route.call_count == tiles
+        assert all(
+            len(call.request.url.path.split(';')) <= 2 * self.TILE_SIZE
+            for call in route.calls
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_pairs_cost_fetches_only_missing_block(
+        self, respx_mock: MockRouter
+    ) -> None:
+        route = respx_mock.get(url__startswith=settings.OSRM_URL).mock(
+            side_effect=osrm_table
+        )
+        coords = [
+            CoordinatesBase.model_validate(CoordinatesRequestFactory())
+            for _ in range(self.STOPS)
+        ]
+        new_stop = self.STOPS - 1
+        pairs = [
+            pair
+            for stop in range(new_stop)
+            for pair in ((stop, new_stop), (new_stop, stop))
+        ]
+
+        async with httpx.AsyncClient(base_url=settings.OSRM_URL) as client:
+            costs = await OSRMRepository(client).get_pairs_cost(coords, pairs)
+
+        points = np.array([[coord.lng, coord.lat] for coord in coords])
+        rows, columns = np.asarray(pairs).T
+        expected = np.abs(points[rows] - points[columns]).sum(axis=-1)
+        assert costs == pytest.approx(expected)
+        assert route.call_count == 1
+        params = route.calls[0].request.url.params
+        assert params['sources'].count(';') == 0
+        assert params['destinations'].count(';') == new_stop - 1
+
+    def test_plan_blocks_covers_clique_with_one_block(self) -> None:
+        missing = ~np.eye(self.STOPS, dtype=bool)
+
+        blocks = OSRMRepository.plan_blocks(missing)
+
+        assert blocks == [
+            (list(range(self.STOPS)), list(range(1, self.STOPS)))
+        ]
+
+    def test_settings_reject_http2_without_h2(
+        self, monkeypatch: MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr('app.core.settings.find_spec', lambda _: None)
+
+        with pytest.raises(ValidationError, match='h2'):
+            _Settings(OSRM_HTTP2=True)
@@ -1,11 +1,17 @@
 from http import HTTPStatus
 
 import pytest
+from _pytest.monkeypatch import MonkeyPatch
 from fastapi.testclient import TestClient
+from httpx import Response
+from respx import MockRouter, Route
 from uuid6 import uuid7
 
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.settings import settings
 from app.models.path_model import PathModel
 from app.schemas.path_schema import PathResponse
+from app.services.distance_service import DistanceService
 
 
 class TestPaths:
@@ -48,6 +54,347 @@ class TestPaths:
 
         assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
 
+    @pytest.mark.usefixtures('osrm_response')
+    def test_create_path_with_fast_quality(
+        self,
+        client: TestClient,
+        access_token: str,
+        path_request: dict,
+    ) -> None:
+        response = client.post(
+            self.BASE_URI,
+            headers={'Authorization': f'Bearer {access_token}'},
+            json={**path_request, 'quality': 'fast', 'max_solve_ms': 200},
+        )
+
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(response.json()['dropoff']) == len(path_request['dropoff'])
+
+    @pytest.mark.usefixtures('osrm_response')
+    def test_create_path_with_local_search_solver(
+        self,
+        client: TestClient,
+        access_token: str,
+        path_request: dict,
+    ) -> None:
+        response = client.post(
+            self.BASE_URI,
+            headers={'Authorization': f'Bearer {access_token}'},
+            json={**path_request, 'solver': 'local_search'},
+        )
+
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(response.json()['dropoff']) == len(path_request['dropoff'])
+
+    @pytest.mark.usefixtures('osrm_response')
+    def test_create_path_with_portfolio_solver(
+        self,
+        client: TestClient,
+        access_token: str,
+        path_request: dict,
+        monkeypatch: MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(settings, 'SOLVER_EXACT_MAX_STOPS', 0)
+        response = client.post(
+            self.BASE_URI,
+            headers={'Authorization': f'Bearer {access_token}'},
+            json={**path_request, 'solver': 'portfolio', 'max_solve_ms': 200},
+        )
+
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(response.json()['dropoff']) == len(path_request['dropoff'])
+
+    @pytest.mark.usefixtures('osrm_response')
+    def test_stream_path_sends_solutions_then_path(
+        self,
+        client: TestClient,
+        access_token: str,
+        path_request: dict,
+    ) -> None:
+        with client.stream(
+            'POST',
+            f'{self.BASE_URI}/stream',
+            headers={'Authorization': f'Bearer {access_token}'},
+            json={**path_request, 'solver': 'ortools', 'max_solve_ms': 200},
+        ) as response:
+            events = [
+                line.removeprefix('event: ')
+                for line in response.iter_lines()
+                if line.startswith('event: ')
+            ]
+
+        assert response.status_code == HTTPStatus.OK
+        assert events[0] == 'solution'
+        assert events[-1] == 'path'
+
+    @pytest.mark.usefixtures('osrm_response')
+    def test_create_path_by_clusters(
+        self,
+        client: TestClient,
+        access_token: str,
+        path_request: dict,
+        monkeypatch: MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(settings, 'SOLVER_DECOMPOSITION_MIN_STOPS', 2)
+        monkeypatch.setattr(settings, 'SOLVER_CLUSTER_MAX_STOPS', 2)
+        response = client.post(
+            self.BASE_URI,
+            headers={'Authorization': f'Bearer {access_token}'},
+            json=path_request,
+        )
+
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(response.json()['dropoff']) == len(path_request['dropoff'])
+
+    def test_create_path_reusing_cached_route(
+        self,
+        client: TestClient,
+        access_token: str,
+        path_request: dict,
+        osrm_response: Route,
+    ) -> None:
+        first_response = client.post(
+            self.BASE_URI,
+            headers={'Authorization': f'Bearer {access_token}'},
+            json=path_request,
+        )
+        osrm_calls = osrm_response.call_count
+        reversed_request = {
+            **path_request,
+            'dropoff': path_request['dropoff'][::-1],
+        }
+        second_response = client.post(
+            self.BASE_URI,
+            headers={'Authorization': f'Bearer {access_token}'},
+            json=reversed_request,
+        )
+
+        assert second_response.status_code == HTTPStatus.CREATED
+        assert osrm_response.call_count == osrm_calls
+        assert [
+            (dropoff['lat'], dropoff['lng'])
+            for dropoff in second_response.json()['dropoff']
+        ] == [
+            (dropoff['lat'], dropoff['lng'])
+            for dropoff in first_response.json()['dropoff']
+        ]
+
+    def test_stream_path_reusing_cached_route(
+        self,
+        client: TestClient,
+        access_token: str,
+        path_request: dict,
+        osrm_response: Route,
+    ) -> None:
+        client.post(
+            self.BASE_URI,
+            headers={'Authorization': f'Bearer {access_token}'},
+            json=path_request,
+        )
+        osrm_calls = osrm_response.call_count
+        with client.stream(
+            'POST',
+            f'{self.BASE_URI}/stream',
+            headers={'Authorization': f'Bearer {access_token}'},
+            json=path_request,
+        ) as response:
+            events = [
+                line.removeprefix('event: ')
+                for line in response.iter_lines()
+                if line.startswith('event: ')
+            ]
+
+        assert response.status_code == HTTPStatus.OK
+        assert events == ['path']
+        assert osrm_response.call_count == osrm_calls
+
+    def test_create_path_estimated_while_osrm_is_down(
+        self,
+        client: TestClient,
+        access_token: str,
+        path_request: dict,
+        respx_mock: MockRouter,
+        monkeypatch: MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(
+            DistanceService,
+            'breaker',
+            CircuitBreaker(
+                'osrm',
+                window=settings.OSRM_BREAKER_WINDOW,
+                min_calls=settings.OSRM_BREAKER_MIN_CALLS,
+                failure_rate=settings.OSRM_BREAKER_FAILURE_RATE,
+                slow_call_ms=settings.OSRM_BREAKER_SLOW_CALL_MS,
+                slow_call_rate=settings.OSRM_BREAKER_SLOW_CALL_RATE,
+                open_seconds=settings.OSRM_BREAKER_OPEN_SECONDS,
+            ),
+        )
+        respx_mock.get(url__startswith=settings.OSRM_URL).mock(
+            return_value=Response(HTTPStatus.SERVICE_UNAVAILABLE)
+        )
+        created = client.post(
+            self.BASE_URI,
+            headers={'Authorization': f'Bearer {access_token}'},
+            json=path_request,
+        )
+        fetched = client.get(
+            f'{self.BASE_URI}/{created.json()["id"]}',
+            headers={'Authorization': f'Bearer {access_token}'},
+        )
+
+        assert created.status_code == HTTPStatus.CREATED
+        assert created.json()['estimated']
+        assert fetched.json()['estimated']
+
+    def test_create_path_merging_coincident_dropoffs(
+        self,
+        client: TestClient,
+        access_token: str,
+        path_request: dict,
+        osrm_response: Route,
+    ) -> None:
+        duplicated = path_request['dropoff'][0]
+        request = {
+            **path_request,
+            'dropoff': [*path_request['dropoff'], duplicated],
+        }
+
+        response = client.post(
+            self.BASE_URI,
+            headers={'Authorization': f'Bearer {access_token}'},
+            json=request,
+        )
+
+        locations = osrm_response.calls.last.request.url.path.split('/')[-1]
+        dropoff = [
+            (stop['lat'], stop['lng']) for stop in response.json()['dropoff']
+        ]
+        positions = [
+            position
+            for position, stop in enumerate(dropoff)
+            if stop == (duplicated['lat'], duplicated['lng'])
+        ]
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(dropoff) == len(request['dropoff'])
+        assert len(locations.split(';')) == len(path_request['dropoff']) + 1
+        assert positions[1] == positions[0] + 1
+
+    def test_create_path_with_invalid_quality(
+        self,
+        client: TestClient,
+        access_token: str,
+        path_request: dict,
+    ) -> None:
+        response = client.post(
+            self.BASE_URI,
+            headers={'Authorization': f'Bearer {access_token}'},
+            json={**path_request, 'quality': 'perfect'},
+        )
+
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    @pytest.mark.usefixtures('osrm_response')
+    def test_create_path_with_time_windows(
+        self,
+        client: TestClient,
+        access_token: str,
+        path_request: dict,
+    ) -> None:
+        window = {'start_seconds': 0, 'end_seconds': 3600}
+        path_request['dropoff'][0] |= {
+            'time_window': window,
+            'service_seconds': 60,
+        }
+        response = client.post(
+            self.BASE_URI,
+            headers={'Authorization': f'Bearer {access_token}'},
+            json=path_request,
+        )
+        data = response.json()
+
+        assert response.status_code == HTTPStatus.CREATED
+        assert data['dropped'] == []
+        assert all(
+            dropoff['arrival_seconds'] is not None
+            for dropoff in data['dropoff']
+        )
+
+    @pytest.mark.usefixtures('osrm_response')
+    def test_create_path_with_infeasible_time_window(
+        self,
+        client: TestClient,
+        access_token: str,
+        path_request: dict,
+    ) -> None:
+        window = {'start_seconds': 0, 'end_seconds': 0}
+        path_request['dropoff'][0]['time_window'] = window
+        response = client.post(
+            self.BASE_URI,
+            headers={'Authorization': f'Bearer {access_token}'},
+            json=path_request,
+        )
+
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    @pytest.mark.usefixtures('osrm_response')
+    def test_create_path_dropping_infeasible_time_window(
+        self,
+        client: TestClient,
+        access_token: str,
+        path_request: dict,
+    ) -> None:
+        window = {'start_seconds': 0, 'end_seconds': 0}
+        path_request['dropoff'][0]['time_window'] = window
+        response = client.post(
+            self.BASE_URI,
+            headers={'Authorization': f'Bearer {access_token}'},
+            json={**path_request, 'drop_infeasible': True},
+        )
+        data = response.json()
+
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(data['dropped']) == 1
+        assert len(data['dropoff']) == len(path_request['dropoff']) - 1
+
+    @pytest.mark.usefixtures('osrm_response')
+    def test_create_fleet_paths_sucessful(
+        self,
+        client: TestClient,
+        access_token: str,
+        path_request: dict,
+    ) -> None:
+        vehicles = [{'capacity': 3}, {'capacity': 3, 'max_route_seconds': 900}]
+        response = client.post(
+            f'{self.BASE_URI}/fleet',
+            headers={'Authorization': f'Bearer {access_token}'},
+            json={**path_request, 'vehicles': vehicles},
+        )
+        data = response.json()['data']
+
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(data) == len(vehicles)
+        assert sum(len(path['dropoff']) for path in data) == len(
+            path_request['dropoff']
+        )
+        assert all(
+            len(path['dropoff']) <= vehicle['capacity']
+            for path, vehicle in zip(data, vehicles, strict=True)
+        )
+
+    def test_create_fleet_paths_without_enough_capacity(
+        self,
+        client: TestClient,
+        access_token: str,
+        path_request: dict,
+    ) -> None:
+        response = client.post(
+            f'{self.BASE_URI}/fleet',
+            headers={'Authorization': f'Bearer {access_token}'},
+            json={**path_request, 'vehicles': [{'capacity': 1}]},
+        )
+
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
     def test_get_paths_should_return_empty(
         self, client: TestClient, access_token: str
     ) -> None:
@@ -96,6 +443,95 @@ class TestPaths:
 
         assert response.status_code == HTTPStatus.NOT_FOUND
 
+    @pytest.mark.usefixtures('osrm_response')
+    def test_update_path_adding_dropoff(
+        self,
+        client: TestClient,
+        path: PathModel,
+        access_token: str,
+        path_request: dict,
+    ) -> None:
+        response = client.patch(
+            f'{self.BASE_URI}/{path.id}',
+            headers={'Authorization': f'Bearer {access_token}'},
+            json={'add': [path_request['pickup']]},
+        )
+        data = response.json()
+
+        assert response.status_code == HTTPStatus.OK
+        assert len(data['dropoff']) == len(path.dropoff) + 1
+        assert [dropoff['position'] for dropoff in data['dropoff']] == list(
+            range(len(path.dropoff) + 1)
+        )
+
+    @pytest.mark.usefixtures('osrm_response')
+    def test_update_path_completing_and_removing_dropoffs(
+        self, client: TestClient, path: PathModel, access_token: str
+    ) -> None:
+        completed, removed, *_ = path.dropoff
+        response = client.patch(
+            f'{self.BASE_URI}/{path.id}',
+            headers={'Authorization': f'Bearer {access_token}'},
+            json={
+                'complete': [str(completed.id)],
+                'remove': [str(removed.id)],
+            },
+        )
+        data = response.json()
+
+        assert response.status_code == HTTPStatus.OK
+        assert len(data['dropoff']) == len(path.dropoff) - 1
+        assert data['dropoff'][0]['id'] == str(completed.id)
+        assert data['dropoff'][0]['completed_at'] is not None
+        assert str(removed.id) not in {
+            dropoff['id'] for dropoff in data['dropoff']
+        }
+
+    @pytest.mark.usefixtures('osrm_response')
+    def test_update_path_with_time_windows(
+        self,
+        client: TestClient,
+        access_token: str,
+        path_request: dict,
+    ) -> None:
+        path_request['dropoff'][0] |= {
+            'time_window': {'start_seconds': 0, 'end_seconds': 3600},
+        }
+        path_id = client.post(
+            self.BASE_URI,
+            headers={'Authorization': f'Bearer {access_token}'},
+            json=path_request,
+        ).json()['id']
+        response = client.patch(
+            f'{self.BASE_URI}/{path_id}',
+            headers={'Authorization': f'Bearer {access_token}'},
+            json={'add': [path_request['pickup']]},
+        )
+
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    def test_update_path_with_unknown_dropoff(
+        self, client: TestClient, path: PathModel, access_token: str
+    ) -> None:
+        response = client.patch(
+            f'{self.BASE_URI}/{path.id}',
+            headers={'Authorization': f'Bearer {access_token}'},
+            json={'remove': [str(uuid7())]},
+        )
+
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    def test_update_path_should_return_not_found(
+        self, client: TestClient, access_token: str
+    ) -> None:
+        response = client.patch(
+            f'{self.BASE_URI}/{uuid7()}',
+            headers={'Authorization': f'Bearer {access_token}'},
+            json={'remove': [str(uuid7())]},
+        )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
     def test_should_delete_path_sucessful(
         self, client: TestClient, path: PathModel, access_token: str
     ) -> None:
@@ -146,3 +582,19 @@ class TestPaths:
         )
 
         assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_should_error_when_update_path_of_other_user(
+        self,
+        client: TestClient,
+        access_tokens: tuple[str, str],
+        paths: tuple[PathModel, PathModel],
+    ) -> None:
+        first_path, _ = paths
+        _, second_token = access_tokens
+        response = client.patch(
+            f'{self.BASE_URI}/{first_path.id}',
+            headers={'Authorization': f'Bearer {second_token}'},
+            json={'complete': [str(first_path.dropoff[0].id)]},
+        )
+
+        assert response.status_code == HTTPStatus.FORBIDDEN
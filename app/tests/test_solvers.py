@@ -0,0 +1,799 @@
+import asyncio
+from itertools import pairwise, permutations
+
+import numpy as np
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from fakeredis import FakeAsyncRedis
+from h3 import latlng_to_cell
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from pydantic import ValidationError
+
+from app.core.settings import _Settings, settings
+from app.exceptions.erros import ServiceUnavailableError
+from app.schemas.coordinates_schema import CoordinatesCreate
+from app.schemas.solver_schema import (
+    QualityEnum,
+    SolveOptions,
+    SolverEnum,
+    SolverResult,
+    SolverStrategy,
+    SolverTask,
+    SolverTaskResult,
+    StopConstraints,
+    TimeWindow,
+    VehicleConstraints,
+)
+from app.solvers.cluster_decomposer import ClusterDecomposer
+from app.solvers.held_karp_solver import HeldKarpSolver
+from app.solvers.local_search_solver import LocalSearchSolver
+from app.solvers.ortools_solver import ORToolsSolver, TransitModeEnum
+from app.solvers.remote_solver_executor import (
+    RemoteSolverExecutor,
+    make_result_key,
+)
+from app.solvers.route_schedule import RouteSchedule
+from app.solvers.solve_budget import SolveBudget
+from app.solvers.solve_scheduler import SolveScheduler
+from app.solvers.solver_dispatcher import SolverDispatcher
+from app.solvers.solver_executor import SolverExecutor
+from app.solvers.solver_portfolio import SolverPortfolio
+from app.solvers.stop_reducer import StopReducer
+from app.workers.solver import SolverWorker
+
+
+def tour_cost(matrix: list[list[float]], route: list[int]) -> float:
+    return sum(matrix[i][j] for i, j in pairwise([*route, route[0]]))
+
+
+class TestORToolsSolver:
+    TIME_LIMIT_MS = 5_000
+
+    def test_scale_matrix_keeps_sub_second_costs(self) -> None:
+        cost_matrix = ORToolsSolver.scale_matrix([[0, 0.4], [0.6, 0]], 100)
+
+        assert cost_matrix.tolist() == [[0, 40], [60, 0]]
+
+    @pytest.mark.parametrize('transit_mode', list(TransitModeEnum))
+    def test_solve_with_transit_mode(
+        self,
+        duration_matrix: list[list[float]],
+        transit_mode: TransitModeEnum,
+    ) -> None:
+        _, routing = ORToolsSolver.create_model(
+            ORToolsSolver.scale_matrix(duration_matrix),
+            transit_mode=transit_mode,
+        )
+        solution = routing.SolveWithParameters(
+            ORToolsSolver.create_search_parameters(time_limit_ms=500)
+        )
+
+        assert solution.ObjectiveValue() > 0
+
+    def test_solve_stops_early_when_stalled(
+        self, duration_matrix: list[list[float]]
+    ) -> None:
+        result = ORToolsSolver.solve(
+            duration_matrix,
+            SolveOptions(time_limit_ms=self.TIME_LIMIT_MS, stall_ms=100),
+        )
+
+        assert result.route[0] == 0
+        assert result.objective is not None
+        assert result.search_ms < self.TIME_LIMIT_MS
+
+    def test_solve_with_strategy(
+        self, duration_matrix: list[list[float]]
+    ) -> None:
+        strategy = SolverStrategy(
+            first_solution='SAVINGS', metaheuristic='TABU_SEARCH'
+        )
+        result = ORToolsSolver.solve(
+            duration_matrix,
+            SolveOptions(time_limit_ms=500, strategy=strategy),
+        )
+
+        assert sorted(result.route) == list(range(len(duration_matrix)))
+        assert result.strategy == 'SAVINGS:TABU_SEARCH'
+
+    def test_solve_publishes_improving_solutions(
+        self, duration_matrix: list[list[float]]
+    ) -> None:
+        solutions: list[SolverResult] = []
+
+        result = ORToolsSolver.solve(
+            duration_matrix,
+            SolveOptions(time_limit_ms=500),
+            on_solution=solutions.append,
+        )
+
+        objectives = [solution.objective or 0.0 for solution in solutions]
+        assert solutions
+        assert solutions[0].route[0] == 0
+        assert objectives == sorted(objectives, reverse=True)
+        assert objectives[-1] == pytest.approx(result.objective)
+
+    def test_solve_records_search_telemetry(
+        self, duration_matrix: list[list[float]]
+    ) -> None:
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+
+        with provider.get_tracer(__name__).start_as_current_span('solve'):
+            result = ORToolsSolver.solve(
+                duration_matrix, SolveOptions(time_limit_ms=500)
+            )
+
+        (span,) = exporter.get_finished_spans()
+        attributes = span.attributes or {}
+        improvements = [
+            event.attributes or {}
+            for event in span.events
+            if event.name == 'solver.improvement'
+        ]
+        solutions = attributes['solver.solutions']
+        first_solution_ms = attributes['solver.first_solution_ms']
+        best_solution_ms = attributes['solver.best_solution_ms']
+        assert isinstance(solutions, int)
+        assert isinstance(first_solution_ms, float)
+        assert isinstance(best_solution_ms, float)
+        assert attributes['solver.status'] == 'ROUTING_SUCCESS'
+        assert attributes['solver.improvements'] == len(improvements)
+        assert solutions >= len(improvements)
+        assert first_solution_ms <= best_solution_ms
+        assert improvements[-1]['solver.objective'] == pytest.approx(
+            result.objective
+        )
+
+    def test_solve_fleet_respects_capacities(
+        self, duration_matrix: list[list[float]]
+    ) -> None:
+        capacities = [2, 3]
+        result = ORToolsSolver.solve_fleet(
+            duration_matrix,
+            [VehicleConstraints(capacity=capacity) for capacity in capacities],
+            SolveOptions(time_limit_ms=500),
+        )
+
+        assert len(result.routes) == len(capacities)
+        assert all(route[0] == 0 for route in result.routes)
+        assert sorted(node for route in result.routes for node in route) == [
+            0,
+            0,
+            *range(1, len(duration_matrix)),
+        ]
+        assert all(
+            len(route) - 1 <= capacity
+            for route, capacity in zip(result.routes, capacities, strict=True)
+        )
+
+    def test_solve_fleet_without_feasible_solution(
+        self, duration_matrix: list[list[float]]
+    ) -> None:
+        result = ORToolsSolver.solve_fleet(
+            duration_matrix,
+            [VehicleConstraints(max_route_seconds=1)],
+            SolveOptions(time_limit_ms=500),
+        )
+
+        assert result.routes == []
+        assert result.objective is None
+
+    def test_solve_drops_stop_outside_time_window(
+        self, duration_matrix: list[list[float]]
+    ) -> None:
+        stops = [StopConstraints() for _ in duration_matrix]
+        stops[1] = StopConstraints(
+            time_window=TimeWindow(start_seconds=0, end_seconds=10)
+        )
+        stops[2] = StopConstraints(
+            time_window=TimeWindow(start_seconds=0, end_seconds=60)
+        )
+
+        result = ORToolsSolver.solve(
+            duration_matrix, SolveOptions(time_limit_ms=500), stops=stops
+        )
+
+        assert result.dropped == [1]
+        assert result.route[:2] == [0, 2]
+        assert sorted(result.route) == [0, 2, 3, 4, 5]
+
+    def test_reoptimize_from_initial_route(
+        self, duration_matrix: list[list[float]]
+    ) -> None:
+        initial_route = list(range(len(duration_matrix)))
+
+        result = ORToolsSolver.reoptimize(
+            duration_matrix,
+            initial_route,
+            SolveOptions(time_limit_ms=self.TIME_LIMIT_MS, stall_ms=100),
+        )
+
+        assert result.route[0] == 0
+        assert sorted(result.route) == initial_route
+        assert result.objective is not None
+        assert result.objective <= tour_cost(duration_matrix, initial_route)
+
+    def test_reoptimize_open_route_keeps_start(
+        self, duration_matrix: list[list[float]]
+    ) -> None:
+        start, *pending = [3, 1, 2, 4, 5]
+        result = ORToolsSolver.reoptimize(
+            duration_matrix,
+            [start, *pending],
+            SolveOptions(time_limit_ms=500),
+        )
+
+        assert result.route[0] == start
+        assert sorted(result.route[1:]) == sorted(pending)
+
+
+class TestRouteSchedule:
+    def test_arrival_seconds_waits_for_time_window(self) -> None:
+        stops = [
+            StopConstraints(service_seconds=5),
+            StopConstraints(
+                time_window=TimeWindow(start_seconds=100, end_seconds=200),
+                service_seconds=20,
+            ),
+            StopConstraints(),
+        ]
+
+        arrivals = RouteSchedule.arrival_seconds(
+            [[0, 10, 10], [10, 0, 30], [10, 30, 0]], [0, 1, 2], stops
+        )
+
+        assert arrivals == [0, 100, 150]
+
+    def test_arrival_seconds_from_legs_matches_matrix(
+        self, duration_matrix: list[list[float]]
+    ) -> None:
+        route = [0, 2, 4, 1, 3, 5]
+        stops = [StopConstraints(service_seconds=30) for _ in route]
+        legs = [duration_matrix[i][j] for i, j in pairwise(route)]
+
+        assert RouteSchedule.arrival_seconds_from_legs(
+            legs, route, stops
+        ) == RouteSchedule.arrival_seconds(duration_matrix, route, stops)
+
+
+class TestHeldKarpSolver:
+    def test_solve_returns_optimal_tour(
+        self, duration_matrix: list[list[float]]
+    ) -> None:
+        stops = range(1, len(duration_matrix))
+        optimal_cost = min(
+            tour_cost(duration_matrix, [0, *order])
+            for order in permutations(stops)
+        )
+
+        result = HeldKarpSolver.solve(duration_matrix)
+
+        assert result.route[0] == 0
+        assert result.objective == pytest.approx(optimal_cost)
+        assert tour_cost(duration_matrix, result.route) == pytest.approx(
+            optimal_cost
+        )
+
+
+class TestLocalSearchSolver:
+    def test_solve_matches_optimal_tour_on_small_instance(
+        self, duration_matrix: list[list[float]]
+    ) -> None:
+        optimal = HeldKarpSolver.solve(duration_matrix)
+
+        result = LocalSearchSolver.solve(duration_matrix)
+
+        assert result.route[0] == 0
+        assert sorted(result.route) == list(range(len(duration_matrix)))
+        assert result.objective == pytest.approx(optimal.objective)
+
+    def test_cheapest_insertion_keeps_existing_order(
+        self, duration_matrix: list[list[float]]
+    ) -> None:
+        route = LocalSearchSolver.cheapest_insertion(
+            np.asarray(duration_matrix), [0, 3, 1], [2, 4, 5]
+        )
+
+        assert sorted(route) == list(range(len(duration_matrix)))
+        assert [node for node in route if node in {0, 1, 3}] == [0, 3, 1]
+
+    def test_cheapest_insertion_on_open_route_keeps_ends(
+        self, duration_matrix: list[list[float]]
+    ) -> None:
+        route_start = 3
+        route = LocalSearchSolver.cheapest_insertion(
+            np.asarray(duration_matrix),
+            [route_start, 1, 0],
+            [2, 4, 5],
+            closed=False,
+        )
+
+        assert route[0] == route_start
+        assert route[-1] == 0
+
+
+class TestSolverDispatcher:
+    def test_dispatch_single_dropoff_without_search(self) -> None:
+        result = SolverDispatcher.solve([[0, 10], [12, 0]])
+
+        assert result.solver == 'trivial'
+        assert result.route == [0, 1]
+
+    def test_dispatch_small_instance_to_exact_solver(
+        self, duration_matrix: list[list[float]]
+    ) -> None:
+        result = SolverDispatcher.solve(duration_matrix)
+
+        assert result.solver == 'held_karp'
+
+    def test_dispatch_to_requested_solver(
+        self, duration_matrix: list[list[float]]
+    ) -> None:
+        result = SolverDispatcher.solve(
+            duration_matrix, SolveOptions(solver=SolverEnum.LOCAL_SEARCH)
+        )
+
+        assert result.solver == 'local_search'
+
+    def test_dispatch_large_instance_to_ortools(
+        self, duration_matrix: list[list[float]], monkeypatch: MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, 'SOLVER_EXACT_MAX_STOPS', 2)
+
+        result = SolverDispatcher.solve(
+            duration_matrix, SolveOptions(time_limit_ms=500)
+        )
+
+        assert result.solver == 'ortools'
+
+    def test_dispatch_time_windows_to_ortools(
+        self, duration_matrix: list[list[float]]
+    ) -> None:
+        stops = [StopConstraints() for _ in duration_matrix]
+        stops[1] = StopConstraints(
+            time_window=TimeWindow(start_seconds=0, end_seconds=600)
+        )
+
+        result = SolverDispatcher.solve(
+            duration_matrix, SolveOptions(time_limit_ms=500), stops
+        )
+
+        assert result.solver == 'ortools'
+        assert result.dropped == []
+
+
+class TestClusterDecomposer:
+    MAX_CLUSTER_SIZE = 2
+
+    def test_partition_bounds_cluster_size(self) -> None:
+        coords = [
+            CoordinatesCreate(lat=-20.858 + i * 0.01, lng=-41.120)
+            for i in range(7)
+        ]
+        cells = [
+            latlng_to_cell(coord.lat, coord.lng, settings.H3_RESOLUTION)
+            for coord in coords
+        ]
+
+        clusters = ClusterDecomposer.partition(
+            cells, range(1, len(coords)), self.MAX_CLUSTER_SIZE
+        )
+
+        assert all(len(c) <= self.MAX_CLUSTER_SIZE for c in clusters)
+        assert sorted(n for c in clusters for n in c) == list(range(1, 7))
+
+    def test_stitch_follows_cluster_order(self) -> None:
+        node_groups = [[0, 1, 4], [1, 2, 3], [4, 5]]
+
+        route = ClusterDecomposer.stitch(
+            node_groups, [[0, 2, 1], [0, 2, 1], [0, 1]]
+        )
+
+        assert route == [0, 4, 5, 1, 3, 2]
+
+
+class TestSolveBudget:
+    MAX_SOLVE_MS = 300
+
+    def test_budget_grows_with_instance_size(self) -> None:
+        small = SolveBudget.for_instance(4)
+        large = SolveBudget.for_instance(100)
+
+        assert small.time_limit_ms < large.time_limit_ms
+
+    def test_budget_follows_quality_tier(self) -> None:
+        fast = SolveBudget.for_instance(50, QualityEnum.FAST)
+        best = SolveBudget.for_instance(50, QualityEnum.BEST)
+
+        assert fast.time_limit_ms < best.time_limit_ms
+
+    def test_budget_respects_max_solve_ms(self) -> None:
+        options = SolveBudget.for_instance(
+            100, QualityEnum.BEST, max_solve_ms=self.MAX_SOLVE_MS
+        )
+
+        assert options.time_limit_ms == self.MAX_SOLVE_MS
+
+
+class TestSolverPortfolio:
+    def test_size_bucket_uses_smallest_fitting_limit(
+        self, monkeypatch: MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            settings, 'SOLVER_PORTFOLIO_SIZE_BUCKETS', [50, 10]
+        )
+
+        assert SolverPortfolio.size_bucket(10) == 'le_10'
+        assert SolverPortfolio.size_bucket(11) == 'le_50'
+        assert SolverPortfolio.size_bucket(51) == 'gt_50'
+
+    def test_pick_best_returns_lowest_objective(self) -> None:
+        results = [
+            SolverResult(route=[0, 1], objective=10, strategy='a:b'),
+            SolverResult(route=[0, 1], objective=5, strategy='c:d'),
+            SolverResult(route=[], search_ms=20),
+        ]
+
+        best = SolverPortfolio.pick_best(results)
+
+        assert best.strategy == 'c:d'
+        assert best.solver == 'portfolio'
+        assert best.search_ms == max(result.search_ms for result in results)
+
+
+class TestSolveScheduler:
+    async def _run_in_order(
+        self, scheduler: SolveScheduler, jobs: list[tuple[str, float]]
+    ) -> list[tuple[str, float]]:
+        order: list[tuple[str, float]] = []
+        release = asyncio.Event()
+
+        async def __hold(user: str) -> None:
+            async with scheduler.slot(user, 0):
+                await release.wait()
+
+        async def __run(user: str, cost: float) -> None:
+            async with scheduler.slot(user, cost):
+                order.append((user, cost))
+
+        holders = [
+            asyncio.create_task(__hold('a')) for _ in range(scheduler.slots)
+        ]
+        await asyncio.sleep(0)
+        waiters = []
+        for user, cost in jobs:
+            waiters.append(asyncio.create_task(__run(user, cost)))
+            await asyncio.sleep(0.001)
+        assert scheduler.depth == len(jobs)
+
+        release.set()
+        await asyncio.gather(*holders, *waiters)
+        return order
+
+    @pytest.mark.asyncio
+    async def test_runs_cheapest_solve_first(self) -> None:
+        scheduler = SolveScheduler(slots=1, aging_per_second=0)
+
+        order = await self._run_in_order(scheduler, [('b', 500), ('c', 5)])
+
+        assert order == [('c', 5), ('b', 500)]
+
+    @pytest.mark.asyncio
+    async def test_ages_waiting_solves(self) -> None:
+        scheduler = SolveScheduler(slots=1, aging_per_second=1e9)
+
+        order = await self._run_in_order(scheduler, [('b', 500), ('c', 5)])
+
+        assert order == [('b', 500), ('c', 5)]
+
+    @pytest.mark.asyncio
+    async def test_shares_slots_across_users(self) -> None:
+        scheduler = SolveScheduler(slots=2, aging_per_second=0)
+
+        order = await self._run_in_order(scheduler, [('a', 1), ('b', 500)])
+
+        assert order[0] == ('b', 500)
+        assert scheduler.depth == 0
+
+
+class TestStopReducer:
+    CELLS = ('pickup', 'a', 'b', 'a', 'c', 'b')
+
+    def test_reduce_groups_stops_in_the_same_cell(self) -> None:
+        reduction = StopReducer.reduce(self.CELLS)
+
+        assert reduction.groups == [[0], [1, 3], [2, 5], [4]]
+        assert reduction.nodes == [0, 1, 2, 1, 3, 2]
+        assert StopReducer.representatives(reduction) == [0, 1, 2, 4]
+
+    def test_reduce_without_merge_keeps_every_stop(self) -> None:
+        reduction = StopReducer.reduce(self.CELLS, merge=False)
+
+        assert not StopReducer.is_reduced(reduction)
+        assert reduction.nodes == list(range(len(self.CELLS)))
+
+    def test_expand_restores_merged_stops_in_place(self) -> None:
+        reduction = StopReducer.reduce(self.CELLS)
+        result = SolverResult(route=[0, 2, 3, 1], dropped=[], objective=1.0)
+
+        expanded = StopReducer.expand(reduction, result)
+
+        assert expanded.route == [0, 2, 5, 4, 1, 3]
+        assert expanded.objective == result.objective
+
+    def test_expand_matrix_gives_zero_cost_inside_groups(
+        self, duration_matrix: list[list[float]]
+    ) -> None:
+        reduction = StopReducer.reduce(self.CELLS)
+        reduced_matrix = [
+            [duration_matrix[i][j] for j in range(len(reduction.groups))]
+            for i in range(len(reduction.groups))
+        ]
+
+        matrix = StopReducer.expand_matrix(reduction, reduced_matrix)
+
+        assert len(matrix) == len(self.CELLS)
+        assert matrix[1][3] == 0
+        assert matrix[3][5] == reduced_matrix[1][2]
+
+
+class TestSolverExecutor:
+    @pytest.mark.asyncio
+    async def test_solve_in_worker_process(
+        self,
+        solver_executor: SolverExecutor,
+        duration_matrix: list[list[float]],
+    ) -> None:
+        result = await solver_executor.solve(
+            duration_matrix, SolveOptions(time_limit_ms=500)
+        )
+
+        assert result.route[0] == 0
+        assert sorted(result.route) == list(range(len(duration_matrix)))
+        assert solver_executor.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_solve_streaming_ends_with_final_result(
+        self,
+        solver_executor: SolverExecutor,
+        duration_matrix: list[list[float]],
+    ) -> None:
+        options = SolveOptions(time_limit_ms=500, solver=SolverEnum.ORTOOLS)
+
+        results = [
+            result
+            async for result in solver_executor.solve_streaming(
+                duration_matrix, options
+            )
+        ]
+
+        assert len(results) > 1
+        assert sorted(results[-1].route) == list(range(len(duration_matrix)))
+        assert results[-1].objective == pytest.approx(results[-2].objective)
+        assert solver_executor.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_abandoned_stream_holds_slot_until_worker_ends(
+        self,
+        solver_executor: SolverExecutor,
+        duration_matrix: list[list[float]],
+    ) -> None:
+        options = SolveOptions(time_limit_ms=500, solver=SolverEnum.ORTOOLS)
+        stream = solver_executor.solve_streaming(duration_matrix, options)
+
+        await anext(stream)
+        await stream.aclose()
+        await asyncio.sleep(0)
+
+        assert solver_executor.pending == 1
+        with pytest.raises(ServiceUnavailableError):
+            await solver_executor.solve(duration_matrix, options)
+        await asyncio.sleep(1)
+        assert solver_executor.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_run_task_keeps_remote_trace_context(
+        self,
+        solver_executor: SolverExecutor,
+        duration_matrix: list[list[float]],
+        monkeypatch: MonkeyPatch,
+    ) -> None:
+        carrier = {'traceparent': f'00-{"1" * 32}-{"2" * 16}-01'}
+        carriers = []
+
+        async def __run(
+            _: object, task_carrier: dict[str, str], *__: object
+        ) -> SolverResult:
+            carriers.append(task_carrier)
+            return SolverResult(route=[0])
+
+        monkeypatch.setattr(solver_executor, '_run', __run)
+        await solver_executor.run_task(
+            SolverTask(
+                function='_solve_in_worker',
+                carrier=carrier,
+                arguments=[duration_matrix, SolveOptions(time_limit_ms=500)],
+            )
+        )
+
+        assert carriers == [carrier]
+
+    @pytest.mark.asyncio
+    async def test_solve_portfolio_in_worker_processes(
+        self,
+        solver_executor: SolverExecutor,
+        duration_matrix: list[list[float]],
+    ) -> None:
+        strategies = SolverPortfolio.strategies()
+        options = SolveOptions(time_limit_ms=500, solver=SolverEnum.ORTOOLS)
+        result = await solver_executor.solve_portfolio(
+            duration_matrix, options, strategies
+        )
+
+        assert result.solver == 'portfolio'
+        assert result.strategy in {strategy.key for strategy in strategies}
+        assert solver_executor.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_solve_fleet_in_worker_process(
+        self,
+        solver_executor: SolverExecutor,
+        duration_matrix: list[list[float]],
+    ) -> None:
+        vehicles = [VehicleConstraints(capacity=3)] * 2
+        result = await solver_executor.solve_fleet(
+            duration_matrix, vehicles, SolveOptions(time_limit_ms=500)
+        )
+
+        assert len(result.routes) == len(vehicles)
+        assert solver_executor.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_raise_error_when_queue_is_full(
+        self,
+        solver_executor: SolverExecutor,
+        duration_matrix: list[list[float]],
+    ) -> None:
+        options = SolveOptions(time_limit_ms=500)
+        running = asyncio.create_task(
+            solver_executor.solve(duration_matrix, options)
+        )
+        await asyncio.sleep(0)
+
+        with pytest.raises(ServiceUnavailableError):
+            await solver_executor.solve(duration_matrix, options)
+        await running
+
+
+class TestSolverWorker:
+    CONSUMER = 'test-worker'
+    QUEUED_TASKS = 3
+
+    @pytest.mark.asyncio
+    async def test_remote_solve_runs_on_worker(
+        self,
+        redis_client: FakeAsyncRedis,
+        solver_executor: SolverExecutor,
+        duration_matrix: list[list[float]],
+    ) -> None:
+        remote_executor = RemoteSolverExecutor(
+            redis_client, slots=1, queue_size=0
+        )
+        worker = SolverWorker(
+            redis_client, solver_executor, self.CONSUMER, block_ms=None
+        )
+        running = asyncio.create_task(worker.run())
+
+        result = await remote_executor.solve(
+            duration_matrix, SolveOptions(time_limit_ms=500)
+        )
+        worker.stop()
+        await running
+
+        assert isinstance(result, SolverResult)
+        assert sorted(result.route) == list(range(len(duration_matrix)))
+        assert remote_executor.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_claim_task_left_by_dead_worker(
+        self,
+        redis_client: FakeAsyncRedis,
+        solver_executor: SolverExecutor,
+        duration_matrix: list[list[float]],
+        monkeypatch: MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(settings, 'SOLVER_TASK_CLAIM_IDLE_MS', 0)
+        task = SolverTask(
+            function='_solve_in_worker',
+            carrier={},
+            arguments=[duration_matrix, SolveOptions(time_limit_ms=500)],
+        )
+        worker = SolverWorker(
+            redis_client, solver_executor, self.CONSUMER, block_ms=None
+        )
+        await worker.create_group()
+        await redis_client.xadd(
+            settings.SOLVER_STREAM_KEY, {'task': task.model_dump_json()}
+        )
+        await redis_client.xreadgroup(
+            settings.SOLVER_STREAM_GROUP,
+            'dead-worker',
+            {settings.SOLVER_STREAM_KEY: '>'},
+        )
+
+        running = asyncio.create_task(worker.run())
+        _, response = await redis_client.blpop(  # pyright: ignore[reportGeneralTypeIssues]
+            [make_result_key(task.id)], timeout=10
+        )
+        worker.stop()
+        await running
+
+        task_result = SolverTaskResult.model_validate_json(response)
+        pending = await redis_client.xpending(
+            settings.SOLVER_STREAM_KEY, settings.SOLVER_STREAM_GROUP
+        )
+        assert task_result.error is None
+        assert task_result.result['route'][0] == 0
+        assert pending['pending'] == 0
+
+    @pytest.mark.asyncio
+    async def test_worker_reads_only_tasks_it_can_start(
+        self,
+        redis_client: FakeAsyncRedis,
+        solver_executor: SolverExecutor,
+        duration_matrix: list[list[float]],
+    ) -> None:
+        tasks = [
+            SolverTask(
+                function='_solve_in_worker',
+                carrier={},
+                arguments=[
+                    duration_matrix,
+                    SolveOptions(time_limit_ms=500, solver=SolverEnum.ORTOOLS),
+                ],
+            )
+            for _ in range(self.QUEUED_TASKS)
+        ]
+        worker = SolverWorker(
+            redis_client, solver_executor, self.CONSUMER, block_ms=None
+        )
+        await worker.create_group()
+        for task in tasks:
+            await redis_client.xadd(
+                settings.SOLVER_STREAM_KEY, {'task': task.model_dump_json()}
+            )
+
+        running = asyncio.create_task(worker.run())
+        await asyncio.sleep(0.1)
+        pending = await redis_client.xpending(
+            settings.SOLVER_STREAM_KEY, settings.SOLVER_STREAM_GROUP
+        )
+        for task in tasks:
+            await redis_client.blpop(  # pyright: ignore[reportGeneralTypeIssues]
+                [make_result_key(task.id)], timeout=10
+            )
+        worker.stop()
+        await running
+
+        assert pending['pending'] == solver_executor.workers
+
+    @pytest.mark.parametrize(
+        'overrides',
+        [
+            {'SOLVER_TASK_CLAIM_IDLE_MS': 180_000},
+            {'SOLVER_TASK_CLAIM_IDLE_MS': 5_000},
+            {'SOLVER_TASK_CLAIM_IDLE_MS': 20_000},
+            {'SOLVER_TASK_TIMEOUT_SECONDS': 5},
+        ],
+    )
+    def test_settings_reject_unordered_task_timeouts(
+        self, overrides: dict[str, int]
+    ) -> None:
+        with pytest.raises(ValidationError):
+            _Settings(**overrides)  # pyright: ignore[reportArgumentType]
@@ -0,0 +1,39 @@
+import asyncio
+
+from app.core.cache_manager import CacheManager
+from app.core.database import async_session_maker
+from app.core.distance_manager import DistanceManager, get_distance_provider
+from app.core.osrm_manager import OSRMManager
+from app.repositories.cache_repository import CacheRepository
+from app.repositories.osrm_repository import OSRMRepository
+from app.repositories.path_repository import PathRepository
+from app.services.cache_service import CacheService
+from app.services.cache_warming_service import CacheWarmingService
+from app.services.distance_service import DistanceService
+
+
+async def warm_cache() -> None:
+    distances = DistanceService(
+        CacheService(CacheRepository(CacheManager.get_client())),
+        get_distance_provider(OSRMRepository(OSRMManager.get_client())),
+        DistanceManager.get_matrix(),
+    )
+    async with async_session_maker() as session:
+        service = CacheWarmingService(PathRepository(session), distances)
+        await service.warm()
+
+
+async def main() -> None:
+    await CacheManager.init_session()
+    await OSRMManager.init_session()
+    DistanceManager.load_matrix()
+    try:
+        await warm_cache()
+    finally:
+        DistanceManager.close_matrix()
+        await OSRMManager.close_session()
+        await CacheManager.close_session()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+import argparse
+import asyncio
+from pathlib import Path
+
+import numpy as np
+from h3 import cell_to_latlng, grid_disk, latlng_to_cell
+
+from app.core.logger import get_logger
+from app.core.osrm_manager import OSRMManager
+from app.core.settings import settings
+from app.repositories.matrix_repository import MatrixRepository
+from app.repositories.osrm_repository import OSRMRepository
+from app.schemas.coordinates_schema import CoordinatesBase
+
+logger = get_logger(__name__)
+
+
+def get_service_area(lat: float, lng: float, rings: int) -> list[str]:
+    return sorted(
+        grid_disk(latlng_to_cell(lat, lng, settings.H3_RESOLUTION), rings)
+    )
+
+
+async def build_matrix(osrm: OSRMRepository, cells: list[str]) -> np.ndarray:
+    coords = [
+        CoordinatesBase(lat=lat, lng=lng)
+        for lat, lng in (cell_to_latlng(cell) for cell in cells)
+    ]
+    indexes = list(range(len(cells)))
+    return await osrm.get_matrix(coords, indexes, indexes)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='precompute the durations between a service area cells'
+    )
+    parser.add_argument('--lat', type=float, required=True)
+    parser.add_argument('--lng', type=float, required=True)
+    parser.add_argument('--rings', type=int, required=True)
+    parser.add_argument('--output', type=Path, required=True)
+    args = parser.parse_args()
+
+    cells = get_service_area(args.lat, args.lng, args.rings)
+    logger.info('building distance matrix', cells=len(cells))
+    await OSRMManager.init_session()
+    try:
+        durations = await build_matrix(
+            OSRMRepository(OSRMManager.get_client()), cells
+        )
+    finally:
+        await OSRMManager.close_session()
+
+    MatrixRepository.save(args.output, cells, durations)
+    logger.info(
+        'distance matrix saved',
+        cells=len(cells),
+        unreachable=int(np.isnan(durations).sum()),
+        path=str(args.output),
+    )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,172 @@
+import asyncio
+import os
+import signal
+import socket
+from functools import partial
+
+from pydantic import ValidationError
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from app.core.cache_manager import CacheManager
+from app.core.logger import get_logger
+from app.core.settings import settings
+from app.core.solver_manager import SolverBackendEnum, SolverManager
+from app.exceptions.erros import BaseError
+from app.schemas.solver_schema import SolverTask, SolverTaskResult
+from app.solvers.remote_solver_executor import make_result_key
+from app.solvers.solver_executor import SolverExecutor
+
+logger = get_logger(__name__)
+
+READ_BLOCK_MS = 1_000
+
+
+class SolverWorker:
+    def __init__(
+        self,
+        cache_client: Redis,
+        executor: SolverExecutor,
+        consumer: str,
+        block_ms: int | None = READ_BLOCK_MS,
+    ) -> None:
+        self.cache_client = cache_client
+        self.executor = executor
+        self.consumer = consumer
+        self.block_ms = block_ms
+        self._stopping = asyncio.Event()
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        await self.create_group()
+        logger.info('solver worker started', consumer=self.consumer)
+
+        while not self._stopping.is_set():
+            # only read what the pool can start now, waiting tasks stay in
+            # the stream instead of idling in this consumer pending list
+            free_slots = self.executor.workers - len(self._tasks)
+            if not free_slots:
+                await asyncio.wait(
+                    list(self._tasks.values()),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                continue
+            messages = await self._claim_stalled(free_slots)
+            messages = messages or await self._read_new(free_slots)
+            if not messages:
+                await asyncio.sleep(0)
+            for message_id, fields in messages:
+                task = asyncio.create_task(self._handle(message_id, fields))
+                self._tasks[message_id] = task
+                task.add_done_callback(partial(self._release, message_id))
+
+        await asyncio.gather(*self._tasks.values())
+        logger.info('solver worker stopped', consumer=self.consumer)
+
+    def _release(self, message_id: str, _: asyncio.Task) -> None:
+        del self._tasks[message_id]
+
+    async def create_group(self) -> None:
+        try:
+            await self.cache_client.xgroup_create(
+                settings.SOLVER_STREAM_KEY,
+                settings.SOLVER_STREAM_GROUP,
+                id='0',
+                mkstream=True,
+            )
+        except ResponseError as e:
+            if 'BUSYGROUP' not in str(e):
+                raise
+
+    async def _claim_stalled(
+        self, count: int
+    ) -> list[tuple[str, dict[str, str]]]:
+        _, messages, *_ = await self.cache_client.xautoclaim(
+            settings.SOLVER_STREAM_KEY,
+            settings.SOLVER_STREAM_GROUP,
+            self.consumer,
+            settings.SOLVER_TASK_CLAIM_IDLE_MS,
+            start_id='0-0',
+            count=count,
+        )
+        messages = [
+            (message_id, fields)
+            for message_id, fields in messages
+            if message_id not in self._tasks
+        ]
+        if messages:
+            logger.warning('stalled solver tasks claimed', tasks=len(messages))
+        return messages
+
+    async def _read_new(self, count: int) -> list[tuple[str, dict[str, str]]]:
+        streams = await self.cache_client.xreadgroup(
+            settings.SOLVER_STREAM_GROUP,
+            self.consumer,
+            {settings.SOLVER_STREAM_KEY: '>'},
+            count=count,
+            block=self.block_ms,
+        )
+        return [message for _, messages in streams for message in messages]
+
+    async def _handle(self, message_id: str, fields: dict[str, str]) -> None:
+        try:
+            task = SolverTask.model_validate_json(fields['task'])
+        except (KeyError, ValidationError):
+            logger.exception('invalid solver task', message_id=message_id)
+            await self._acknowledge(message_id)
+            return
+
+        try:
+            result = await self.executor.run_task(task)
+            task_result = SolverTaskResult(id=task.id, result=result)
+        except BaseError as e:
+            task_result = SolverTaskResult(id=task.id, error=str(e.message))
+        except Exception:
+            logger.exception('solver task failed', task_id=task.id)
+            task_result = SolverTaskResult(
+                id=task.id, error='solver task failed, try again later'
+            )
+
+        result_key = make_result_key(task.id)
+        pipe = self.cache_client.pipeline()
+        pipe.rpush(result_key, task_result.model_dump_json())
+        pipe.expire(result_key, settings.SOLVER_TASK_RESULT_TTL_SECONDS)
+        pipe.xack(
+            settings.SOLVER_STREAM_KEY,
+            settings.SOLVER_STREAM_GROUP,
+            message_id,
+        )
+        await pipe.execute()
+
+    async def _acknowledge(self, message_id: str) -> None:
+        await self.cache_client.xack(
+            settings.SOLVER_STREAM_KEY,
+            settings.SOLVER_STREAM_GROUP,
+            message_id,
+        )
+
+
+async def main() -> None:
+    await CacheManager.init_session()
+    await SolverManager.init_pool(SolverBackendEnum.LOCAL)
+    worker = SolverWorker(
+        CacheManager.get_client(),
+        SolverManager.get_executor(),
+        f'{socket.gethostname()}-{os.getpid()}',
+    )
+    loop = asyncio.get_running_loop()
+    for stop_signal in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(stop_signal, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await SolverManager.close_pool()
+        await CacheManager.close_session()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
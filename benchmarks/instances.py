@@ -0,0 +1,84 @@
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+SECONDS_PER_UNIT = 0.36
+CLUSTER_SPREAD = 40.0
+STOPS_PER_CLUSTER = 25
+
+TSPLIB_BEST_KNOWN = {
+    'eil51': 426,
+    'berlin52': 7542,
+    'st70': 675,
+    'eil76': 538,
+    'pr76': 108159,
+    'rat99': 1211,
+    'kroA100': 21282,
+    'kroB100': 22141,
+    'rd100': 7910,
+    'eil101': 629,
+    'lin105': 14379,
+    'ch130': 6110,
+    'ch150': 6528,
+    'kroA200': 29368,
+    'a280': 2579,
+    'lin318': 42029,
+    'pcb442': 50778,
+    'rat783': 8806,
+    'pr1002': 259045,
+    'pr2392': 378032,
+}
+
+
+class Instance(NamedTuple):
+    name: str
+    matrix: np.ndarray
+    reference: float | None = None
+
+
+def _distances(points: np.ndarray) -> np.ndarray:
+    return np.linalg.norm(points[:, None] - points[None, :], axis=-1)
+
+
+def uniform_instance(stops: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0, 1000, size=(stops, 2))
+    return _distances(points) * SECONDS_PER_UNIT
+
+
+def clustered_instance(
+    stops: int, seed: int = 0, clusters: int | None = None
+) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    clusters = clusters or max(1, stops // STOPS_PER_CLUSTER)
+    centers = rng.uniform(0, 1000, size=(clusters, 2))
+    members = rng.integers(0, clusters, size=stops)
+    points = centers[members] + rng.normal(0, CLUSTER_SPREAD, (stops, 2))
+    return _distances(points) * SECONDS_PER_UNIT
+
+
+def read_tsplib(path: Path) -> Instance:
+    specification: dict[str, str] = {}
+    coordinates: list[tuple[float, float]] = []
+    lines = iter(path.read_text().splitlines())
+    for line in lines:
+        if line.strip().startswith('NODE_COORD_SECTION'):
+            break
+        key, _, value = line.partition(':')
+        specification[key.strip()] = value.strip()
+
+    if specification.get('EDGE_WEIGHT_TYPE') != 'EUC_2D':
+        message = f'{path.name}: only EUC_2D instances are supported'
+        raise ValueError(message)
+
+    dimension = int(specification['DIMENSION'])
+    for line in lines:
+        if len(coordinates) == dimension or line.strip() == 'EOF':
+            break
+        _, x, y = line.split()
+        coordinates.append((float(x), float(y)))
+
+    name = specification.get('NAME', path.stem)
+    distances = np.floor(_distances(np.asarray(coordinates)) + 0.5)
+    return Instance(name, distances, TSPLIB_BEST_KNOWN.get(name))
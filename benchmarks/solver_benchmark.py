@@ -0,0 +1,267 @@
+import argparse
+import json
+import subprocess
+import time
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+
+import numpy as np
+
+from app.core.settings import settings
+from app.schemas.solver_schema import SolveOptions, SolverResult
+from app.solvers.held_karp_solver import HeldKarpSolver
+from app.solvers.local_search_solver import LocalSearchSolver
+from app.solvers.ortools_solver import ORToolsSolver
+from app.solvers.solve_budget import SolveBudget
+from app.solvers.solver_portfolio import SolverPortfolio
+from benchmarks.instances import (
+    Instance,
+    clustered_instance,
+    read_tsplib,
+    uniform_instance,
+)
+
+DEFAULT_SIZES = (5, 10, 12, 50, 100, 200, 500, 1000, 5000)
+LOCAL_SEARCH_CONSTRUCTIONS = ('nearest_neighbour', 'cheapest_insertion')
+TSPLIB_DIR = Path(__file__).parent / 'tsplib'
+
+type CurvePoint = tuple[float, float]
+type Configuration = Callable[
+    [list[list[float]], SolveOptions, Callable[[SolverResult], None]],
+    SolverResult,
+]
+
+
+def _solve_held_karp(
+    matrix: list[list[float]],
+    _: SolveOptions,
+    __: Callable[[SolverResult], None],
+) -> SolverResult:
+    return HeldKarpSolver.solve(matrix)
+
+
+def _local_search(construction: str) -> Configuration:
+    def __solve(
+        matrix: list[list[float]],
+        options: SolveOptions,
+        _: Callable[[SolverResult], None],
+    ) -> SolverResult:
+        previous = settings.SOLVER_LOCAL_SEARCH_CONSTRUCTION
+        settings.SOLVER_LOCAL_SEARCH_CONSTRUCTION = construction
+        try:
+            return LocalSearchSolver.solve(matrix, options)
+        finally:
+            settings.SOLVER_LOCAL_SEARCH_CONSTRUCTION = previous
+
+    return __solve
+
+
+def _ortools(options_update: dict) -> Configuration:
+    def __solve(
+        matrix: list[list[float]],
+        options: SolveOptions,
+        on_solution: Callable[[SolverResult], None],
+    ) -> SolverResult:
+        return ORToolsSolver.solve(
+            matrix,
+            options.model_copy(update=options_update),
+            on_solution=on_solution,
+        )
+
+    return __solve
+
+
+def configurations(stops: int) -> dict[str, Configuration]:
+    configs: dict[str, Configuration] = {}
+    if stops <= settings.SOLVER_EXACT_MAX_STOPS:
+        configs['held_karp'] = _solve_held_karp
+    for construction in LOCAL_SEARCH_CONSTRUCTIONS:
+        configs[f'local_search:{construction}'] = _local_search(construction)
+    for strategy in SolverPortfolio.strategies():
+        configs[f'ortools:{strategy.key}'] = _ortools({'strategy': strategy})
+    return configs
+
+
+def generate_instances(
+    sizes: list[int], seeds: int, tsplib: list[Path]
+) -> Iterator[Instance]:
+    for stops in sizes:
+        for seed in range(seeds):
+            yield Instance(
+                f'uniform-{stops}-{seed}', uniform_instance(stops + 1, seed)
+            )
+            yield Instance(
+                f'clustered-{stops}-{seed}',
+                clustered_instance(stops + 1, seed),
+            )
+    for path in tsplib:
+        yield read_tsplib(path)
+
+
+def run_configuration(
+    configuration: Configuration,
+    costs: np.ndarray,
+    options: SolveOptions,
+) -> dict:
+    curve: list[CurvePoint] = []
+
+    def __record(result: SolverResult) -> None:
+        if result.route:
+            objective = LocalSearchSolver.tour_cost(
+                costs, np.asarray(result.route)
+            )
+            curve.append((result.search_ms, objective))
+
+    started_at = time.perf_counter()
+    result = configuration(costs.tolist(), options, __record)
+    wall_ms = (time.perf_counter() - started_at) * 1000
+
+    objective = None
+    if result.route:
+        objective = LocalSearchSolver.tour_cost(
+            costs, np.asarray(result.route)
+        )
+        if not curve or objective < curve[-1][1]:
+            curve.append((result.search_ms, objective))
+
+    return {
+        'objective': objective,
+        'search_ms': round(result.search_ms, 3),
+        'wall_ms': round(wall_ms, 3),
+        'curve': curve,
+    }
+
+
+def _gap(objective: float | None, reference: float) -> float | None:
+    if objective is None or not reference:
+        return None
+    return round((objective - reference) / reference, 6)
+
+
+def benchmark_instance(instance: Instance, time_limit_ms: int | None) -> dict:
+    stops = len(instance.matrix) - 1
+    budget = SolveBudget.for_instance(stops + 1)
+    options = SolveOptions(time_limit_ms=time_limit_ms or budget.time_limit_ms)
+
+    runs = {
+        name: run_configuration(configuration, instance.matrix, options)
+        for name, configuration in configurations(stops).items()
+    }
+
+    reference, reference_kind = instance.reference, 'best_known'
+    if reference is None and 'held_karp' in runs:
+        reference, reference_kind = runs['held_karp']['objective'], 'optimal'
+    if reference is None:
+        objectives = [
+            run['objective']
+            for run in runs.values()
+            if run['objective'] is not None
+        ]
+        reference, reference_kind = min(objectives, default=0.0), 'best_found'
+
+    for run in runs.values():
+        run['gap'] = _gap(run['objective'], reference)
+        run['curve'] = [
+            {'ms': round(ms, 3), 'gap': _gap(objective, reference)}
+            for ms, objective in run.pop('curve')
+        ]
+
+    return {
+        'name': instance.name,
+        'stops': stops,
+        'time_limit_ms': options.time_limit_ms,
+        'reference': reference,
+        'reference_kind': reference_kind,
+        'runs': runs,
+    }
+
+
+def get_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],  # noqa: S607
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    # gaps of best_found instances are relative to the same run, so a
+    # regression shared by every configuration would leave them unchanged;
+    # compare the objectives against the baseline ones instead
+    baseline_runs = {
+        (instance['name'], name): run
+        for instance in baseline['instances']
+        for name, run in instance['runs'].items()
+    }
+    regressions = []
+    for instance in report['instances']:
+        for name, run in instance['runs'].items():
+            previous = baseline_runs.get((instance['name'], name))
+            if not previous or previous['objective'] is None:
+                continue
+            change = _gap(run['objective'], previous['objective'])
+            if change is None or change > tolerance:
+                regressions.append(
+                    f'{instance["name"]} {name}: '
+                    f'objective {previous["objective"]:.1f} -> '
+                    f'{run["objective"]}'
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='measure solver gaps against known objectives over time'
+    )
+    parser.add_argument(
+        '--sizes', type=int, nargs='*', default=list(DEFAULT_SIZES)
+    )
+    parser.add_argument('--seeds', type=int, default=1)
+    parser.add_argument(
+        '--tsplib',
+        type=Path,
+        nargs='*',
+        default=sorted(TSPLIB_DIR.glob('*.tsp')),
+    )
+    parser.add_argument('--time-limit-ms', type=int)
+    parser.add_argument(
+        '--output', type=Path, default=Path('solver_benchmark.json')
+    )
+    parser.add_argument('--baseline', type=Path)
+    parser.add_argument('--tolerance', type=float, default=0.01)
+    args = parser.parse_args()
+
+    instances = []
+    for instance in generate_instances(args.sizes, args.seeds, args.tsplib):
+        result = benchmark_instance(instance, args.time_limit_ms)
+        instances.append(result)
+        for name, run in result['runs'].items():
+            print(
+                f'{result["name"]:>20} {name:<45} '
+                f'gap={run["gap"]} wall_ms={run["wall_ms"]}'
+            )
+
+    report = {
+        'commit': get_commit(),
+        'created_at': datetime.now(UTC).isoformat(),
+        'instances': instances,
+    }
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f'results written to {args.output}')
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f'regression: {regression}')
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import time
+
+from app.solvers.ortools_solver import ORToolsSolver, TransitModeEnum
+from benchmarks.instances import uniform_instance
+
+
+def run(stops: int, seconds: int, seed: int) -> dict[str, dict]:
+    cost_matrix = ORToolsSolver.scale_matrix(uniform_instance(stops, seed))
+    results = {}
+    for mode in TransitModeEnum:
+        _, routing = ORToolsSolver.create_model(cost_matrix, transit_mode=mode)
+        search_parameters = ORToolsSolver.create_search_parameters(
+            seconds * 1000
+        )
+
+        started_at = time.perf_counter()
+        solution = routing.SolveWithParameters(search_parameters)
+        elapsed = time.perf_counter() - started_at
+
+        solver = routing.solver()
+        results[mode.value] = {
+            'objective': solution.ObjectiveValue() if solution else None,
+            'branches': solver.Branches(),
+            'solutions': solver.Solutions(),
+            'seconds': round(elapsed, 3),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='compare matrix and callback transit costs'
+    )
+    parser.add_argument('--stops', type=int, default=100)
+    parser.add_argument('--seconds', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    results = run(args.stops, args.seconds, args.seed)
+    for mode, result in results.items():
+        print(f'{mode:>8}: {result}')
+
+    matrix = results[TransitModeEnum.MATRIX.value]
+    callback = results[TransitModeEnum.CALLBACK.value]
+    speedup = matrix['branches'] / max(callback['branches'], 1)
+    print(f'search iterations ratio (matrix / callback): {speedup:.2f}x')
+
+
+if __name__ == '__main__':
+    main()